@@ -0,0 +1,146 @@
+"""Alertas para o jogador (shiny etc.), disparados fora do loop do bot.
+
+``AlertDispatcher.notify(event, message)`` só enfileira: uma thread de
+fundo entrega a mensagem a cada canal configurado em
+``settings.yaml -> alerts.channels``:
+
+- ``sound``: beeps (winsound no Windows, sino do terminal nos demais);
+- ``desktop``: MessageBox no Windows, ``notify-send`` no Linux;
+- ``webhook``: POST JSON para ``alerts.webhook_url`` (ex.: um serviço
+  local que repassa para o celular).
+
+Um canal lento ou com erro não atrasa a detecção nem os outros canais.
+Canais que esperam o jogador confirmar (``needs_ack``, ex.: a MessageBox)
+rodam em thread não-daemon e ``close`` espera por eles sem limite: o
+processo não pode sair e levar o aviso de shiny junto.
+"""
+import json
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from loguru import logger
+
+
+class SoundAlert:
+    def __init__(self, beeps=10, interval=0.5):
+        self.beeps = int(beeps)
+        self.interval = float(interval)
+        try:
+            import winsound  # Só existe no Windows
+        except ImportError:
+            winsound = None
+        self.winsound = winsound
+
+    def send(self, event, message):
+        for _ in range(self.beeps):
+            if self.winsound is not None:
+                self.winsound.MessageBeep(self.winsound.MB_ICONEXCLAMATION)
+            else:
+                sys.stdout.write('\a')
+                sys.stdout.flush()
+            time.sleep(self.interval)
+
+
+class DesktopAlert:
+    needs_ack = True  # a MessageBox fica aberta até o jogador fechar
+
+    def __init__(self, title="PokeBot Pro"):
+        self.title = title
+
+    def send(self, event, message):
+        title = f"{self.title} - {event.upper()}"
+        if sys.platform.startswith('win'):
+            import ctypes
+            ctypes.windll.user32.MessageBoxW(0, message, title, 0x00000040)  # MB_ICONINFORMATION
+        elif shutil.which('notify-send'):
+            subprocess.run(['notify-send', '--urgency=critical', title, message], timeout=5, check=False)
+        else:
+            logger.warning(f"Sem notificação de desktop nesta plataforma: {title}: {message}")
+
+
+class WebhookAlert:
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = float(timeout)
+
+    def send(self, event, message):
+        body = json.dumps({'event': event, 'message': message, 'ts': time.time()}).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class AlertDispatcher:
+    """Fila de alertas entregue por uma thread por canal (um canal não espera o outro)."""
+
+    def __init__(self, channels):
+        self.channels = list(channels)
+        self.sent = 0
+        self._queues = []
+        self._threads = []
+        for channel in self.channels:
+            q = queue.Queue()
+            thread = threading.Thread(
+                target=self._deliver, args=(channel, q), name=f"alert-{type(channel).__name__}",
+                daemon=not getattr(channel, 'needs_ack', False),
+            )
+            thread.start()
+            self._queues.append(q)
+            self._threads.append(thread)
+
+    def notify(self, event, message):
+        """Enfileira o alerta e retorna na hora."""
+        for q in self._queues:
+            q.put((event, message))
+
+    def _deliver(self, channel, q):
+        while True:
+            item = q.get()
+            try:
+                if item is None:
+                    return
+                channel.send(*item)
+                self.sent += 1
+            except Exception as e:
+                logger.error(f"Falha no alerta {type(channel).__name__}: {e}")
+            finally:
+                q.task_done()
+
+    def close(self, timeout=None):
+        """Espera os alertas pendentes (até ``timeout`` s) e encerra as threads.
+
+        Canais ``needs_ack`` são esperados sem limite: o alerta só termina
+        quando o jogador o confirma.
+        """
+        for q in self._queues:
+            q.put(None)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for channel, thread in zip(self.channels, self._threads):
+            if deadline is None or getattr(channel, 'needs_ack', False):
+                thread.join()
+            else:
+                thread.join(max(0.0, deadline - time.monotonic()))
+
+
+def build_alerts(config):
+    """AlertDispatcher com os canais de ``alerts.channels`` (padrão: som + desktop)."""
+    alerts_cfg = (config or {}).get('alerts', {}) or {}
+    channels = []
+    for name in alerts_cfg.get('channels', ['sound', 'desktop']):
+        if name == 'sound':
+            channels.append(SoundAlert(alerts_cfg.get('beeps', 10), alerts_cfg.get('beep_interval', 0.5)))
+        elif name == 'desktop':
+            channels.append(DesktopAlert())
+        elif name == 'webhook':
+            url = alerts_cfg.get('webhook_url')
+            if url:
+                channels.append(WebhookAlert(url, alerts_cfg.get('webhook_timeout', 5.0)))
+            else:
+                logger.warning("Canal de alerta 'webhook' sem alerts.webhook_url; ignorado")
+        else:
+            logger.warning(f"Canal de alerta desconhecido: '{name}'")
+    return AlertDispatcher(channels)
@@ -0,0 +1,215 @@
+"""Backends de mouse/teclado usados pelo InputSimulator.
+
+Todos recebem coordenadas absolutas de tela e medem a própria latência
+por tipo de ação (``latency_report()``):
+
+- ``PyAutoGUIBackend``: o comportamento original; ``input.pyautogui_pause``
+  controla o ``pyautogui.PAUSE`` (0.1 s por chamada no padrão da lib);
+- ``XTestBackend``: eventos sintéticos direto no servidor X (libXtst via
+  ctypes), sem pausa nem screenshot; Linux/X11;
+- ``RecordingBackend``: não mexe em nada, só registra
+  ``(timestamp, ação, args)`` para testes e replay.
+
+``build_backend(config)`` escolhe por ``input.backend``
+(``auto`` = XTest se disponível, senão pyautogui).
+"""
+import ctypes
+import ctypes.util
+import sys
+import time
+from loguru import logger
+
+
+class InputBackend:
+    """Interface + medição de latência por tipo de ação."""
+
+    name = 'base'
+
+    def __init__(self):
+        self._latency = {}  # ação -> [quantidade, soma, máximo] em segundos
+
+    def move(self, x, y, duration=0.0):
+        self._timed('move', self._move, x, y, duration)
+
+    def click(self, x, y):
+        self._timed('click', self._click, x, y)
+
+    def press(self, key):
+        self._timed('press', self._press, key)
+
+    def press_keys(self, keys, interval=0.05):
+        self._timed('press_keys', self._press_keys, keys, interval)
+
+    def _timed(self, kind, fn, *args):
+        started = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - started
+        stats = self._latency.setdefault(kind, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+
+    def latency_report(self):
+        """{ação: {'count', 'mean_ms', 'max_ms'}} desde o início."""
+        return {
+            kind: {'count': n, 'mean_ms': total / n * 1000.0, 'max_ms': worst * 1000.0}
+            for kind, (n, total, worst) in self._latency.items() if n
+        }
+
+    def _press_keys(self, keys, interval):
+        for i, key in enumerate(keys):
+            if i:
+                time.sleep(interval)
+            self._press(key)
+
+    def _move(self, x, y, duration):
+        raise NotImplementedError
+
+    def _click(self, x, y):
+        raise NotImplementedError
+
+    def _press(self, key):
+        raise NotImplementedError
+
+
+class PyAutoGUIBackend(InputBackend):
+    name = 'pyautogui'
+
+    def __init__(self, pause=None):
+        super().__init__()
+        import pyautogui
+        # Desabilita o fail-safe para evitar paradas bruscas se o mouse for para o canto
+        # CUIDADO: Isso impede que você pare o bot movendo o mouse para o canto!
+        pyautogui.FAILSAFE = False
+        if pause is not None:
+            pyautogui.PAUSE = float(pause)
+        self.pyautogui = pyautogui
+
+    def _move(self, x, y, duration):
+        self.pyautogui.moveTo(x, y, duration=duration)
+
+    def _click(self, x, y):
+        self.pyautogui.click(x, y)
+
+    def _press(self, key):
+        self.pyautogui.press(key)
+
+    def _press_keys(self, keys, interval):
+        self.pyautogui.press(list(keys), interval=interval)
+
+
+class XTestBackend(InputBackend):
+    """Eventos sintéticos via extensão XTEST (sem a pausa nem o overhead do pyautogui)."""
+
+    name = 'xtest'
+
+    # Nomes de tecla do pyautogui -> keysym do X
+    KEYSYMS = {
+        'space': 'space', 'enter': 'Return', 'return': 'Return', 'esc': 'Escape', 'escape': 'Escape',
+        'tab': 'Tab', 'backspace': 'BackSpace', 'delete': 'Delete', 'up': 'Up', 'down': 'Down',
+        'left': 'Left', 'right': 'Right', 'shift': 'Shift_L', 'ctrl': 'Control_L', 'alt': 'Alt_L',
+    }
+
+    def __init__(self, display=None):
+        super().__init__()
+        x11_path = ctypes.util.find_library('X11')
+        xtst_path = ctypes.util.find_library('Xtst')
+        if x11_path is None or xtst_path is None:
+            raise OSError("libX11/libXtst não encontradas")
+        x11 = ctypes.cdll.LoadLibrary(x11_path)
+        xtst = ctypes.cdll.LoadLibrary(xtst_path)
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XStringToKeysym.restype = ctypes.c_ulong
+        x11.XStringToKeysym.argtypes = [ctypes.c_char_p]
+        x11.XKeysymToKeycode.restype = ctypes.c_ubyte
+        x11.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        x11.XFlush.argtypes = [ctypes.c_void_p]
+        xtst.XTestFakeMotionEvent.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+        xtst.XTestFakeButtonEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+        xtst.XTestFakeKeyEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+        self.x11 = x11
+        self.xtst = xtst
+        self.display = x11.XOpenDisplay(display.encode() if display else None)
+        if not self.display:
+            raise OSError("Não foi possível abrir o display X11")
+        self._keycodes = {}
+        self._pos = None
+
+    def _move(self, x, y, duration):
+        # Movimento suave: interpola a ~100 Hz a partir da última posição conhecida
+        if duration and duration > 0 and self._pos is not None:
+            steps = max(1, int(duration * 100))
+            x0, y0 = self._pos
+            for i in range(1, steps):
+                self._motion(x0 + (x - x0) * i / steps, y0 + (y - y0) * i / steps)
+                time.sleep(duration / steps)
+        self._motion(x, y)
+
+    def _motion(self, x, y):
+        self.xtst.XTestFakeMotionEvent(self.display, -1, int(x), int(y), 0)
+        self.x11.XFlush(self.display)
+        self._pos = (int(x), int(y))
+
+    def _click(self, x, y):
+        self._motion(x, y)
+        self.xtst.XTestFakeButtonEvent(self.display, 1, True, 0)
+        self.xtst.XTestFakeButtonEvent(self.display, 1, False, 0)
+        self.x11.XFlush(self.display)
+
+    def _press(self, key):
+        keycode = self._keycode(key)
+        if not keycode:
+            logger.warning(f"Tecla sem keycode no X11: '{key}'")
+            return
+        self.xtst.XTestFakeKeyEvent(self.display, keycode, True, 0)
+        self.xtst.XTestFakeKeyEvent(self.display, keycode, False, 0)
+        self.x11.XFlush(self.display)
+
+    def _keycode(self, key):
+        if key not in self._keycodes:
+            keysym = self.x11.XStringToKeysym(self.KEYSYMS.get(key.lower(), key).encode())
+            self._keycodes[key] = self.x11.XKeysymToKeycode(self.display, keysym) if keysym else 0
+        return self._keycodes[key]
+
+
+class RecordingBackend(InputBackend):
+    """Só registra as ações em ``actions`` como ``(timestamp, nome, args)``."""
+
+    name = 'recording'
+
+    def __init__(self):
+        super().__init__()
+        self.actions = []
+
+    def record(self, name, *args):
+        self.actions.append((time.monotonic(), name, args))
+
+    def _move(self, x, y, duration):
+        self.record('move', x, y)
+
+    def _click(self, x, y):
+        self.record('click', x, y)
+
+    def _press(self, key):
+        self.record('press', key)
+
+    def _press_keys(self, keys, interval):
+        self.record('press_keys', tuple(keys), interval)
+
+
+def build_backend(config):
+    """Backend de ``input.backend``: auto | xtest | pyautogui | recording."""
+    input_cfg = (config or {}).get('input', {}) or {}
+    choice = input_cfg.get('backend', 'auto')
+    if choice == 'recording':
+        return RecordingBackend()
+    if choice in ('auto', 'xtest') and sys.platform.startswith('linux'):
+        try:
+            return XTestBackend()
+        except Exception as e:
+            if choice == 'xtest':
+                logger.warning(f"Backend XTest indisponível ({e}); usando pyautogui")
+    elif choice not in ('auto', 'pyautogui', 'xtest'):
+        logger.warning(f"input.backend desconhecido: '{choice}'; usando pyautogui")
+    return PyAutoGUIBackend(input_cfg.get('pyautogui_pause'))
@@ -0,0 +1,199 @@
+"""Fila de ações de input executada numa thread própria.
+
+``QueuedInput`` tem a mesma API do InputSimulator, mas cada chamada só
+enfileira uma ``InputAction`` (com timestamp) e retorna na hora: a
+animação do mouse (``mouse_move_duration``) e as pausas do backend correm
+na thread de input enquanto o controller já segue para a percepção.
+
+Na execução, uma ação é descartada se:
+
+- expirou: ficou mais de ``input.queue.max_age`` s na fila;
+- o estado mudou: o estado do bot (``bind_state``) não é mais aquele em
+  que a ação foi pedida (ex.: espaço da exploração quando a batalha já
+  começou).
+
+Ações repetidas são coalescidas: um ``press`` igual a outro ainda na fila,
+ou à mesma tecla enviada há menos de ``input.queue.coalesce_window`` s, é
+descartado (o fallback da exploração pede espaço a cada tick).
+
+Cada chamada devolve a ``InputAction``; ``then(fn)`` chama ``fn(ok)`` quando
+ela termina: ``ok`` é False se expirou, foi descartada, coalescida ou falhou
+(ou se o simulador disse que não clicou), para o controller só registrar o
+efeito (fuga, turno) do que de fato foi executado.
+"""
+import threading
+import time
+from collections import deque
+from loguru import logger
+
+_UNSET = object()
+
+
+class InputAction:
+    """Ação de input: ``kind`` é o nome do método do InputSimulator a chamar."""
+
+    COALESCE = ('press', 'press_keys')
+
+    def __init__(self, kind, args=(), state=_UNSET):
+        self.kind = kind
+        self.args = tuple(args)
+        self.state = state  # estado do bot quando a ação foi pedida
+        self.created = time.monotonic()
+        self.result = None  # True/False quando terminar
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def then(self, fn):
+        """``fn(ok)`` quando a ação terminar (na hora, se já terminou)."""
+        with self._lock:
+            if self.result is None:
+                self._callbacks.append(fn)
+                return
+        fn(self.result)
+
+    def finish(self, ok):
+        with self._lock:
+            self.result = bool(ok)
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self.result)
+            except Exception as e:
+                logger.error(f"Erro no retorno de {self}: {e}")
+
+    @property
+    def key(self):
+        return (self.kind, self.args)
+
+    def __repr__(self):
+        return f"InputAction({self.kind}{self.args})"
+
+
+class QueuedInput:
+    def __init__(self, simulator, config=None):
+        queue_cfg = (config or {}).get('input', {}).get('queue', {}) or {}
+        self.simulator = simulator
+        self.max_age = float(queue_cfg.get('max_age', 2.0))
+        self.coalesce_window = float(queue_cfg.get('coalesce_window', 0.5))
+        self._state_fn = None
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._last_sent = {}  # chave da ação -> instante do último envio
+        self.dispatched = 0
+        self.coalesced = 0
+        self.expired = 0
+        self._thread = threading.Thread(target=self._run, name="input", daemon=True)
+        self._thread.start()
+
+    def bind_state(self, state_fn):
+        """``state_fn()`` devolve o estado atual; ações pedidas em outro estado expiram."""
+        self._state_fn = state_fn
+
+    # --------- API do InputSimulator ---------
+    def click(self, x, y):
+        return self.submit(InputAction('click', (x, y), self._state()))
+
+    def press(self, key):
+        return self.submit(InputAction('press', (key,), self._state()))
+
+    def press_keys(self, keys, interval=0.05):
+        return self.submit(InputAction('press_keys', (tuple(keys), interval), self._state()))
+
+    def click_in_slot(self, slot_index):
+        return self.submit(InputAction('click_in_slot', (slot_index,), self._state()))
+
+    def click_fight_button(self):
+        return self.submit(InputAction('click_fight_button', (), self._state()))
+
+    def click_pokemon_button(self):
+        return self.submit(InputAction('click_pokemon_button', (), self._state()))
+
+    def click_run_button(self):
+        return self.submit(InputAction('click_run_button', (), self._state()))
+
+    def __getattr__(self, name):
+        # apply_layout, origin, rois... vão direto ao simulador
+        return getattr(self.simulator, name)
+
+    # --------- Fila ---------
+    def _state(self):
+        return self._state_fn() if self._state_fn is not None else _UNSET
+
+    def submit(self, action):
+        """Enfileira ``action`` e a devolve (já concluída com False se for coalescida)."""
+        with self._cond:
+            coalesced = action.kind in InputAction.COALESCE and self._redundant(action)
+            if coalesced:
+                self.coalesced += 1
+            else:
+                self._queue.append(action)
+                self._cond.notify_all()
+        if coalesced:
+            action.finish(False)
+        return action
+
+    def _redundant(self, action):
+        if any(queued.key == action.key for queued in self._queue):
+            return True
+        last = self._last_sent.get(action.key)
+        return last is not None and action.created - last < self.coalesce_window
+
+    def drain(self, timeout=None):
+        """Espera a fila esvaziar (e a ação em andamento terminar)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=1.0):
+        self.drain(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        close = getattr(self.simulator, 'close', None)
+        if close is not None:
+            close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                action = self._queue.popleft()
+                self._busy = True
+            ok = False
+            try:
+                ok = self._dispatch(action)
+            except Exception as e:
+                logger.error(f"Erro ao executar {action}: {e}")
+            finally:
+                action.finish(ok)
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _dispatch(self, action):
+        age = time.monotonic() - action.created
+        if age > self.max_age:
+            self.expired += 1
+            logger.debug(f"{action} expirou na fila ({age:.2f}s)")
+            return False
+        if action.state is not _UNSET and self._state_fn is not None and self._state_fn() != action.state:
+            self.expired += 1
+            logger.debug(f"{action} descartada: estado mudou desde o pedido")
+            return False
+        result = getattr(self.simulator, action.kind)(*action.args)
+        self.dispatched += 1
+        with self._cond:
+            self._last_sent[action.key] = time.monotonic()
+        # Simuladores que não informam resultado (None) contam como executados
+        return result is not False
@@ -1,189 +1,134 @@
-import pyautogui
 import random
-import time
 import cv2
 import numpy as np
+from loguru import logger
+from ..perception.template_registry import TemplateRegistry
+from ..perception.matching import TemplateMatcher
+from ..perception.rois import ROI, RoiSet
+from .input_backends import build_backend
 
 
 class InputSimulator:
-    def __init__(self, config=None):
-        # Desabilita o fail-safe para evitar paradas bruscas se o mouse for para o canto
-        # CUIDADO: Isso impede que você pare o bot movendo o mouse para o canto!
-        pyautogui.FAILSAFE = False
+    """Mouse/teclado através de um InputBackend (pyautogui, XTest, gravação).
+
+    As coordenadas recebidas são relativas ao frame capturado; ``origin``
+    (canto da área capturada na tela) é somado antes de clicar, para que
+    sessões restritas a uma janela cliquem no lugar certo.
+
+    Os cliques em botões/slots devolvem se clicaram (template ou ROI
+    encontrados). ``capture_factory`` cria, no primeiro uso, uma captura só
+    do simulador: com a fila de input, os templates são procurados na
+    thread de input, que não pode usar os buffers reaproveitados da captura
+    da sessão.
+    """
+
+    def __init__(self, config=None, screen=None, origin=None, templates=None, matcher=None, backend=None,
+                 capture_factory=None):
         self.cfg = config or {}
-        self.rois = self.cfg.get('rois', {})
+        self.backend = backend or build_backend(self.cfg)
+        self.rois = RoiSet.of(self.cfg)
         self.move_duration = float(self.cfg.get('input', {}).get('mouse_move_duration', 0.0))
+        self.screen = screen
+        self._origin = origin
+        self.capture_factory = capture_factory
+        self._capture = None
+        self.templates = templates or TemplateRegistry(self.cfg)
+        self.matcher = matcher or TemplateMatcher(self.templates, self.cfg)
+
+    @property
+    def origin(self):
+        """Canto da área capturada; lido a cada clique (a janela do jogo pode ter se movido)."""
+        if self._origin is not None:
+            return self._origin
+        return getattr(self.screen, 'origin', (0, 0)) if self.screen is not None else (0, 0)
+
+    def apply_layout(self, config, matcher):
+        """Troca ROIs e matcher pelos da geometria atual (ver Layout)."""
+        self.cfg = config
+        self.rois = RoiSet.of(config)
+        self.matcher = matcher
+        self.move_duration = float(config.get('input', {}).get('mouse_move_duration', 0.0))
 
     def click(self, x, y):
+        x, y = x + self.origin[0], y + self.origin[1]
         if self.move_duration and self.move_duration > 0:
-            pyautogui.moveTo(x, y, duration=self.move_duration)
-            pyautogui.click()
-        else:
-            pyautogui.click(x, y)
+            self.backend.move(x, y, self.move_duration)
+        self.backend.click(x, y)
 
     def press(self, key):
-        pyautogui.press(key)
+        self.backend.press(key)
+
+    def press_keys(self, keys, interval=0.05):
+        """Sequência de teclas com ``interval`` s entre elas."""
+        self.backend.press_keys(keys, interval)
+
+    def close(self):
+        """Registra a latência medida do backend por tipo de ação."""
+        for kind, stats in self.backend.latency_report().items():
+            logger.info(
+                f"Input ({self.backend.name}) {kind}: {stats['count']} ações, "
+                f"média {stats['mean_ms']:.2f} ms, máx {stats['max_ms']:.2f} ms"
+            )
     
     def click_in_slot(self, slot_index):
         """Clica aproximadamente no centro de um dos 4 slots de ataque (0-3)."""
-        slot_map = {
-            0: 'slot_1',
-            1: 'slot_2',
-            2: 'slot_3',
-            3: 'slot_4',
-        }
-        key = slot_map.get(slot_index)
-        if not key:
-            return
-        moves_rois = self.rois.get('moves', {})
-        coords = moves_rois.get(key)
-        if not coords:
-            return
-
-        # coords pode ser [x1, y1, x2, y2] ou [x, y, w, h]
-        if len(coords) != 4:
-            return
-
-        x1, y1, x2, y2 = coords
-        # Converte se estiver no formato [x, y, w, h]
-        if x2 <= x1 or y2 <= y1:
-            x, y, w, h = coords
-            x1, y1, x2, y2 = int(x), int(y), int(x + w), int(y + h)
-
-        # Usa apenas uma área interna (por ex. 20% de margem em cada lado)
-        margin_x = int(0.2 * (x2 - x1))
-        margin_y = int(0.2 * (y2 - y1))
-        safe_x1 = x1 + margin_x
-        safe_x2 = x2 - margin_x
-        safe_y1 = y1 + margin_y
-        safe_y2 = y2 - margin_y
-
-        if safe_x2 <= safe_x1 or safe_y2 <= safe_y1:
-            # Fallback para centro se ROI for muito pequena
-            cx = x1 + (x2 - x1) // 2
-            cy = y1 + (y2 - y1) // 2
-        else:
-            cx = random.randint(safe_x1, safe_x2)
-            cy = random.randint(safe_y1, safe_y2)
-
-        self.click(cx, cy)
+        if slot_index not in (0, 1, 2, 3):
+            return False
+        roi = self.rois.get(f'moves.slot_{slot_index + 1}')
+        if roi is None:
+            return False
+        # Usa apenas uma área interna (20% de margem em cada lado)
+        self.click(*self._random_point(roi, 0.2))
+        return True
+
+    @staticmethod
+    def _random_point(roi, margin):
+        """Ponto aleatório na área interna do ROI; o centro se o ROI for pequeno demais."""
+        safe = roi.inner(margin)
+        if safe is None:
+            return roi.center
+        return random.randint(safe.x1, safe.x2), random.randint(safe.y1, safe.y2)
 
     def click_fight_button(self):
         """Clica no botão FIGHT usando o template fight.png."""
-        assets_dir = self.cfg.get('assets', {}).get('templates_dir', '')
-        fight_img_name = self.cfg.get('assets', {}).get('fight_image', 'fight.png')
-        template_path = assets_dir + fight_img_name
-
-        template = cv2.imread(template_path)
-        if template is None:
-            return
-
-        # Captura uma screenshot da tela inteira
-        screenshot = pyautogui.screenshot()
-        screenshot = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-
-        res = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(res)
-
         # Threshold conservador para evitar falsos positivos
-        thresh = float(self.cfg.get('detection', {}).get('fight_threshold', 0.85))
-        if max_val < thresh:
-            return
-
-        h, w = template.shape[:2]
-        x, y = max_loc
-
-        # Margem interna de 20% para clicar seguro dentro do botão
-        margin_x = int(0.2 * w)
-        margin_y = int(0.2 * h)
-        safe_x1 = x + margin_x
-        safe_x2 = x + w - margin_x
-        safe_y1 = y + margin_y
-        safe_y2 = y + h - margin_y
-
-        if safe_x2 <= safe_x1 or safe_y2 <= safe_y1:
-            cx = x + w // 2
-            cy = y + h // 2
-        else:
-            cx = random.randint(safe_x1, safe_x2)
-            cy = random.randint(safe_y1, safe_y2)
-
-        self.click(cx, cy)
+        return self._click_template('fight', 'fight_threshold')
 
     def click_pokemon_button(self):
         """Clica no botão POKEMON usando o template pokemon.png."""
-        assets_dir = self.cfg.get('assets', {}).get('templates_dir', '')
-        poke_img_name = self.cfg.get('assets', {}).get('pokemon_image', 'pokemon.png')
-        template_path = assets_dir + poke_img_name
-
-        template = cv2.imread(template_path)
-        if template is None:
-            return
-
-        screenshot = pyautogui.screenshot()
-        screenshot = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-
-        res = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(res)
-
-        thresh = float(self.cfg.get('detection', {}).get('pokemon_threshold', 0.85))
-        if max_val < thresh:
-            return
-
-        h, w = template.shape[:2]
-        x, y = max_loc
-
-        margin_x = int(0.2 * w)
-        margin_y = int(0.2 * h)
-        safe_x1 = x + margin_x
-        safe_x2 = x + w - margin_x
-        safe_y1 = y + margin_y
-        safe_y2 = y + h - margin_y
-
-        if safe_x2 <= safe_x1 or safe_y2 <= safe_y1:
-            cx = x + w // 2
-            cy = y + h // 2
-        else:
-            cx = random.randint(safe_x1, safe_x2)
-            cy = random.randint(safe_y1, safe_y2)
-
-        self.click(cx, cy)
+        return self._click_template('pokemon', 'pokemon_threshold')
 
     def click_run_button(self):
         """Clica no botão RUN usando o template run.png."""
-        assets_dir = self.cfg.get('assets', {}).get('templates_dir', '')
-        run_img_name = self.cfg.get('assets', {}).get('run_image', 'run.png')
-        template_path = assets_dir + run_img_name
-
-        template = cv2.imread(template_path)
-        if template is None:
-            return
-
+        return self._click_template('run', 'run_threshold')
+
+    def _grab_frame(self):
+        """Frame atual: da captura própria, da captura da sessão ou, sem nenhuma, da tela inteira."""
+        if self.capture_factory is not None:
+            if self._capture is None:
+                self._capture = self.capture_factory()
+            return self._capture.capture()
+        if self.screen is not None:
+            return self.screen.capture()
+        import pyautogui
         screenshot = pyautogui.screenshot()
-        screenshot = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+        return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
 
-        res = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+    def _click_template(self, key, threshold_key):
+        """Localiza o template ``key`` no frame e clica dentro dele com margem interna; True se clicou."""
+        screenshot = self._grab_frame()
 
-        thresh = float(self.cfg.get('detection', {}).get('run_threshold', 0.85))
+        # Cada botão é procurado no próprio ROI (btn_*) com folga
+        pad = int(self.cfg.get('detection', {}).get('button_padding', 24))
+        match = self.matcher.match(screenshot, key, self.rois.button_area(key, pad))
+        if match is None:
+            return False
+        max_val, (x, y), (w, h) = match
+
+        thresh = float(self.cfg.get('detection', {}).get(threshold_key, 0.85))
         if max_val < thresh:
-            return
-
-        h, w = template.shape[:2]
-        x, y = max_loc
-
-        margin_x = int(0.2 * w)
-        margin_y = int(0.2 * h)
-        safe_x1 = x + margin_x
-        safe_x2 = x + w - margin_x
-        safe_y1 = y + margin_y
-        safe_y2 = y + h - margin_y
-
-        if safe_x2 <= safe_x1 or safe_y2 <= safe_y1:
-            cx = x + w // 2
-            cy = y + h // 2
-        else:
-            cx = random.randint(safe_x1, safe_x2)
-            cy = random.randint(safe_y1, safe_y2)
-
-        self.click(cx, cy)
\ No newline at end of file
+            return False
+
+        # Margem interna de 20% para clicar seguro dentro do botão
+        self.click(*self._random_point(ROI(x, y, x + w, y + h), 0.2))
+        return True
@@ -0,0 +1,46 @@
+from .input_backends import RecordingBackend
+
+
+class RecordingInput:
+    """Substituto do InputSimulator que só registra as ações (sem mouse/teclado).
+
+    Usado por sessões de replay (sem jogo aberto) e em testes: cada ação de
+    alto nível vira uma tupla ``(timestamp, nome, args)`` num RecordingBackend
+    (``actions``). Para gravar os cliques/teclas de baixo nível de um
+    InputSimulator de verdade, use ``InputSimulator(backend=RecordingBackend())``.
+    """
+
+    def __init__(self, config=None, backend=None):
+        self.cfg = config or {}
+        self.backend = backend or RecordingBackend()
+
+    @property
+    def actions(self):
+        return self.backend.actions
+
+    def apply_layout(self, config, matcher=None):
+        self.cfg = config
+
+    def _record(self, name, *args):
+        self.backend.record(name, *args)
+
+    def click(self, x, y):
+        self._record('click', x, y)
+
+    def press(self, key):
+        self._record('press', key)
+
+    def press_keys(self, keys, interval=0.05):
+        self._record('press_keys', tuple(keys), interval)
+
+    def click_in_slot(self, slot_index):
+        self._record('click_in_slot', slot_index)
+
+    def click_fight_button(self):
+        self._record('click_fight_button')
+
+    def click_pokemon_button(self):
+        self._record('click_pokemon_button')
+
+    def click_run_button(self):
+        self._record('click_run_button')
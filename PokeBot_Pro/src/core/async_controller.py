@@ -0,0 +1,241 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+
+from ..perception.game_state_detector import GameState
+from .bot_controller import BotController, Preempted
+
+
+class AsyncBotController(BotController):
+    """Variante asyncio do BotController.
+
+    Captura, percepção (matchTemplate/OCR em executor), ações de input e
+    esperas viram awaitables, o que permite sobrepor trabalho:
+
+    - o OCR da HUD (nomes/nível) do frame que mostrou a batalha roda
+      enquanto o clique em FIGHT e a animação do menu de golpes acontecem;
+    - trabalho pendente de um estado é cancelado quando a máquina de
+      estados troca de estado (resultado velho não chega a ser usado).
+
+    Executores dedicados: captura e input usam uma thread cada (mss e
+    mouse/teclado exigem ordem e afinidade de thread); a percepção usa
+    ``async_core.perception_workers`` threads (cv2 e Tesseract liberam o
+    GIL). ``run()`` continua síncrono: só chama ``asyncio.run``.
+    """
+
+    def __init__(self, config, components):
+        super().__init__(config, components)
+        workers = int(self.cfg.get('async_core', {}).get('perception_workers', 2))
+        self._capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+        self._input_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="input")
+        self._perception_executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="perception")
+        self._pending = set()  # tarefas do estado atual (canceladas na troca de estado)
+        self._async_handlers = {
+            GameState.EXPLORING: self.handle_exploring_async,
+            GameState.IN_BATTLE: self.handle_battle_async,
+            GameState.DIALOG: self.handle_dialog_async,
+            GameState.MENU: self.handle_menu_async,
+        }
+
+    # --------- Loop ---------
+    def run(self):
+        """Wrapper síncrono: mesmo contrato do BotController.run()."""
+        asyncio.run(self.run_async())
+
+    async def run_async(self):
+        logger.info("Bot Iniciado (modo assíncrono)! Pressione Ctrl+C para parar.")
+        if self.watchdog is not None:
+            self.watchdog.start()
+        if self.config_watcher is not None:
+            self.config_watcher.start()
+        if self.recorder is not None:
+            self.recorder.start()
+        try:
+            while self.running:
+                started = time.monotonic()
+                try:
+                    state = await self.tick_async()
+                except Preempted:
+                    self._cancel_pending()
+                    state = self._on_preempt()
+                except Exception:
+                    self._record_incident('exception')
+                    raise
+                self._first_tick_done()
+                await asyncio.sleep(self.scheduler.remaining(started, urgent=state == GameState.IN_BATTLE))
+        finally:
+            self._cancel_pending()
+            self.shutdown()
+            for executor in (self._capture_executor, self._input_executor, self._perception_executor):
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def tick_async(self):
+        """Mesmo fluxo do ``tick()``, com captura/percepção fora do event loop."""
+        if self.preempt.is_set():
+            return self._on_preempt()
+        self._apply_config_reload()
+        img = await self.capture()
+        self.frame_id += 1
+        self._update_layout(img)
+        self.scheduler.observe(img)
+        self._record_frame(img)
+
+        exploring = self.machine.current in (None, GameState.EXPLORING)
+        if not self.scheduler.needs_full_perception(exploring) and \
+                not await self.perceive(self.detector.battle_hint, img):
+            return self.machine.current
+
+        snapshot = await self.perceive(
+            self.perceiver.perceive, img, self.machine.profile, frame_id=self.frame_id
+        )
+        self.scheduler.mark_full_perception()
+        if self.recorder is not None:
+            self.recorder.note_perception(snapshot)
+
+        if self.debug:
+            self._debug_snapshot(img, snapshot)
+
+        previous = self.machine.current
+        # Transições (e refine/on_enter/on_exit) são rápidas e ficam síncronas
+        current = self.machine.advance(snapshot, refine=self._refine_snapshot)
+        if current != previous:
+            self._cancel_pending()
+
+        handler = self._async_handlers.get(current)
+        if handler is not None:
+            await handler(snapshot)
+        return self.machine.current
+
+    # --------- Awaitables básicos ---------
+    async def capture(self):
+        return await self._in_executor(self._capture_executor, self.cap.capture)
+
+    async def perceive(self, fn, *args, **kwargs):
+        """Roda uma função de percepção (CPU/OCR) no executor de percepção."""
+        return await self._in_executor(self._perception_executor, fn, *args, **kwargs)
+
+    async def act(self, fn, *args):
+        """Executa uma ação de input (na ordem em que foram pedidas)."""
+        return await self._in_executor(self._input_executor, fn, *args)
+
+    async def wait_async(self, seconds):
+        """Espera em fatias de um frame; levanta ``Preempted`` se o watchdog achar shiny."""
+        deadline = time.monotonic() + seconds
+        while not self.preempt.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, self.scheduler.min_interval))
+        raise Preempted()
+
+    def spawn(self, coro):
+        """Inicia trabalho em paralelo, cancelado se o estado mudar antes de ser usado."""
+        task = asyncio.ensure_future(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+    def _cancel_pending(self):
+        for task in list(self._pending):
+            task.cancel()
+        self._pending.clear()
+
+    @staticmethod
+    async def _in_executor(executor, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        if kwargs:
+            return await loop.run_in_executor(executor, lambda: fn(*args, **kwargs))
+        return await loop.run_in_executor(executor, fn, *args)
+
+    # --------- Handlers assíncronos ---------
+    async def handle_exploring_async(self, snapshot):
+        # Decisão barata sobre o snapshot; o click/press vai para o executor de input
+        await self.act(self.handle_exploring, snapshot)
+
+    async def handle_dialog_async(self, snapshot):
+        await self.act(self.handle_dialog, snapshot)
+
+    async def handle_menu_async(self, snapshot):
+        await self.act(self.handle_menu, snapshot)
+
+    async def handle_battle_async(self, snapshot):
+        if not snapshot.in_battle:
+            if self.debug:
+                logger.debug("handle_battle chamado mas estado não é IN_BATTLE. Abortando ações de ataque.")
+            return
+
+        self._count_shiny_check(snapshot)
+        battle_cfg = self.cfg.get('battle', {})
+
+        # A HUD (nomes/nível) já está no frame que detectou a batalha: o OCR
+        # começa agora e corre junto com o clique em FIGHT e a animação
+        # (só no turno em que a memória da batalha não vale).
+        info_task = None
+        if not self.battle_ctx.valid_for(self.detector.hud_signature(snapshot.image)):
+            info_task = self.spawn(self.perceive(self.perceiver.get_battle_info, self._keep(snapshot.image)))
+
+        if await self.act(self._click_fight):
+            await self.wait_async(battle_cfg.get('fight_to_moves_delay', 1.2))
+
+        # Frame novo com o menu de golpes já renderizado
+        img = await self.capture()
+        self.frame_id += 1
+        hud_signature = self.detector.hud_signature(img)
+        battle_info = self.battle_ctx.hud_for(hud_signature)
+        if battle_info is None:
+            try:
+                if info_task is None:
+                    info_task = self.spawn(self.perceive(self.perceiver.get_battle_info, img))
+                battle_info = await info_task
+            except Exception as e:
+                logger.error(f"Erro ao ler HUD de batalha: {e}")
+                battle_info = {}
+            self.battle_ctx.remember_hud(hud_signature, battle_info)
+        enemy_name, my_pokemon_name, enemy_level = self._apply_battle_info(battle_info)
+
+        if self._should_flee(my_pokemon_name, enemy_name):
+            if await self.act(self._click_run):
+                await self.wait_async(battle_cfg.get('action_cooldown', 2.5))
+                self.scheduler.expect_change()
+                return
+
+        # OCR dos golpes começa antes da decisão de troca (que pode levar o
+        # orçamento da busca); se houver troca, o resultado é descartado.
+        if self.debug:
+            self._save_move_debug(img, my_pokemon_name)
+        my_moves = self.battle_ctx.moves_for(hud_signature)
+        moves_task = None if my_moves is not None else self.spawn(self.perceive(self._infer_moves, img, my_pokemon_name))
+
+        switch_idx = await self.perceive(self._choose_switch, enemy_name, my_pokemon_name, enemy_level)
+        if switch_idx is not None:
+            logger.info(f"Decisão de TROCAR para o slot {switch_idx} da equipe contra {enemy_name}.")
+            try:
+                await self.act(self.input.click_pokemon_button)
+                await self.wait_async(0.6)
+                # OCR do menu no executor de percepção; o clique na thread de input
+                target = await self.perceive(self._switch_target, img, switch_idx)
+                switched = target is not None
+                if switched:
+                    await self.act(self.input.click, *target)
+            except Exception as e:
+                logger.error(f"Erro ao executar troca de Pokémon: {e}")
+                switched = False
+            if switched:
+                self.battle_ctx.reset()
+                if moves_task is not None:
+                    moves_task.cancel()
+                await self.wait_async(battle_cfg.get('action_cooldown', 2.5))
+                self.scheduler.expect_change()
+                return
+
+        if moves_task is not None:
+            my_moves = await moves_task
+            self.battle_ctx.remember_moves(hud_signature, my_moves)
+        best_slot = await self.perceive(
+            self._learn_and_choose, my_pokemon_name, enemy_name, enemy_level, my_moves
+        )
+        await self.act(self._attack, best_slot, enemy_name, my_moves)
+
+        await self.wait_async(battle_cfg.get('action_cooldown', 4.0))
+        self.scheduler.expect_change()
@@ -0,0 +1,58 @@
+from loguru import logger
+from ..perception.speculative import signatures_match
+
+
+class BattleContext:
+    """Memória de uma batalha: identidade (HUD) e golpes lidos no primeiro turno.
+
+    Nomes, nível e golpes só mudam com troca, desmaio ou novo encontro, e
+    nesses casos a HUD muda de pixels. Por isso cada leitura fica associada
+    à assinatura barata das ROIs de nome/nível (e sprites, se configuradas):
+    enquanto a assinatura do frame atual bater, a leitura é reaproveitada e
+    o OCR só roda no turno em que algo mudou.
+    """
+
+    def __init__(self, tolerance=3.0):
+        self.tolerance = float(tolerance)
+        self.reset()
+        self.reads_saved = 0
+
+    def reset(self):
+        self.signature = None
+        self.info = None
+        self.moves = None
+
+    def valid_for(self, signature):
+        """A leitura memorizada ainda vale para um frame com esta assinatura?"""
+        return self.info is not None and signatures_match(self.signature, signature, self.tolerance)
+
+    def hud_for(self, signature):
+        """Leitura da HUD memorizada (dict de ``get_battle_info``) ou None.
+
+        Assinatura diferente invalida tudo (inclusive os golpes).
+        """
+        if self.info is None:
+            return None
+        if not self.valid_for(signature):
+            logger.debug("HUD de batalha mudou (troca/desmaio/novo encontro): descartando leituras memorizadas.")
+            self.reset()
+            return None
+        self.reads_saved += 1
+        return self.info
+
+    def remember_hud(self, signature, info):
+        # Sem nome do inimigo a leitura falhou: não memoriza
+        if not info or not info.get('enemy_name'):
+            return
+        if not self.valid_for(signature):
+            self.moves = None
+        self.signature = signature
+        self.info = info
+
+    def moves_for(self, signature):
+        return self.moves if self.valid_for(signature) else None
+
+    def remember_moves(self, signature, moves):
+        # Leitura vazia/falha não é memorizada: tenta de novo no próximo turno
+        if self.valid_for(signature) and any(moves):
+            self.moves = list(moves)
@@ -1,267 +1,832 @@
 import time
-import cv2
-import winsound
-from pathlib import Path
-import ctypes
+import threading
 from loguru import logger
-from ..perception.game_state_detector import GameState
+from ..perception.game_state_detector import GameState, PerceptionSnapshot
+from .state_machine import StateMachine, ANY
+from .scheduler import AdaptiveScheduler
+from .battle_context import BattleContext
+from ..perception.speculative import SpeculativePerception, region_signature, signatures_match
+from ..perception.rois import ROI, RoiSet
+from ..perception.matching import TemplateMatcher
+from .config_reload import affected_parts
+from .debug_sink import DebugSink
+from .flight_recorder import FlightRecorder
+
+# Detectores rodados por estado (sobrescrevíveis em settings.yaml -> perception.profiles)
+DEFAULT_PERCEPTION_PROFILES = {
+    'exploring': ('scene', 'shiny', 'battle', 'talk', 'goto'),
+    'in_battle': ('scene', 'shiny', 'battle'),
+    'dialog': ('scene', 'shiny', 'battle'),
+    'menu': ('scene', 'shiny', 'battle'),
+    'shiny_found': ('shiny',),
+}
+
+class Preempted(Exception):
+    """Espera interrompida pelo watchdog de shiny: o passo atual é abandonado."""
+
 
 class BotController:
     def __init__(self, config, components):
         self.cfg = config
         self.cap = components['screen']
         self.detector = components['detector']
+        # Percepção em processos (FrameBus) quando configurada; mesma API do detector
+        self.perceiver = components.get('perceiver') or self.detector
         self.input = components['input']
         self.strategy = components['strategy']
         self.ocr = components['ocr']
         self.team_mgr = components['team_mgr']
+        # Golpes previstos pelo learnset e conferidos por pixels (opcional)
+        self.move_inference = components.get('move_inference')
         # Novo: processador de imagem para texto branco em fundo colorido
         self.img_proc = components.get('processor')
-        
+        # Histórico de encontros (SQLite); opcional
+        self.learning_store = components.get('learning_store')
+        # Escala/viewport do jogo (opcional); ROIs e templates acompanham a geometria do frame
+        self.layout = components.get('layout')
+        # Recarga de settings.yaml entre ticks (opcional); templates/matcher base para reconstruir
+        self.config_watcher = components.get('config_watcher')
+        self.templates = components.get('templates')
+        self.matcher = components.get('matcher')
+
         self.running = True
         self.debug = bool(self.cfg.get('bot', {}).get('debug_mode', False))
+        # Artefatos/logs de debug vão para uma thread com limite de taxa (debug.sink)
+        self.debug_sink = components.get('debug_sink')
+        if self.debug_sink is None and self.debug:
+            self.debug_sink = DebugSink(self.cfg)
+        self._debug_state = None
+        self.location = self.cfg.get('bot', {}).get('location') or None
+        self.encounter = None  # encontro em andamento (dict) ou None
+        self.frame_id = 0
+        self.machine = self._build_state_machine()
+        # Fila de input: ações pedidas num estado expiram se a máquina mudar de estado
+        bind_state = getattr(self.input, 'bind_state', None)
+        if bind_state is not None:
+            bind_state(lambda: self.machine.current)
+        # Gravador de voo: últimos segundos de frames/percepção/ações, gravados em incidentes
+        self.recorder = components.get('recorder')
+        if self.recorder is None and self.cfg.get('flight_recorder', {}).get('enabled', False):
+            self.recorder = FlightRecorder(self.cfg)
+        if self.recorder is not None:
+            self.input = self.recorder.watch_input(self.input)
+        # Espera bloqueante; no modo supervisor, libera a vez para as outras sessões
+        self._base_sleep = components.get('sleep') or time.sleep
+        self._sleep = self._pause
+        # Watchdog de shiny (thread própria): seu evento interrompe qualquer espera
+        self.watchdog = components.get('watchdog')
+        self.preempt = self.watchdog.event if self.watchdog is not None else threading.Event()
+        # Alertas assíncronos (som/desktop/webhook); criados no primeiro uso se não vierem prontos
+        self.alerts = components.get('alerts')
+        # Perfil de inicialização (main.py): fechado e gravado no primeiro tick
+        self.startup = components.get('startup')
+        # Ritmo do loop: rápido em batalha/tela mudando, recua quando nada acontece
+        self.scheduler = AdaptiveScheduler(self.cfg, sleep=self._sleep)
+        # Percepção especulativa: OCR do próximo passo roda durante as animações
+        self.speculative = None
+        self.battle_frame_id = 0  # frame em que a batalha atual começou
+        # Identidade/golpes lidos no 1º turno valem até a HUD mudar de pixels
+        self.battle_ctx = BattleContext(self.cfg.get('perception', {}).get('signature_tolerance', 3.0))
+        if self.cfg.get('battle', {}).get('speculative_perception', False):
+            perception_cfg = self.cfg.get('perception', {})
+            self.speculative = SpeculativePerception(
+                workers=perception_cfg.get('speculative_workers', 1),
+                tolerance=perception_cfg.get('signature_tolerance', 3.0),
+            )
+
+    @staticmethod
+    def _profiles(config):
+        profiles = dict(DEFAULT_PERCEPTION_PROFILES)
+        profiles.update(config.get('perception', {}).get('profiles', {}) or {})
+        return profiles
+
+    def _build_state_machine(self):
+        """Tabela de estados/transições do bot."""
+        profiles = self._profiles(self.cfg)
+
+        machine = StateMachine(GameState.EXPLORING)
+        machine.add_state(
+            GameState.EXPLORING,
+            on_tick=self.handle_exploring,
+            profile=profiles['exploring'],
+        )
+        machine.add_state(
+            GameState.IN_BATTLE,
+            on_enter=self._begin_encounter,
+            on_exit=self._leave_battle,
+            on_tick=self.handle_battle,
+            profile=profiles['in_battle'],
+        )
+        machine.add_state(
+            GameState.DIALOG,
+            on_tick=self.handle_dialog,
+            profile=profiles['dialog'],
+        )
+        machine.add_state(
+            GameState.MENU,
+            on_tick=self.handle_menu,
+            profile=profiles['menu'],
+        )
+        machine.add_state(
+            GameState.SHINY_FOUND,
+            on_enter=self._on_shiny,
+            profile=profiles['shiny_found'],
+        )
+
+        # Shiny tem prioridade absoluta, de qualquer estado
+        machine.add_transition(ANY, GameState.SHINY_FOUND, lambda snap: snap.shiny is True)
+        machine.add_transition(GameState.EXPLORING, GameState.IN_BATTLE, lambda snap: snap.in_battle is True)
+        machine.add_transition(GameState.IN_BATTLE, GameState.EXPLORING, lambda snap: snap.in_battle is False)
+        # Diálogo/menu vêm do classificador de cena (só existem com modelo treinado)
+        for source in (GameState.EXPLORING, GameState.DIALOG, GameState.MENU):
+            for target in (GameState.DIALOG, GameState.MENU):
+                if source != target:
+                    machine.add_transition(source, target, lambda snap, t=target: snap.state == t)
+        for source in (GameState.DIALOG, GameState.MENU):
+            machine.add_transition(source, GameState.IN_BATTLE, lambda snap: snap.in_battle is True)
+            machine.add_transition(source, GameState.EXPLORING, lambda snap: snap.state == GameState.EXPLORING)
+        return machine
 
     def run(self):
         logger.info("Bot Iniciado! Pressione Ctrl+C para parar.")
-        while self.running:
-            img = self.cap.capture()
-            state = self.detector.detect_state(img)
+        if self.watchdog is not None:
+            self.watchdog.start()
+        if self.config_watcher is not None:
+            self.config_watcher.start()
+        if self.recorder is not None:
+            self.recorder.start()
+        try:
+            while self.running:
+                started = time.monotonic()
+                try:
+                    state = self.tick()
+                except Preempted:
+                    state = self._on_preempt()
+                except Exception:
+                    self._record_incident('exception')
+                    raise
+                self._first_tick_done()
+                self.scheduler.sleep(started, urgent=state == GameState.IN_BATTLE)
+        finally:
+            self.shutdown()
+
+    def _first_tick_done(self):
+        if self.startup is not None:
+            startup, self.startup = self.startup, None
+            startup.first_tick()
+
+    def tick(self):
+        """Uma iteração: captura, percepção (uma vez por frame) e passo da máquina."""
+        if self.preempt.is_set():
+            return self._on_preempt()
+        self._apply_config_reload()
+        img = self.cap.capture()
+        self.frame_id += 1
+        self._update_layout(img)
+        self.scheduler.observe(img)
+        self._record_frame(img)
 
-            if self.debug:
-                logger.debug(f"Estado detectado: {state.name}")
+        # Nada acontecendo na exploração: só a checagem barata de batalha
+        exploring = self.machine.current in (None, GameState.EXPLORING)
+        if not self.scheduler.needs_full_perception(exploring) and not self.detector.battle_hint(img):
+            return self.machine.current
 
-            if state == GameState.SHINY_FOUND:
-                self.handle_shiny()
-            elif state == GameState.IN_BATTLE:
-                self.handle_battle(img)
-            else:
-                self.handle_exploring(img)
-            
-            time.sleep(0.5)
+        snapshot = self.perceiver.perceive(img, self.machine.profile, frame_id=self.frame_id)
+        self.scheduler.mark_full_perception()
+        if self.recorder is not None:
+            self.recorder.note_perception(snapshot)
 
-    def handle_shiny(self):
-        logger.critical("SHINY ENCONTRADO! ALARME!")
+        if self.debug:
+            self._debug_snapshot(img, snapshot)
 
-        # 1) Toca o alarme padrão do PC (beep) algumas vezes
-        for _ in range(10):
-            winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
-            time.sleep(0.5)
+        return self.machine.step(snapshot, refine=self._refine_snapshot)
 
-        # 2) Notificação visual simples via MessageBox do Windows
+    def _record_frame(self, img):
+        """Gravador de voo: frame reduzido no ring e detector de bot parado."""
+        if self.recorder is not None:
+            self.recorder.record_frame(img, self.frame_id)
+            self.recorder.observe(self.machine.current, self.scheduler.activity)
+
+    def _record_incident(self, reason, timeout=5.0):
+        """Grava o gravador de voo e espera (o processo pode estar saindo)."""
+        if self.recorder is None:
+            return
+        writer = self.recorder.dump(reason)
+        if writer is not None:
+            writer.join(timeout)
+
+    def _debug_snapshot(self, img, snapshot):
+        """Log do estado (limitado) e frame com os ROIs desenhados quando o estado muda."""
+        self.debug_sink.log('state', lambda: f"Estado detectado: {snapshot.state.name} "
+                                             f"(detectores={sorted(snapshot.detectors)})")
+        if snapshot.state != self._debug_state:
+            self._debug_state = snapshot.state
+            self.debug_sink.save('states', snapshot.state.name, img,
+                                 annotations=self.rois.bind(img.shape).rois.values())
+
+    def _update_layout(self, img):
+        """Redetecta o layout só quando a geometria do frame muda; repassa ROIs/matcher."""
+        if self.layout is None:
+            return
+        transform = self.layout.update(img)
+        if transform is None:
+            return
+        self.cfg = self.layout.config_for(transform)
+        matcher = self.layout.matcher_for(transform)
+        self.perceiver.apply_layout(self.cfg, matcher)
+        if hasattr(self.input, 'apply_layout'):
+            self.input.apply_layout(self.cfg, matcher)
+
+    def _apply_config_reload(self):
+        """Aplica uma nova versão de settings.yaml, se houver (sempre entre dois ticks)."""
+        if self.config_watcher is None:
+            return
+        pending = self.config_watcher.take()
+        if pending is not None:
+            self.reload_config(*pending)
+
+    def reload_config(self, config, changed):
+        """Troca a config em uso reconstruindo só as partes afetadas pelas chaves ``changed``."""
+        parts, restart = affected_parts(changed)
+        if restart:
+            logger.warning(f"Chaves alteradas que só valem após reiniciar o bot: {restart}")
+        if not parts:
+            return False
+
+        # 1) Constrói o que mudou sem tocar no que está em uso (o registro de
+        #    templates é compartilhado entre sessões: a mudança gera um novo)
+        try:
+            matcher, templates = self.matcher, self.templates
+            if templates is not None:
+                if 'templates' in parts:
+                    templates, reloaded = templates.reconfigured(config)
+                    logger.info(f"Templates relidos: {reloaded}")
+                if parts & {'templates', 'matching'}:
+                    matcher = TemplateMatcher(templates, config)
+            layout = self.layout
+            if templates is None or not config.get('layout', {}).get('enabled', False):
+                layout = None
+            elif layout is None or parts & {'layout', 'rois', 'templates', 'matching'}:
+                # Geometria redetectada no próximo tick com a config nova
+                from ..perception.layout import Layout
+                layout = Layout(config, templates, matcher)
+            # Mesmo layout: escala, âncoras e matchers cacheados continuam; só a config base muda
+            keep_layout = layout is not None and layout is self.layout and layout.transform is not None
+            active_cfg, active_matcher = config, matcher
+            if keep_layout:
+                active_cfg = layout.transform.apply(config)
+                active_matcher = layout.matcher_for(layout.transform)
+            scheduler = self.scheduler
+            if 'scheduler' in parts:
+                scheduler = AdaptiveScheduler(config, sleep=self._sleep)
+            profiles = self._profiles(config)
+        except Exception as e:
+            logger.error(f"Erro ao recarregar a config; mantendo a atual: {e}")
+            return False
+
+        # 2) Troca tudo de uma vez
+        if keep_layout:
+            layout.rebase(config)
+        self.cfg = active_cfg
+        self.templates = templates
+        self.matcher = matcher
+        self.layout = layout
+        self.scheduler = scheduler
+        if active_matcher is not None:
+            self.perceiver.apply_layout(active_cfg, active_matcher)
+            if hasattr(self.input, 'apply_layout'):
+                self.input.apply_layout(active_cfg, active_matcher)
+        if 'ocr' in parts:
+            configure = getattr(self.ocr, 'configure', None)
+            if configure is not None:
+                configure(config['ocr']['tesseract_path'])
+        for state, key in ((GameState.EXPLORING, 'exploring'), (GameState.IN_BATTLE, 'in_battle'),
+                           (GameState.DIALOG, 'dialog'), (GameState.MENU, 'menu'),
+                           (GameState.SHINY_FOUND, 'shiny_found')):
+            self.machine.states[state].profile = tuple(profiles[key])
+        self.debug = bool(config.get('bot', {}).get('debug_mode', False))
+        if self.debug_sink is not None:
+            self.debug_sink.configure(config)
+        elif self.debug:
+            self.debug_sink = DebugSink(config)
+        self.location = config.get('bot', {}).get('location') or None
+        self.battle_ctx.tolerance = float(config.get('perception', {}).get('signature_tolerance', 3.0))
+        logger.info(f"Config recarregada: {sorted(parts)}")
+        return True
+
+    def _keep(self, frame):
+        """Frame que sobrevive às próximas capturas (buffers de captura são reutilizados)."""
+        keep = getattr(self.cap, 'keep', None)
+        return keep(frame) if keep is not None else frame
+
+    def _pause(self, seconds):
+        """Dorme até ``seconds``, acordando assim que o watchdog sinalizar shiny."""
+        if self.preempt.is_set() or seconds <= 0:
+            return
+        if self._base_sleep is time.sleep:
+            self.preempt.wait(seconds)
+            return
+        # Sono cooperativo (supervisor): em fatias de um frame, checando o sinal
+        deadline = time.monotonic() + seconds
+        while not self.preempt.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._base_sleep(min(remaining, self.scheduler.min_interval))
+
+    def wait(self, seconds):
+        """Toda espera do controller passa por aqui (animações, cooldowns).
+
+        Levanta ``Preempted`` se o watchdog detectar shiny durante a espera.
+        """
+        self._pause(seconds)
+        if self.preempt.is_set():
+            raise Preempted()
+
+    def _on_preempt(self):
+        """Leva a máquina para SHINY_FOUND com o frame em que o watchdog viu o shiny."""
+        if self.machine.current == GameState.SHINY_FOUND:
+            return self.machine.current
+        frame = self.watchdog.frame if self.watchdog is not None else None
+        snapshot = PerceptionSnapshot(frame, self.frame_id)
+        snapshot.detectors.add('shiny')
+        snapshot.shiny = True
+        return self.machine.step(snapshot)
+
+    def watch(self, seconds, *on_frame):
+        """Espera ``seconds`` capturando frames (taxa máxima) para ``on_frame(frame, frame_id)``.
+
+        Sem percepção especulativa ativa, é só um ``wait``.
+        """
+        if not on_frame or self.speculative is None:
+            self.wait(seconds)
+            return
+        deadline = time.monotonic() + seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.wait(min(remaining, self.scheduler.min_interval))
+            frame = self.cap.capture()
+            self.frame_id += 1
+            for callback in on_frame:
+                callback(frame, self.frame_id)
+
+    def stop(self):
+        self.running = False
+
+    def _refine_snapshot(self, snapshot, profile):
+        self.perceiver.perceive(snapshot.image, profile, snapshot=snapshot)
+
+    def shutdown(self):
+        """Libera recursos com estado pendente (flush final do que foi aprendido)."""
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        close_input = getattr(self.input, 'close', None)
+        if close_input is not None:
+            close_input()
+        if self.encounter is not None:
+            self._end_encounter('interrupted')
         try:
-            ctypes.windll.user32.MessageBoxW(
-                0,
-                "Um SHINY foi detectado pelo PokeBot Pro!",
-                "PokeBot Pro - SHINY ENCONTRADO",
-                0x00000040,  # MB_ICONINFORMATION
+            self.team_mgr.close()
+            # O banco pode ser compartilhado entre sessões: quem o criou fecha
+            if self.learning_store is not None:
+                self.learning_store.flush()
+        except Exception as e:
+            logger.error(f"Erro ao gravar dados pendentes no encerramento: {e}")
+        if self.speculative is not None:
+            logger.info(f"Leituras especulativas: {self.speculative.hits} aproveitadas, {self.speculative.misses} descartadas")
+            self.speculative.shutdown()
+        if self.perceiver is not self.detector:
+            self.perceiver.close()
+        if self.move_inference is not None:
+            logger.info(f"Golpes conferidos por pixels: {self.move_inference.verified} slots, "
+                        f"{self.move_inference.ocr_slots} por OCR")
+            self.move_inference.close()
+        if self.debug_sink is not None:
+            self.debug_sink.close()
+        if self.recorder is not None:
+            self.recorder.stop()
+        if self.alerts is not None:
+            # Deixa os alertas pendentes terminarem (o processo pode sair logo depois);
+            # a MessageBox do shiny é esperada até o jogador fechá-la
+            self.alerts.close(timeout=self.cfg.get('alerts', {}).get('drain_timeout', 30.0))
+
+    def _begin_encounter(self, snapshot=None):
+        """Entrada em IN_BATTLE: abre o registro do encontro."""
+        self.battle_frame_id = self.frame_id
+        self.battle_ctx.reset()
+        # Novo encontro: crença de HP e tabela de transposição da busca valem só para uma batalha
+        search = getattr(self.strategy, 'search', None)
+        if search is not None:
+            search.reset()
+        self.encounter = {
+            'species': '',
+            'level': None,
+            'turns': 0,
+            'shiny_checks': 0,
+            'outcome': None,
+            'started': time.time(),
+        }
+
+    def _leave_battle(self, snapshot):
+        """Saída de IN_BATTLE; se foi para SHINY_FOUND, quem fecha é _on_shiny."""
+        self.battle_ctx.reset()
+        if self.speculative is not None:
+            self.speculative.invalidate()
+        if not snapshot.shiny:
+            self._end_encounter()
+
+    def _on_shiny(self, snapshot):
+        if self.encounter is None:
+            self._begin_encounter(snapshot)
+        self.encounter['shiny_checks'] += 1
+        self._end_encounter('shiny')
+        self.handle_shiny()
+
+    def _end_encounter(self, outcome=None):
+        encounter, self.encounter = self.encounter, None
+        if encounter is None or self.learning_store is None:
+            return
+        outcome = outcome or encounter['outcome'] or 'ended'
+        try:
+            self.learning_store.log_encounter(
+                encounter['species'] or 'unknown',
+                level=encounter['level'],
+                location=self.location,
+                outcome=outcome,
+                turns=encounter['turns'],
+                shiny_checks=encounter['shiny_checks'],
+                shiny=outcome == 'shiny',
+                ts=encounter['started'],
             )
         except Exception as e:
-            logger.error(f"Falha ao exibir MessageBox de shiny: {e}")
+            logger.error(f"Erro ao registrar encontro: {e}")
+
+    def handle_shiny(self):
+        logger.critical("SHINY ENCONTRADO! ALARME!")
+        if self.recorder is not None:
+            self.recorder.dump('shiny')
+
+        # Som, notificação e webhook em threads próprias: o bot não espera o alerta
+        if self.alerts is None:
+            from ..action.alerts import build_alerts
+            self.alerts = build_alerts(self.cfg)
+        self.alerts.notify('shiny', "Um SHINY foi detectado pelo PokeBot Pro!")
 
         # Após alertar, para o bot completamente
         self.running = False
 
-    def handle_exploring(self, img):
+    def handle_exploring(self, snapshot):
         # 1) Verifica se há diálogo (talk.png) antes de qualquer coisa
-        talk_tpl = cv2.imread(self.cfg['assets']['templates_dir'] + self.cfg['assets']['talk_image'])
-        if talk_tpl is not None:
-            # If a specific search area is configured, crop the image to that ROI to avoid false positives
-            talk_area = self.cfg.get('detection', {}).get('talk_search_area')
-            search_img = img
-            if talk_area and isinstance(talk_area, (list, tuple)) and len(talk_area) == 4:
-                x1, y1, x2, y2 = talk_area
-                # Accept formats [x,y,w,h] or [x1,y1,x2,y2]
-                if x2 <= x1 or y2 <= y1:
-                    # probably [x,y,w,h]
-                    x, y, w, h = talk_area
-                    x1, y1, x2, y2 = int(x), int(y), int(x + w), int(y + h)
-                else:
-                    x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-
-                # Clamp to image bounds
-                h_img, w_img = img.shape[:2]
-                x1 = max(0, min(x1, w_img - 1))
-                x2 = max(0, min(x2, w_img))
-                y1 = max(0, min(y1, h_img - 1))
-                y2 = max(0, min(y2, h_img))
-                if x2 > x1 and y2 > y1:
-                    search_img = img[y1:y2, x1:x2]
-
-                if self.debug:
-                    logger.debug(f"Talk search area usada: [{x1}, {y1}, {x2}, {y2}]")
-
-            res_talk = cv2.matchTemplate(search_img, talk_tpl, cv2.TM_CCOEFF_NORMED)
-            _, max_val_talk, _, _ = cv2.minMaxLoc(res_talk)
+        if snapshot.talk is not None:
+            max_val_talk = snapshot.talk[0]
             # Use configurable threshold (default 0.95) to avoid confusão com chat
             talk_thresh = self.cfg.get('detection', {}).get('talk_threshold', 0.95)
             if self.debug:
-                logger.debug(f"Score talk.png: {max_val_talk:.3f} (threshold={talk_thresh})")
+                self.debug_sink.log('talk', lambda: f"Score talk.png: {max_val_talk:.3f} (threshold={talk_thresh})")
             if max_val_talk > talk_thresh:
                 logger.info(f"Ícone de diálogo encontrado (score={max_val_talk:.3f}). Avançando conversa com Espaço...")
                 self.input.press('space')
                 return
 
         # 2) Se não tem diálogo, tenta seguir missão via Goto
-        goto_tpl = cv2.imread(self.cfg['assets']['templates_dir'] + self.cfg['assets']['goto_image'])
-        res = cv2.matchTemplate(img, goto_tpl, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(res)
-
         goto_thresh = self.cfg.get('detection', {}).get('goto_threshold', 0.8)
 
-        if self.debug:
-            logger.debug(f"Score goto.png: {max_val:.3f} (threshold={goto_thresh})")
+        # A máquina de estados só chega aqui se este frame não mostrou botões de batalha,
+        # então não é preciso revalidar antes de clicar em Goto.
+        if snapshot.goto is not None:
+            max_val, max_loc, (w, h) = snapshot.goto
 
-        # Antes de clicar em Goto, revalida se não estamos em batalha neste frame
-        current_state = self.detector.detect_state(img)
-        if current_state == GameState.IN_BATTLE:
             if self.debug:
-                logger.debug("Botões de batalha detectados ao tentar clicar em Goto. Cancelando clique.")
-            return
+                self.debug_sink.log('goto', lambda: f"Score goto.png: {max_val:.3f} (threshold={goto_thresh})")
 
-        if max_val > goto_thresh:
-            logger.info("Botão Goto encontrado. Seguindo missão...")
-            # Clica em uma região interna "segura" do botão encontrado (não precisa ser o centro exato)
-            h, w = goto_tpl.shape[:2]
-            x, y = max_loc
+            if max_val > goto_thresh:
+                logger.info("Botão Goto encontrado. Seguindo missão...")
+                # Clica em uma região interna "segura" do botão encontrado (não precisa ser o centro exato)
+                x, y = max_loc
+                button = ROI(x, y, x + w, y + h)
+                safe = button.inner(0.1) or button
+                cx, cy = safe.center
 
-            margin_x = int(0.1 * w)
-            margin_y = int(0.1 * h)
-
-            safe_x1 = x + margin_x
-            safe_x2 = x + w - margin_x
-            safe_y1 = y + margin_y
-            safe_y2 = y + h - margin_y
-
-            cx = (safe_x1 + safe_x2) // 2
-            cy = (safe_y1 + safe_y2) // 2
-
-            if self.debug:
-                logger.debug(f"Clicando em Goto nas coordenadas seguras: ({cx}, {cy}) dentro de [{safe_x1},{safe_y1},{safe_x2},{safe_y2}]")
+                if self.debug:
+                    logger.debug(f"Clicando em Goto nas coordenadas seguras: ({cx}, {cy}) dentro de {list(safe.corners)}")
 
-            self.input.click(cx, cy)
-            time.sleep(2) # Espera caminhar
-            return
+                self.input.click(cx, cy)
+                # Espera caminhar: em vez de dormir, o scheduler segura a percepção
+                # completa e segue só com a checagem barata de batalha
+                self.scheduler.hold(2.0)
+                return
 
         # 3) Fallback: nenhum talk nem Goto, mantém leve interação
         if self.debug:
-            logger.debug("Nenhum talk/goto confiável encontrado. Fallback: pressionando espaço.")
+            self.debug_sink.log('fallback', "Nenhum talk/goto confiável encontrado. Fallback: pressionando espaço.")
         self.input.press('space')
 
-    def handle_battle(self, img):
+    def handle_dialog(self, snapshot):
+        """Caixa de texto aberta fora de batalha: avança com Espaço."""
+        self.input.press('space')
+
+    def handle_menu(self, snapshot):
+        """Menu aberto fora de batalha (aberto por engano): fecha."""
+        key = self.cfg.get('scene_classifier', {}).get('menu_close_key', 'esc')
+        logger.info(f"Menu aberto durante a exploração; fechando com '{key}'")
+        self.input.press(key)
+
+    def handle_battle(self, snapshot):
         # Proteção: se por algum motivo a HUD de batalha sumiu, não atacar
-        if self.detector.detect_state(img) != GameState.IN_BATTLE:
+        if not snapshot.in_battle:
             if self.debug:
                 logger.debug("handle_battle chamado mas estado não é IN_BATTLE. Abortando ações de ataque.")
             return
 
+        self._count_shiny_check(snapshot)
+
+        # Do 2º turno em diante, nomes e golpes vêm da memória da batalha
+        memo = self.battle_ctx.valid_for(self.detector.hud_signature(snapshot.image))
+
+        # A HUD já está no frame que detectou a batalha: OCR dos nomes começa
+        # agora, em paralelo com o clique em FIGHT e a animação do menu
+        if not memo:
+            self._speculate_hud_now(snapshot.image, snapshot.frame_id)
+
         # Sempre garantir que o menu de batalha está focado em FIGHT primeiro
-        try:
-            self.input.click_fight_button()
-            if self.debug:
-                logger.debug("Clique inicial em FIGHT enviado ao entrar em handle_battle.")
-            time.sleep(self.cfg.get('battle', {}).get('fight_to_moves_delay', 1.2))
-        except Exception as e:
-            logger.error(f"Erro ao clicar no FIGHT inicial: {e}")
+        if self._click_fight():
+            # Durante a animação, golpes são lidos assim que o menu estabiliza
+            prefetch = () if memo and self.battle_ctx.moves is not None else (
+                self._prefetcher('moves', self._moves_signature, self._read_moves),
+            )
+            self.watch(self.cfg.get('battle', {}).get('fight_to_moves_delay', 1.2), *prefetch)
 
         # Após o clique em FIGHT e o pequeno delay, captura um novo frame
         # para garantir que o menu de golpes já esteja completamente renderizado.
         img = self.cap.capture()
+        self.frame_id += 1
 
         # 1. Ler Inimigo
-        battle_info = self.detector.get_battle_info(img)
-        enemy_name = battle_info.get('enemy_name', '').strip()
-        my_pokemon_name = battle_info.get('player_name', '').strip() or "MeuPokemonAtual"
-
-        if self.debug:
-            logger.debug(f"Inimigo detectado: '{enemy_name}' | Meu Pokémon: '{my_pokemon_name}'")
+        hud_signature = self.detector.hud_signature(img)
+        enemy_name, my_pokemon_name, enemy_level = self._apply_battle_info(self._battle_info(img, hud_signature))
 
         # 2. Decidir se deve fugir ANTES de abrir menu de golpes
-        try:
-            if self.strategy.should_flee(my_pokemon_name, enemy_name):
-                logger.info(f"Decisão de FUGIR da batalha contra {enemy_name}.")
-                # Usa o botão RUN via template (run.png)
-                try:
-                    self.input.click_run_button()
-                    time.sleep(self.cfg.get('battle', {}).get('action_cooldown', 2.5))
-                    return
-                except Exception as e_click:
-                    logger.error(f"Erro ao clicar em RUN via template: {e_click}")
-        except Exception as e:
-            logger.error(f"Erro ao decidir fuga: {e}")
+        if self._should_flee(my_pokemon_name, enemy_name):
+            if self._click_run():
+                self.wait(self.cfg.get('battle', {}).get('action_cooldown', 2.5))
+                self.scheduler.expect_change()
+                return
 
         # 3. (opcional) Tentar trocar de Pokémon se houver alguém claramente vantajoso
-        try:
-            switch_idx = self.strategy.choose_switch_target(enemy_name)
-        except Exception as e:
-            logger.error(f"Erro ao decidir troca de Pokémon: {e}")
-            switch_idx = None
-
+        switch_idx = self._choose_switch(enemy_name, my_pokemon_name, enemy_level)
         if switch_idx is not None:
             logger.info(f"Decisão de TROCAR para o slot {switch_idx} da equipe contra {enemy_name}.")
             try:
                 # Abre menu de POKEMON pelo botão com ROI/template existente
                 self.input.click_pokemon_button()
-                time.sleep(0.6)
-
-                # Usa menu de troca configurado em rois.switch_menu e OCR especializado
-                switch_cfg = self.cfg.get('rois', {}).get('switch_menu', {})
-                container = switch_cfg.get('container')
-                slot_h = int(switch_cfg.get('slot_height', 30))
-
-                if container and len(container) == 4:
-                    x1, y1, x2, y2 = container
-                    if x2 <= x1 or y2 <= y1:
-                        x, y, w, h = container
-                        x1, y1, x2, y2 = int(x), int(y), int(x + w), int(y + h)
-                    h_img, w_img = img.shape[:2]
-                    x1 = max(0, min(int(x1), w_img - 1))
-                    x2 = max(0, min(int(x2), w_img))
-                    y1 = max(0, min(int(y1), h_img - 1))
-                    y2 = max(0, min(int(y2), h_img))
-
-                    # OCR da lista inteira com método especializado
-                    menu_img = img[y1:y2, x1:x2]
-                    detected_names = self.ocr.ocr_party_list(menu_img)
-
-                    # Atualiza equipe atual com o que foi lido
-                    self.team_mgr.update_team_from_hud(detected_names)
-
-                    # Clica aproximadamente na linha correspondente ao índice sugerido
-                    idx = max(0, min(int(switch_idx), max(len(detected_names) - 1, 0)))
-                    cy = y1 + idx * slot_h + slot_h // 2
-                    cx = x1 + (x2 - x1) // 2
-                    if self.debug:
-                        logger.debug(f"Clicando no slot de equipe {idx} em ({cx}, {cy}) para trocar Pokémon. Nomes detectados: {detected_names}")
-                    self.input.click(cx, cy)
+                self.wait(0.6)
 
+                if self._switch_to(img, switch_idx):
+                    self.battle_ctx.reset()
                     # Pequena espera para animação de troca
-                    time.sleep(self.cfg.get('battle', {}).get('action_cooldown', 2.5))
+                    self.wait(self.cfg.get('battle', {}).get('action_cooldown', 2.5))
+                    self.scheduler.expect_change()
 
                     # Depois da troca, não ataca neste tick; deixa próxima iteração decidir
                     return
-                else:
-                    logger.warning("ROI de menu de troca (switch_menu.container) não configurada; não foi possível trocar.")
             except Exception as e:
                 logger.error(f"Erro ao executar troca de Pokémon: {e}")
 
         # 4. Neste ponto o menu de golpes já deve estar aberto pelo clique inicial em FIGHT
 
         # 5. Ler Meus Golpes (Para aprender) - texto branco nos botões
-        my_moves = []
-        for i in range(1, 5):
-            roi_coords = self.cfg['rois']['moves'][f'slot_{i}']
-            x1, y1, x2, y2 = roi_coords
-            move_img = img[y1:y2, x1:x2]
+        if self.debug:
+            self._save_move_debug(img, my_pokemon_name)
+        my_moves = self.battle_ctx.moves_for(hud_signature)
+        if my_moves is None:
+            my_moves = self._speculated('moves', self._moves_signature(img))
+            if my_moves is None:
+                my_moves = self._infer_moves(img, my_pokemon_name)
+            self.battle_ctx.remember_moves(hud_signature, my_moves)
 
-            # Em modo debug, salva a ROI do botão de golpe em disco para calibração manual
+        # 6/7. Salvar o que aprendeu e decidir o ataque
+        best_slot = self._learn_and_choose(my_pokemon_name, enemy_name, enemy_level, my_moves)
+
+        # 8. Atacar clicando no slot escolhido
+        self._attack(best_slot, enemy_name, my_moves)
+
+        # Espera animação de ataque/botões reaparecerem (mais paciente); a HUD
+        # do próximo turno é lida assim que a tela estabiliza
+        self.watch(
+            self.cfg.get('battle', {}).get('action_cooldown', 4.0),
+            self._prefetcher('hud', self.detector.hud_signature, self.perceiver.get_battle_info,
+                             known=self.battle_ctx.valid_for),
+        )
+        self.scheduler.expect_change()
+
+    # --------- Percepção especulativa ---------
+    def _prefetcher(self, key, signature_fn, read_fn, known=None):
+        """Callback de ``watch``: dispara ``read_fn(frame)`` quando a região fica estável.
+
+        Estável = mesma assinatura em dois frames seguidos; não repete se já
+        houver especulação com essa assinatura nem se ``known(assinatura)``
+        (leitura já memorizada).
+        """
+        previous = [None]
+
+        def on_frame(frame, frame_id):
+            signature = signature_fn(frame)
+            stable = previous[0] is not None and signatures_match(previous[0], signature, self.speculative.tolerance)
+            previous[0] = signature
+            if known is not None and known(signature):
+                return
+            if stable and not self.speculative.pending(key, signature):
+                self.speculative.submit(key, frame_id, signature, read_fn, self._keep(frame))
+
+        return on_frame
+
+    def _speculate_hud_now(self, image, frame_id):
+        if self.speculative is None or image is None:
+            return
+        signature = self.detector.hud_signature(image)
+        if not self.speculative.pending('hud', signature):
+            self.speculative.submit(
+                'hud', frame_id or self.frame_id, signature, self.perceiver.get_battle_info, self._keep(image)
+            )
+
+    def _speculated(self, key, signature):
+        """Resultado especulativo de ``key`` se ainda vale para o frame atual; senão None."""
+        if self.speculative is None:
+            return None
+        hit, result = self.speculative.take(key, signature, min_frame_id=self.battle_frame_id)
+        return result if hit else None
+
+    def _battle_info(self, img, signature):
+        """Leitura da HUD: memória da batalha, especulação ou OCR (nessa ordem)."""
+        info = self.battle_ctx.hud_for(signature)
+        if info is None:
+            info = self._speculated('hud', signature)
+            if info is None:
+                info = self.perceiver.get_battle_info(img)
+            self.battle_ctx.remember_hud(signature, info)
+        return info
+
+    def _moves_signature(self, img):
+        """Assinatura do retângulo que envolve os 4 slots de golpe."""
+        area = ROI.union(self._move_slots(img))
+        return region_signature(area.crop(img)) if area is not None else None
+
+    @property
+    def rois(self):
+        """ROIs da config atual (parseados uma vez por config; ver RoiSet)."""
+        return RoiSet.of(self.cfg)
+
+    def _move_slots(self, img):
+        """ROIs dos 4 botões de golpe recortados ao frame (None onde não couber)."""
+        rois = self.rois.bind(img.shape)
+        return [rois.get(f'moves.slot_{i}') for i in range(1, 5)]
+
+    # --------- Etapas do turno de batalha (compartilhadas com o AsyncBotController) ---------
+    def _count_shiny_check(self, snapshot):
+        if self.encounter is not None and snapshot.shiny is not None:
+            self.encounter['shiny_checks'] += 1
+
+    @staticmethod
+    def _when_done(result, on_success):
+        """Chama ``on_success()`` só quando a ação de input foi de fato executada.
+
+        O InputSimulator devolve na hora se clicou; a QueuedInput devolve a
+        InputAction, concluída depois na thread de input (expirada, descartada
+        ou com erro = sem sucesso). Inputs sem resultado (None) contam como executados.
+        """
+        then = getattr(result, 'then', None)
+        if then is not None:
+            then(lambda ok: on_success() if ok else None)
+        elif result is not False:
+            on_success()
+
+    def _click_fight(self):
+        try:
+            result = self.input.click_fight_button()
             if self.debug:
-                try:
-                    debug_dir = Path("debug") / "moves"
-                    debug_dir.mkdir(parents=True, exist_ok=True)
-                    debug_path = debug_dir / f"{my_pokemon_name.lower()}_slot{i}.png"
-                    cv2.imwrite(str(debug_path), move_img)
-                except Exception as e:
-                    logger.error(f"Erro ao salvar imagem de debug do slot {i}: {e}")
+                self._when_done(result, lambda: logger.debug("Clique inicial em FIGHT executado ao entrar em handle_battle."))
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao clicar no FIGHT inicial: {e}")
+            return False
+
+    def _apply_battle_info(self, battle_info):
+        """Normaliza a leitura da HUD e atualiza o encontro; retorna (inimigo, meu, nível)."""
+        enemy_name = battle_info.get('enemy_name', '').strip()
+        my_pokemon_name = battle_info.get('player_name', '').strip() or "MeuPokemonAtual"
+        enemy_level = battle_info.get('enemy_level')
+
+        if self.debug:
+            logger.debug(f"Inimigo detectado: '{enemy_name}' (Lv {enemy_level}) | Meu Pokémon: '{my_pokemon_name}'")
+
+        if self.encounter is not None:
+            self.encounter['species'] = enemy_name.lower() or self.encounter['species']
+            self.encounter['level'] = enemy_level or self.encounter['level']
+        return enemy_name, my_pokemon_name, enemy_level
+
+    def _should_flee(self, my_pokemon_name, enemy_name):
+        try:
+            if self.strategy.should_flee(my_pokemon_name, enemy_name):
+                logger.info(f"Decisão de FUGIR da batalha contra {enemy_name}.")
+                return True
+        except Exception as e:
+            logger.error(f"Erro ao decidir fuga: {e}")
+        return False
+
+    def _click_run(self):
+        # Usa o botão RUN via template (run.png)
+        try:
+            encounter = self.encounter
+
+            def fled():
+                encounter['outcome'] = 'fled'
+
+            result = self.input.click_run_button()
+            if encounter is not None:
+                self._when_done(result, fled)
+            return True
+        except Exception as e_click:
+            logger.error(f"Erro ao clicar em RUN via template: {e_click}")
+            return False
+
+    def _choose_switch(self, enemy_name, my_pokemon_name, enemy_level):
+        try:
+            return self.strategy.choose_switch_target(enemy_name, my_pokemon_name, enemy_level)
+        except Exception as e:
+            logger.error(f"Erro ao decidir troca de Pokémon: {e}")
+            return None
+
+    def _switch_to(self, img, switch_idx):
+        """Lê o menu de troca e clica no slot sugerido; False sem ROI configurada."""
+        target = self._switch_target(img, switch_idx)
+        if target is None:
+            return False
+        self.input.click(*target)
+        return True
+
+    def _switch_target(self, img, switch_idx):
+        """Só a leitura do menu de troca (OCR): ponto (x, y) do slot sugerido ou None sem ROI."""
+        # Usa menu de troca configurado em rois.switch_menu e OCR especializado
+        rois = self.rois.bind(img.shape)
+        container = rois.get('switch_menu.container')
+        slot_h = int(rois.scalar('switch_menu.slot_height', 30))
+
+        if container is None:
+            logger.warning("ROI de menu de troca (switch_menu.container) não configurada; não foi possível trocar.")
+            return None
+
+        # OCR da lista inteira com método especializado
+        menu_img = container.crop(img)
+        detected_names = self.ocr.ocr_party_list(menu_img)
+
+        # Atualiza equipe atual com o que foi lido
+        self.team_mgr.update_team_from_hud(detected_names)
+
+        # Clica aproximadamente na linha correspondente ao índice sugerido
+        idx = max(0, min(int(switch_idx), max(len(detected_names) - 1, 0)))
+        cy = container.y1 + idx * slot_h + slot_h // 2
+        cx = container.center[0]
+        if self.debug:
+            logger.debug(f"Clicando no slot de equipe {idx} em ({cx}, {cy}) para trocar Pokémon. Nomes detectados: {detected_names}")
+        return cx, cy
+
+    def _save_move_debug(self, img, my_pokemon_name):
+        """Modo debug: enfileira a ROI de cada botão de golpe para calibração manual."""
+        crops = [(f"{my_pokemon_name}_slot{i}", roi.crop(img))
+                 for i, roi in enumerate(self._move_slots(img), start=1) if roi is not None]
+        self.debug_sink.save_many('moves', crops)
+
+    def _infer_moves(self, img, my_pokemon_name):
+        """Golpes previstos conferidos pela assinatura de cada botão; OCR só nos slots que divergem."""
+        if self.move_inference is None:
+            return self._read_moves(img)
+        signatures = [region_signature(roi.crop(img)) if roi is not None else None for roi in self._move_slots(img)]
+        try:
+            my_moves, pending = self.move_inference.match_slots(my_pokemon_name, signatures)
+        except Exception as e:
+            logger.error(f"Erro na inferência de golpes, lendo todos por OCR: {e}")
+            my_moves, pending = [""] * len(signatures), list(range(len(signatures)))
+        if pending:
+            read = self._read_moves(img, only=pending)
+            for i in pending:
+                my_moves[i] = read[i]
+                self.move_inference.learn_slot(read[i], signatures[i])
+        if self.debug:
+            logger.debug(f"Golpes de '{my_pokemon_name}': {my_moves} (OCR nos slots {pending})")
+        return my_moves
+
+    def _read_moves(self, img, only=None):
+        """OCR dos botões de golpe (texto branco em fundo colorido); ``only`` limita aos índices dados."""
+        my_moves = []
+        for i, roi in enumerate(self._move_slots(img), start=1):
+            if roi is None or (only is not None and i - 1 not in only):
+                my_moves.append("")
+                continue
+            move_img = roi.crop(img)
 
             # Pré-processa texto branco em fundo dinâmico (botão de golpe)
             if self.img_proc is not None:
@@ -280,9 +845,11 @@ class BotController:
             my_moves.append(move_name)
 
             if self.debug:
-                logger.debug(f"Slot {i}: OCR_bruto='{move_text}' | nome_limpo='{move_name}' ROI={roi_coords}")
+                logger.debug(f"Slot {i}: OCR_bruto='{move_text}' | nome_limpo='{move_name}' ROI={list(roi.corners)}")
+        return my_moves
 
-        # 6. Salvar o que aprendeu (nome real do Pokémon atual)
+    def _learn_and_choose(self, my_pokemon_name, enemy_name, enemy_level, my_moves):
+        # Salvar o que aprendeu (nome real do Pokémon atual)
         try:
             self.team_mgr.save_moves(my_pokemon_name, my_moves)
             if self.debug:
@@ -290,22 +857,30 @@ class BotController:
         except Exception as e:
             logger.error(f"Erro ao salvar movimentos: {e}")
 
-        # 7. Decidir Ataque usando estratégia
+        # Decidir Ataque usando estratégia
         try:
-            best_slot = self.strategy.get_best_move(my_pokemon_name, enemy_name)
+            best_slot = self.strategy.get_best_move(my_pokemon_name, enemy_name, enemy_level)
         except Exception as e:
             logger.error(f"Erro na estratégia de batalha: {e}")
             best_slot = 0
 
+        if self.recorder is not None:
+            self.recorder.note('decision', self.frame_id, slot=best_slot, pokemon=my_pokemon_name,
+                               enemy=enemy_name, level=enemy_level, moves=my_moves)
         if self.debug:
             logger.debug(f"Estratégia escolheu slot {best_slot} para {my_pokemon_name} vs {enemy_name}")
+        return best_slot
 
-        # 8. Atacar clicando no slot escolhido
+    def _attack(self, best_slot, enemy_name, my_moves):
         logger.info(f"Atacando slot {best_slot} contra {enemy_name} | Moves: {my_moves}")
         try:
-            self.input.click_in_slot(best_slot)
+            encounter = self.encounter
+
+            def count_turn():
+                encounter['turns'] += 1
+
+            result = self.input.click_in_slot(best_slot)
+            if encounter is not None:
+                self._when_done(result, count_turn)
         except Exception as e:
             logger.error(f"Erro ao clicar no slot de ataque: {e}")
-
-        # Espera animação de ataque/botões reaparecerem (mais paciente)
-        time.sleep(self.cfg.get('battle', {}).get('action_cooldown', 4.0))
\ No newline at end of file
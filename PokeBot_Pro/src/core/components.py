@@ -0,0 +1,150 @@
+"""Montagem dos componentes do bot (usada por main.py e pelo Supervisor).
+
+Separa o que é carregado uma única vez por processo (base de conhecimento,
+templates, OCR, banco SQLite) do que é de cada sessão (captura, detector,
+input, equipe, estratégia).
+
+Módulos de partes opcionais (SQLite, busca, layout, watchdog, percepção
+em processos, backends de input) só são importados quando a config os
+liga, para não pesar no tempo até o primeiro tick.
+"""
+from src.perception.screen_capture import ScreenCapture
+from src.perception.ocr_engine import OCREngine
+from src.perception.game_state_detector import GameStateDetector
+from src.perception.image_processing import ImageProcessor
+from src.perception.template_registry import TemplateRegistry
+from src.perception.matching import TemplateMatcher
+from src.knowledge.pokemon_database import PokemonDatabase
+from src.knowledge.team_manager import TeamManager
+from src.decision.battle_strategy import BattleStrategy
+
+
+def build_shared(config):
+    """Recursos compartilháveis entre sessões."""
+    persistence_cfg = config.get('persistence', {})
+    learning_store = None
+    if persistence_cfg.get('backend', 'json') == 'sqlite' or persistence_cfg.get('encounter_log', False):
+        from src.knowledge.learning_store import LearningStore
+        learning_store = LearningStore(
+            persistence_cfg.get('sqlite_path', 'data/pokebot.db'),
+            batch_size=persistence_cfg.get('encounter_batch_size', 20),
+        )
+
+    templates = TemplateRegistry(config)
+    db = PokemonDatabase()
+
+    # Espécie inimiga pelo sprite (aprende com leituras de OCR confirmadas pela dex)
+    sprites = None
+    if config.get('sprites', {}).get('enabled', False):
+        from src.perception.sprite_index import SpriteIndex
+        sprites = SpriteIndex.from_config(config, confirm=db.canonical_name)
+
+    # Pré-filtro de estado por miniatura (modelo treinado offline; None sem modelo)
+    classifier = None
+    if config.get('scene_classifier', {}).get('enabled', False):
+        from src.perception.scene_classifier import SceneClassifier
+        classifier = SceneClassifier.from_config(config)
+
+    return {
+        'ocr': OCREngine(config['ocr']['tesseract_path']),
+        'templates': templates,
+        'matcher': TemplateMatcher(templates, config),
+        'processor': ImageProcessor(),
+        'db': db,
+        'sprites': sprites,
+        'classifier': classifier,
+        'learning_store': learning_store,
+    }
+
+
+def build_components(config, shared, screen=None, input_sim=None, ocr=None, moves_db_path=None):
+    """Componentes de uma sessão do bot, reaproveitando ``shared``.
+
+    ``screen``/``input_sim``/``ocr`` permitem substituir captura, input e OCR
+    (janela específica, replay, pool de OCR).
+    """
+    screen = screen or ScreenCapture(config)
+    ocr = ocr or shared['ocr']
+    detector = GameStateDetector(screen, ocr, config, templates=shared['templates'], matcher=shared['matcher'],
+                                 sprites=shared.get('sprites'), classifier=shared.get('classifier'))
+
+    if input_sim is None:
+        # Import tardio: backends de input (pyautogui/XTest) exigem display e não são usados em replay
+        from src.action.input_simulator import InputSimulator
+        queued = config.get('input', {}).get('queue', {}).get('enabled', False)
+        # Na fila, os templates dos botões são procurados na thread de input: captura própria,
+        # sem tocar nos buffers reaproveitados da captura da sessão
+        own_capture = _capture_factory(config, screen) if queued and isinstance(screen, ScreenCapture) else None
+        input_sim = InputSimulator(config, screen=screen, templates=shared['templates'], matcher=shared['matcher'],
+                                   capture_factory=own_capture)
+        # Ações vão para a thread de input; o controller não espera animação do mouse
+        if queued:
+            from src.action.input_queue import QueuedInput
+            input_sim = QueuedInput(input_sim, config)
+
+    # Persistência: JSON (padrão) ou SQLite; o log de encontros sempre usa SQLite
+    persistence_cfg = config.get('persistence', {})
+    use_sqlite = persistence_cfg.get('backend', 'json') == 'sqlite'
+    team_mgr = TeamManager(
+        moves_db_path=moves_db_path or "data/known_moves.json",
+        persistence_cfg=persistence_cfg,
+        learning_store=shared['learning_store'] if use_sqlite else None,
+    )
+
+    # Modo de decisão: "greedy" (um turno) ou "search" (lookahead com orçamento de tempo)
+    db = shared['db']
+
+    # Golpes pelo learnset + assinatura de pixels dos botões (OCR só nos slots que divergem)
+    move_inference = None
+    if config.get('move_inference', {}).get('enabled', False):
+        from src.knowledge.move_inference import MoveInference
+        move_inference = MoveInference(db, team_mgr, config, store=shared['learning_store'])
+
+    search = None
+    if config.get('battle', {}).get('decision_mode', 'greedy') == 'search':
+        from src.decision.battle_search import BattleSearch
+        search = BattleSearch(db, team_mgr, config, store=shared['learning_store'], moves=move_inference)
+    strategy = BattleStrategy(db, team_mgr, search=search, moves=move_inference)
+
+    # Layout por resolução/DPI (detecta escala/viewport quando o frame muda de tamanho)
+    layout = None
+    if config.get('layout', {}).get('enabled', False):
+        from src.perception.layout import Layout
+        layout = Layout(config, shared['templates'], shared['matcher'])
+
+    # Percepção em processos separados via memória compartilhada (opcional)
+    perceiver = None
+    if config.get('perception', {}).get('processes', {}).get('enabled', False):
+        from src.perception.perception_workers import ProcessPerception
+        perceiver = ProcessPerception(config, detector)
+
+    # Watchdog de shiny com captura própria (só para captura de tela real, não replay)
+    watchdog = None
+    watchdog_cfg = config.get('watchdog', {})
+    if watchdog_cfg.get('enabled', False) and isinstance(screen, ScreenCapture):
+        from src.perception.shiny_watchdog import ShinyWatchdog
+        watchdog = ShinyWatchdog(detector, _capture_factory(config, screen), fps=watchdog_cfg.get('fps', 10))
+
+    return {
+        'screen': screen,
+        'watchdog': watchdog,
+        'layout': layout,
+        'detector': detector,
+        'perceiver': perceiver,
+        'input': input_sim,
+        'ocr': ocr,
+        'strategy': strategy,
+        'team_mgr': team_mgr,
+        'move_inference': move_inference,
+        'templates': shared['templates'],
+        'matcher': shared['matcher'],
+        'processor': shared['processor'],
+        'learning_store': shared['learning_store'],
+    }
+
+
+def _capture_factory(config, screen):
+    """Fábrica de uma captura igual à da sessão (mesma janela/região), criada na thread que a usa."""
+    monitor = screen.fallback_monitor
+    region = [monitor['left'], monitor['top'], monitor['width'], monitor['height']]
+    return lambda: ScreenCapture(config, region=region, window_title=screen.window_title)
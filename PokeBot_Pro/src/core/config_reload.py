@@ -0,0 +1,135 @@
+"""Recarga de ``settings.yaml`` com o bot rodando.
+
+``ConfigWatcher`` observa o arquivo (mtime, numa thread), carrega e valida
+a nova versão (YAML e ROIs; uma config inválida é recusada e a atual
+continua valendo) e calcula o diff contra a config em uso. O controller
+pega a mudança pendente com ``take()`` no início do tick e reconstrói só
+as partes afetadas (``affected_parts``), trocando tudo de uma vez entre
+dois ticks.
+"""
+import os
+import threading
+import yaml
+from loguru import logger
+
+from ..perception.rois import RoiSet
+
+# Prefixo de chave -> parte do pipeline reconstruída quando ele muda
+PARTS = (
+    ('rois', 'rois'),
+    ('detection', 'rois'),           # thresholds e áreas de busca
+    ('assets', 'templates'),
+    ('matching', 'matching'),
+    ('layout', 'layout'),
+    ('scheduler', 'scheduler'),
+    ('screen.fps', 'scheduler'),
+    ('ocr', 'ocr'),
+    ('perception.profiles', 'profiles'),
+    ('perception.signature_tolerance', 'controller'),
+    ('bot', 'controller'),
+    ('battle', 'controller'),        # lido a cada turno
+    ('input.mouse_move_duration', 'input'),
+    ('alerts', 'controller'),
+    ('hot_reload', 'controller'),
+    # Parte None: só vale após reiniciar (fila e armazenamento do DebugSink são criados uma vez)
+    ('debug.sink.dir', None),
+    ('debug.sink.queue_size', None),
+    ('debug', 'controller'),         # limites do DebugSink
+)
+
+
+def diff_config(old, new, prefix=''):
+    """Chaves (pontuadas, até as folhas) que mudaram entre duas configs."""
+    changed = set()
+    old = old if isinstance(old, dict) else {}
+    new = new if isinstance(new, dict) else {}
+    for key in set(old) | set(new):
+        path = f"{prefix}{key}"
+        a, b = old.get(key), new.get(key)
+        if isinstance(a, dict) and isinstance(b, dict):
+            changed |= diff_config(a, b, f"{path}.")
+        elif a != b:
+            changed.add(path)
+    return changed
+
+
+def affected_parts(changed):
+    """(partes a reconstruir, chaves que só valem após reiniciar o bot)."""
+    parts, restart = set(), []
+    for key in sorted(changed):
+        part = next((p for prefix, p in PARTS if key == prefix or key.startswith(prefix + '.')), None)
+        if part is None:
+            restart.append(key)
+        else:
+            parts.add(part)
+    return parts, restart
+
+
+def load_config(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+class ConfigWatcher:
+    def __init__(self, path, config, interval=1.0):
+        self.path = path
+        self.config = config
+        self.interval = float(interval)
+        self.reloads = 0
+        self._mtime = self._stat()
+        self._pending = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="config-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """Recarrega se o arquivo mudou; True se deixou uma mudança pendente."""
+        mtime = self._stat()
+        if mtime is None or mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        try:
+            new = load_config(self.path)
+            RoiSet(new)  # valida ROIs antes de aceitar
+        except Exception as e:
+            logger.error(f"settings.yaml alterado mas inválido; mantendo a config atual: {e}")
+            return False
+
+        # Diff sempre contra a config em uso (uma pendente ainda não aplicada é substituída)
+        changed = diff_config(self.config, new)
+        with self._lock:
+            self._pending = (new, changed) if changed else None
+        if not changed:
+            return False
+        logger.info(f"settings.yaml alterado: {len(changed)} chave(s) -> {sorted(changed)[:8]}")
+        return True
+
+    def take(self):
+        """(nova config, chaves alteradas) pendente, ou None; chamado entre ticks."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self.config = pending[0]
+            self.reloads += 1
+        return pending
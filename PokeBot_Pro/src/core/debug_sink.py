@@ -0,0 +1,222 @@
+"""Artefatos de debug (recortes, frames anotados, logs) fora do caminho do tick.
+
+Com ``bot.debug_mode`` ligado, o controller não grava nada em disco nem
+loga a cada frame: ``DebugSink.save`` só confere o limite de taxa da
+categoria, copia a imagem e enfileira; uma thread escreve os PNGs (com as
+anotações desenhadas lá) em ``debug.sink.dir/<categoria>/`` (padrão
+``debug/sink``, separado dos recortes de calibração e dos incidentes do
+gravador de voo). Cada artefato tem nome próprio (timestamp), e o diretório
+é um armazenamento rotativo: passando de ``debug.sink.max_mb``, os arquivos
+mais antigos são apagados. Só entram na conta (e na rotação) os arquivos
+com o padrão de nome do próprio sink; o resto do diretório nunca é apagado.
+
+``debug.sink.compress`` junta os artefatos em lotes ``.zip`` (até
+``batch_size`` por arquivo) em vez de um PNG por recorte.
+
+``log(chave, mensagem)`` é o logger.debug com limite de taxa por chave
+(``debug.sink.log_interval``); a mensagem pode ser uma função, formatada
+só quando o log sai.
+"""
+import queue
+import re
+import threading
+import time
+import zipfile
+from collections import deque
+from pathlib import Path
+from loguru import logger
+
+DEFAULT_RATES = {
+    'moves': 2.0,    # recortes dos golpes: no máximo um turno a cada 2 s
+    'states': 1.0,   # frame anotado na troca de estado
+}
+
+# Nomes que o próprio sink grava: <categoria>/AAAAMMDD-HHMMSS-mmm_<nome>.png e batches/AAAAMMDD-HHMMSS_<n>.zip
+_OWN_PNG = re.compile(r'^\d{8}-\d{6}-\d{3}_.+\.png$')
+_OWN_BATCH = re.compile(r'^\d{8}-\d{6}_\d+\.zip$')
+
+
+class DebugSink:
+    def __init__(self, config=None):
+        self.written = 0   # artefatos gravados
+        self.limited = 0   # recusados pelo limite de taxa
+        self.dropped = 0   # fila cheia
+        self._last = {}    # categoria/chave -> instante do último aceito
+        self._suppressed = {}
+        self._files = deque()  # (caminho, bytes), do mais antigo ao mais novo
+        self._bytes = 0
+        self._batch = []
+        sink_cfg = _sink_config(config)
+        # Só na criação: a fila e o armazenamento rotativo (_files/_bytes) dependem deles,
+        # e a recarga da config os trata como chaves que pedem reinício
+        self.root = Path(sink_cfg.get('dir', 'debug/sink'))
+        self.queue_size = max(1, int(sink_cfg.get('queue_size', 64)))
+        self.configure(config)
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._scan()
+        self._thread = threading.Thread(target=self._run, name="debug-sink", daemon=True)
+        self._thread.start()
+
+    def configure(self, config):
+        """(Re)lê os limites de ``debug.sink`` (também usado na recarga; ``dir``/``queue_size`` não mudam)."""
+        sink_cfg = _sink_config(config)
+        self.rates = {**DEFAULT_RATES, **(sink_cfg.get('rates') or {})}
+        self.default_rate = float(sink_cfg.get('default_rate', 1.0))
+        self.log_interval = float(sink_cfg.get('log_interval', 1.0))
+        self.max_bytes = int(float(sink_cfg.get('max_mb', 200)) * 1024 * 1024)
+        self.compress = bool(sink_cfg.get('compress', False))
+        self.batch_size = max(1, int(sink_cfg.get('batch_size', 50)))
+
+    # --------- Caminho do tick ---------
+    def _allow(self, key, interval):
+        now = time.monotonic()
+        last = self._last.get(key)
+        if last is not None and now - last < interval:
+            return False
+        self._last[key] = now
+        return True
+
+    def save(self, category, name, image, annotations=None):
+        return self.save_many(category, [(name, image)], annotations)
+
+    def save_many(self, category, items, annotations=None):
+        """Enfileira imagens de uma categoria (uma checagem de taxa para o grupo todo)."""
+        if not self._allow(('save', category), float(self.rates.get(category, self.default_rate))):
+            self.limited += 1
+            return False
+        # Cópia: frames da captura são buffers reutilizados
+        items = [(name, image.copy()) for name, image in items if image is not None and image.size]
+        try:
+            self._queue.put_nowait((category, items, tuple(annotations or ())))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def log(self, key, message):
+        """logger.debug limitado a um a cada ``log_interval`` s por chave."""
+        if not self._allow(('log', key), self.log_interval):
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+        text = message() if callable(message) else message
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            text = f"{text} (+{suppressed} suprimidas)"
+        logger.debug(text)
+
+    # --------- Thread de escrita ---------
+    def close(self, timeout=5.0):
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def flush(self, timeout=5.0):
+        """Espera a fila esvaziar (testes e encerramento)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                self._write_batch()  # lote parcial não fica esperando para sempre
+                continue
+            try:
+                if item is None:
+                    self._write_batch()
+                    return
+                self._write(*item)
+            except Exception as e:
+                logger.error(f"Erro ao gravar artefato de debug: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, category, items, annotations):
+        import cv2  # só na thread de escrita
+        stamp = time.strftime('%Y%m%d-%H%M%S') + f"-{int(time.time() * 1000) % 1000:03d}"
+        for name, image in items:
+            if annotations:
+                _annotate(image, annotations)
+            ok, png = cv2.imencode('.png', image)
+            if not ok:
+                continue
+            filename = f"{stamp}_{_safe(name)}.png"
+            if self.compress:
+                self._batch.append((f"{category}/{filename}", png.tobytes()))
+                if len(self._batch) >= self.batch_size:
+                    self._write_batch()
+            else:
+                path = self.root / category / filename
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(png.tobytes())
+                self._stored(path)
+
+    def _write_batch(self):
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        path = self.root / 'batches' / f"{time.strftime('%Y%m%d-%H%M%S')}_{self.written}.zip"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for arcname, data in batch:
+                zf.writestr(arcname, data)
+        self._stored(path, count=len(batch))
+
+    # --------- Armazenamento rotativo ---------
+    def _scan(self):
+        """Artefatos do sink em execuções anteriores entram na conta do limite."""
+        if not self.root.exists():
+            return
+        files = []
+        for path in self.root.rglob('*'):
+            if _is_own(self.root, path) and path.is_file():
+                stat = path.stat()
+                files.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(files, key=lambda f: f[0]):
+            self._files.append((path, size))
+            self._bytes += size
+
+    def _stored(self, path, count=1):
+        size = path.stat().st_size
+        self._files.append((path, size))
+        self._bytes += size
+        self.written += count
+        while self._bytes > self.max_bytes and len(self._files) > 1:
+            old, old_size = self._files.popleft()
+            self._bytes -= old_size
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def _is_own(root, path):
+    """Arquivo gravado pelo sink (categoria/PNG com timestamp ou lote em batches/)?"""
+    parts = path.relative_to(root).parts
+    if len(parts) != 2:
+        return False
+    if parts[0] == 'batches':
+        return bool(_OWN_BATCH.match(parts[1]))
+    return bool(_OWN_PNG.match(parts[1]))
+
+
+def _sink_config(config):
+    return (config or {}).get('debug', {}).get('sink', {}) or {}
+
+
+def _annotate(image, annotations):
+    """Desenha ROIs (com nome) sobre a cópia do frame."""
+    import cv2
+    for roi in annotations:
+        cv2.rectangle(image, (roi.x1, roi.y1), (roi.x2 - 1, roi.y2 - 1), (0, 255, 0), 1)
+        if roi.name:
+            cv2.putText(image, str(roi.name), (roi.x1, max(10, roi.y1 - 3)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.35, (0, 255, 0), 1)
+
+
+def _safe(name):
+    return "".join(c if c.isalnum() or c in '-_' else '_' for c in str(name).lower())
@@ -0,0 +1,192 @@
+"""Gravador de voo: os últimos segundos do bot em memória, gravados só em incidentes.
+
+A cada tick, ``record_frame`` reduz o frame (``flight_recorder.scale``)
+direto para um slot de um ring pré-alocado (``cv2.resize`` com ``dst``):
+uma única cópia, sem alocação. O ring guarda até ``seconds`` s a
+``fps`` quadros/s, limitado a ``max_mb`` MB. Percepção, ações de input e
+decisões vão para um deque de eventos com tamanho fixo.
+
+``dump(motivo)`` copia o ring e os eventos e entrega a uma thread que
+grava ``dir/<timestamp>_<motivo>/`` (PNGs numerados + ``events.jsonl``).
+Gatilhos: shiny, exceção no tick, bot parado (mesmo estado e tela sem
+mudar por ``stuck_seconds``) e a tecla ``hotkey`` (via pynput, se
+instalado). Um mesmo motivo não gera outro dump antes de
+``min_dump_interval`` s.
+"""
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+import numpy as np
+from loguru import logger
+
+# Métodos de input registrados como ações
+INPUT_ACTIONS = ('click', 'press', 'press_keys', 'click_in_slot', 'click_fight_button',
+                 'click_pokemon_button', 'click_run_button')
+
+
+class FlightRecorder:
+    def __init__(self, config=None):
+        cfg = (config or {}).get('flight_recorder', {}) or {}
+        self.seconds = float(cfg.get('seconds', 30))
+        self.fps = max(0.1, float(cfg.get('fps', 5)))
+        self.scale = float(cfg.get('scale', 0.25))
+        self.max_bytes = int(float(cfg.get('max_mb', 64)) * 1024 * 1024)
+        self.root = Path(cfg.get('dir', 'debug/incidents'))
+        self.stuck_seconds = float(cfg.get('stuck_seconds', 60))
+        self.stuck_activity = float(cfg.get('stuck_activity', 1.0))
+        self.min_dump_interval = float(cfg.get('min_dump_interval', 30))
+        self.hotkey = cfg.get('hotkey', 'f9') or None
+
+        self.events = deque(maxlen=int(cfg.get('max_events', 2000)))
+        self._frames = None      # ring (N, h, w[, c]) alocado no primeiro frame
+        self._stamps = None      # (instante, frame_id) de cada slot
+        self._next = 0
+        self._count = 0
+        self._last_frame = 0.0
+        self._lock = threading.Lock()
+        self._last_dump = {}
+        self._stuck_state = None
+        self._stuck_since = None
+        self._stuck_fired = False
+        self._listener = None
+        self._writers = []
+        self.dumps = 0
+
+    # --------- Caminho do tick ---------
+    def _allocate(self, shape, dtype):
+        h, w = max(1, int(shape[0] * self.scale)), max(1, int(shape[1] * self.scale))
+        slot_shape = (h, w) + tuple(shape[2:])
+        slot_bytes = int(np.prod(slot_shape)) * np.dtype(dtype).itemsize
+        slots = max(1, min(int(self.seconds * self.fps), self.max_bytes // max(1, slot_bytes)))
+        self._frames = np.empty((slots,) + slot_shape, dtype=dtype)
+        self._stamps = [(0.0, None)] * slots
+        self._next = 0
+        self._count = 0
+        self._source_shape = tuple(shape)
+
+    def record_frame(self, frame, frame_id=None):
+        """Copia o frame reduzido para o ring (no máximo ``fps`` vezes por segundo)."""
+        now = time.monotonic()
+        if now - self._last_frame < 1.0 / self.fps:
+            return False
+        self._last_frame = now
+        import cv2
+        with self._lock:
+            if self._frames is None or self._source_shape != tuple(frame.shape) or self._frames.dtype != frame.dtype:
+                self._allocate(frame.shape, frame.dtype)
+            slot = self._frames[self._next]
+            cv2.resize(frame, (slot.shape[1], slot.shape[0]), dst=slot, interpolation=cv2.INTER_AREA)
+            self._stamps[self._next] = (time.time(), frame_id)
+            self._next = (self._next + 1) % len(self._frames)
+            self._count = min(self._count + 1, len(self._frames))
+        return True
+
+    def note(self, kind, frame_id=None, **data):
+        """Evento (percepção, ação, decisão) no ring de eventos."""
+        self.events.append((time.time(), frame_id, kind, data))
+
+    def note_perception(self, snapshot):
+        self.note('perception', snapshot.frame_id, state=snapshot.state.name,
+                  scene=snapshot.scene.name if snapshot.scene else None, shiny=snapshot.shiny,
+                  in_battle=snapshot.in_battle, battle_scores=snapshot.battle_scores,
+                  talk=snapshot.talk[0] if snapshot.talk else None,
+                  goto=snapshot.goto[0] if snapshot.goto else None)
+
+    def observe(self, state, activity):
+        """Detector de bot parado: mesmo estado e tela sem mudar por ``stuck_seconds``."""
+        now = time.monotonic()
+        if state != self._stuck_state or activity >= self.stuck_activity:
+            self._stuck_state = state
+            self._stuck_since = now
+            self._stuck_fired = False
+            return False
+        if not self._stuck_fired and now - self._stuck_since >= self.stuck_seconds:
+            self._stuck_fired = True
+            logger.warning(f"Bot parado em {getattr(state, 'name', state)} há {now - self._stuck_since:.0f}s")
+            self.dump('stuck')
+            return True
+        return False
+
+    def watch_input(self, input_sim):
+        """Input que registra cada ação antes de repassá-la."""
+        return _RecordedInput(input_sim, self)
+
+    # --------- Gravação ---------
+    def dump(self, reason):
+        """Copia o ring e grava numa thread (devolvida); None se o mesmo motivo gravou há pouco."""
+        now = time.monotonic()
+        last = self._last_dump.get(reason)
+        if last is not None and now - last < self.min_dump_interval:
+            return None
+        self._last_dump[reason] = now
+        with self._lock:
+            if self._frames is None or not self._count:
+                frames, stamps = None, []
+            else:
+                order = [(self._next - self._count + i) % len(self._frames) for i in range(self._count)]
+                frames = self._frames[order]  # indexação avançada: cópia
+                stamps = [self._stamps[i] for i in order]
+        events = list(self.events)
+        self.dumps += 1
+        writer = threading.Thread(target=self._write, args=(reason, frames, stamps, events),
+                                  name="flight-dump", daemon=True)
+        writer.start()
+        self._writers = [w for w in self._writers if w.is_alive()] + [writer]
+        return writer
+
+    def _write(self, reason, frames, stamps, events):
+        try:
+            import cv2
+            folder = self.root / f"{time.strftime('%Y%m%d-%H%M%S')}_{reason}"
+            folder.mkdir(parents=True, exist_ok=True)
+            if frames is not None:
+                for i, (frame, (stamp, frame_id)) in enumerate(zip(frames, stamps)):
+                    cv2.imwrite(str(folder / f"{i:04d}_f{frame_id}.png"), frame)
+            with open(folder / "events.jsonl", "w", encoding="utf-8") as f:
+                for stamp, frame_id, kind, data in events:
+                    f.write(json.dumps({'t': stamp, 'frame': frame_id, 'kind': kind, **data},
+                                       ensure_ascii=False, default=str) + "\n")
+            logger.info(f"Gravador de voo: {len(stamps)} frames e {len(events)} eventos em {folder}")
+        except Exception as e:
+            logger.error(f"Erro ao gravar o gravador de voo ({reason}): {e}")
+
+    # --------- Tecla de atalho ---------
+    def start(self):
+        if self.hotkey is None or self._listener is not None:
+            return
+        try:
+            from pynput import keyboard
+            combo = self.hotkey if self.hotkey.startswith('<') or len(self.hotkey) == 1 else f"<{self.hotkey}>"
+            self._listener = keyboard.GlobalHotKeys({combo: lambda: self.dump('hotkey')})
+            self._listener.daemon = True
+            self._listener.start()
+            logger.info(f"Gravador de voo: pressione {self.hotkey} para gravar os últimos {self.seconds:.0f}s")
+        except Exception as e:
+            logger.warning(f"Tecla do gravador de voo indisponível ({e}); gatilhos automáticos continuam")
+
+    def stop(self, timeout=10.0):
+        """Para a tecla de atalho e espera as gravações em andamento."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        for writer in self._writers:
+            writer.join(timeout)
+        self._writers = []
+
+
+class _RecordedInput:
+    def __init__(self, input_sim, recorder):
+        self._input = input_sim
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        attr = getattr(self._input, name)
+        if name not in INPUT_ACTIONS:
+            return attr
+
+        def recorded(*args, **kwargs):
+            self._recorder.note('action', action=name, args=list(args))
+            return attr(*args, **kwargs)
+        return recorded
@@ -5,46 +5,60 @@ import os
 # Add the project root to the python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
-from src.perception.screen_capture import ScreenCapture
-from src.perception.ocr_engine import OCREngine
-from src.perception.game_state_detector import GameStateDetector
-from src.perception.image_processing import ImageProcessor
-from src.action.input_simulator import InputSimulator
-from src.knowledge.pokemon_database import PokemonDatabase
-from src.knowledge.team_manager import TeamManager
-from src.decision.battle_strategy import BattleStrategy
-from src.core.bot_controller import BotController
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../../config/settings.yaml')
 
 def load_config():
-    config_path = os.path.join(os.path.dirname(__file__), '../../config/settings.yaml')
-    with open(config_path, "r", encoding="utf-8") as f:
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
 def main():
+    # Perfil de inicialização: imports (estilo -X importtime) e fases até o primeiro tick.
+    # Os módulos do bot são importados só depois, para entrarem na medição.
+    from src.core.startup import StartupProfile
+    startup = StartupProfile().start()
     config = load_config()
-    
-    # Initialize components
-    screen = ScreenCapture()
-    ocr = OCREngine(config['ocr']['tesseract_path'])
-    detector = GameStateDetector(screen, ocr, config)
-    processor = ImageProcessor()
-    input_sim = InputSimulator(config)
-    db = PokemonDatabase()
-    team_mgr = TeamManager()
-    strategy = BattleStrategy(db, team_mgr)
-    
-    components = {
-        'screen': screen,
-        'detector': detector,
-        'input': input_sim,
-        'ocr': ocr,
-        'strategy': strategy,
-        'team_mgr': team_mgr,
-        'processor': processor
-    }
-    
-    bot = BotController(config, components)
-    bot.run()
+    startup.configure(config)
+    startup.mark('config')
+
+    from src.core.components import build_shared, build_components
+    startup.mark('imports')
+
+    # Initialize components (base de conhecimento, templates e OCR carregados uma vez)
+    shared = build_shared(config)
+    startup.mark('shared')
+
+    # Modo supervisor: várias sessões (clientes do jogo) num único processo
+    if config.get('supervisor', {}).get('enabled', False):
+        from src.core.supervisor import Supervisor
+        startup.stop_imports()
+        Supervisor(config, shared).run()
+        return
+
+    components = build_components(config, shared)
+    components['startup'] = startup
+    startup.mark('components')
+
+    # Recarga de settings.yaml com o bot rodando (calibração sem reiniciar)
+    reload_cfg = config.get('hot_reload', {})
+    if reload_cfg.get('enabled', False):
+        from src.core.config_reload import ConfigWatcher
+        components['config_watcher'] = ConfigWatcher(CONFIG_PATH, config, reload_cfg.get('interval', 1.0))
+
+    # Núcleo assíncrono opcional; run() continua síncrono nos dois casos
+    if config.get('async_core', {}).get('enabled', False):
+        from src.core.async_controller import AsyncBotController
+        bot = AsyncBotController(config, components)
+    else:
+        from src.core.bot_controller import BotController
+        bot = BotController(config, components)
+    startup.mark('controller')
+    try:
+        bot.run()
+    finally:
+        if shared['sprites'] is not None:
+            shared['sprites'].save()
+        if shared['learning_store'] is not None:
+            shared['learning_store'].close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
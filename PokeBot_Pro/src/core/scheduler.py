@@ -0,0 +1,126 @@
+import time
+from collections import deque
+import numpy as np
+from loguru import logger
+
+
+class AdaptiveScheduler:
+    """Define o ritmo do loop principal conforme o estado e a atividade da tela.
+
+    - Taxa máxima (``screen.fps``) em batalha, logo após ações de batalha
+      (os botões estão para reaparecer) e quando a tela está mudando.
+    - Sem mudanças, o intervalo cresce por ``backoff`` até ``idle_interval``
+      e o controller roda só checagens baratas (diferença de frame e os
+      botões de batalha nos próprios ROIs), com percepção completa ao menos a cada
+      ``full_check_interval`` segundos.
+    - ``hold(segundos)``: espera "ativa" barata, ex.: caminhada após Goto.
+    """
+
+    def __init__(self, config=None, sleep=None):
+        config = config or {}
+        self._sleep = sleep or time.sleep
+        sched_cfg = config.get('scheduler', {})
+        fps = float(config.get('screen', {}).get('fps', 10) or 10)
+
+        self.min_interval = 1.0 / max(fps, 0.1)
+        self.idle_interval = max(self.min_interval, float(sched_cfg.get('idle_interval', 1.0)))
+        self.backoff = max(1.0, float(sched_cfg.get('backoff', 1.5)))
+        self.activity_threshold = float(sched_cfg.get('activity_threshold', 2.0))
+        self.burst_window = float(sched_cfg.get('burst_window', 1.5))
+        self.full_check_interval = float(sched_cfg.get('full_check_interval', 2.0))
+        self.report_every = float(sched_cfg.get('report_every', 30.0))
+
+        self.interval = self.min_interval
+        self.activity = 0.0
+        self._prev_small = None
+        self._burst_until = 0.0
+        self._hold_until = 0.0
+        self._last_full = 0.0
+        self._ticks = deque(maxlen=64)
+        self._last_report = time.monotonic()
+
+    # --------- Sinais vindos do controller ---------
+    def observe(self, frame):
+        """Diferença média entre o frame atual e o anterior (amostra 1/8, cinza).
+
+        Custa microssegundos: só fatia o array (view) e faz uma média.
+        """
+        small = frame[::8, ::8].mean(axis=2, dtype=np.float32) if frame.ndim == 3 else \
+            frame[::8, ::8].astype(np.float32)
+        if self._prev_small is None or self._prev_small.shape != small.shape:
+            self.activity = 255.0
+        else:
+            self.activity = float(np.abs(small - self._prev_small).mean())
+        self._prev_small = small
+        return self.activity
+
+    def expect_change(self, seconds=None):
+        """Próximos segundos em taxa máxima (ex.: botões de batalha vão reaparecer)."""
+        self._burst_until = time.monotonic() + (self.burst_window if seconds is None else seconds)
+
+    def hold(self, seconds):
+        """Durante ``seconds`` só checagens baratas, em taxa baixa."""
+        self._hold_until = time.monotonic() + seconds
+
+    def mark_full_perception(self):
+        self._last_full = time.monotonic()
+
+    # --------- Decisões ---------
+    @property
+    def holding(self):
+        return time.monotonic() < self._hold_until
+
+    @property
+    def active(self):
+        return self.activity >= self.activity_threshold or time.monotonic() < self._burst_until
+
+    def needs_full_perception(self, stable_state):
+        """False quando basta a checagem barata neste tick.
+
+        ``stable_state``: o estado atual tolera percepção reduzida (exploração).
+        """
+        if not stable_state:
+            return True
+        if self.holding:
+            return False
+        if self.active:
+            return True
+        return time.monotonic() - self._last_full >= self.full_check_interval
+
+    def next_interval(self, urgent):
+        """Calcula o próximo intervalo; ``urgent`` força a taxa máxima (batalha)."""
+        if urgent or (self.active and not self.holding):
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.idle_interval, self.interval * self.backoff)
+        return self.interval
+
+    def sleep(self, tick_started, urgent=False):
+        """Dorme o restante do intervalo, descontando o tempo gasto no tick."""
+        # Sempre passa pelo sleep (mesmo com 0) para ceder a vez no modo supervisor
+        self._sleep(self.remaining(tick_started, urgent))
+
+    def remaining(self, tick_started, urgent=False):
+        """Registra o fim do tick e retorna quanto falta dormir (para ``await asyncio.sleep``)."""
+        now = time.monotonic()
+        self._ticks.append(now)
+        interval = self.next_interval(urgent)
+        self._maybe_report()
+        return max(0.0, interval - (now - tick_started))
+
+    @property
+    def effective_hz(self):
+        """Taxa real de ticks na janela recente."""
+        if len(self._ticks) < 2:
+            return 0.0
+        span = self._ticks[-1] - self._ticks[0]
+        return (len(self._ticks) - 1) / span if span > 0 else 0.0
+
+    def _maybe_report(self):
+        now = time.monotonic()
+        if self.report_every and now - self._last_report >= self.report_every:
+            self._last_report = now
+            logger.info(
+                f"Taxa efetiva do loop: {self.effective_hz:.1f} Hz "
+                f"(intervalo atual={self.interval:.2f}s, atividade={self.activity:.1f})"
+            )
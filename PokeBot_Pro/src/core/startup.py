@@ -0,0 +1,143 @@
+"""Perfil de inicialização: tempo de import por módulo e tempo até o primeiro tick.
+
+``StartupProfile.start()`` instala um finder em ``sys.meta_path`` que
+cronometra a execução de cada módulo importado daí em diante (tempo
+próprio e acumulado, como ``python -X importtime``), e ``mark(fase)``
+registra o fim de cada etapa (config, componentes, controller...). No
+primeiro tick, ``first_tick()`` grava o relatório em
+``startup.profile_path`` e avisa se o tempo passou de
+``startup.target_first_tick_ms``.
+"""
+import importlib.abc
+import sys
+import time
+from pathlib import Path
+# loguru é importado só ao gravar o relatório, para entrar na medição dos imports
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, profile):
+        self.loader = loader
+        self.profile = profile
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.profile._enter(module.__name__)
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.profile._exit(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profile):
+        self.profile = profile
+        self._busy = set()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in self._busy:
+            return None
+        self._busy.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, self.profile)
+                    return spec
+            return None
+        finally:
+            self._busy.discard(fullname)
+
+
+class StartupProfile:
+    def __init__(self, config=None):
+        cfg = (config or {}).get('startup', {}) or {}
+        self.target_ms = float(cfg.get('target_first_tick_ms', 1500))
+        self.profile_path = cfg.get('profile_path', 'debug/startup_profile.txt')
+        self.started = time.perf_counter()
+        self.phases = []    # (fase, segundos desde o início)
+        self.imports = {}   # módulo -> [próprio, acumulado] em segundos
+        self.first_tick_ms = None
+        self._stack = []
+        self._finder = None
+
+    # --------- Imports ---------
+    def start(self):
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+        return self
+
+    def stop_imports(self):
+        if self._finder is not None:
+            try:
+                sys.meta_path.remove(self._finder)
+            except ValueError:
+                pass
+            self._finder = None
+
+    def _enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name):
+        _, begun, children = self._stack.pop()
+        total = time.perf_counter() - begun
+        self.imports[name] = [total - children, total]
+        if self._stack:
+            self._stack[-1][2] += total
+
+    # --------- Fases ---------
+    def configure(self, config):
+        """Aplica ``startup.*`` da config (lida depois que o perfil já começou)."""
+        cfg = (config or {}).get('startup', {}) or {}
+        self.target_ms = float(cfg.get('target_first_tick_ms', self.target_ms))
+        self.profile_path = cfg.get('profile_path', self.profile_path)
+
+    def mark(self, phase):
+        self.phases.append((phase, time.perf_counter() - self.started))
+
+    def first_tick(self):
+        """Fecha o perfil no primeiro tick: grava o relatório e confere a meta."""
+        self.mark('first_tick')
+        self.stop_imports()
+        self.first_tick_ms = self.phases[-1][1] * 1000.0
+        self.write()
+        from loguru import logger
+        if self.first_tick_ms > self.target_ms:
+            logger.warning(f"Primeiro tick em {self.first_tick_ms:.0f} ms (meta {self.target_ms:.0f} ms); "
+                           f"veja {self.profile_path}")
+        else:
+            logger.info(f"Primeiro tick em {self.first_tick_ms:.0f} ms (meta {self.target_ms:.0f} ms)")
+        return self.first_tick_ms
+
+    def report(self, top=40):
+        lines = ["# Fases (ms desde o início)"]
+        previous = 0.0
+        for phase, at in self.phases:
+            lines.append(f"{at * 1000:10.1f}  (+{(at - previous) * 1000:8.1f})  {phase}")
+            previous = at
+        lines.append("")
+        lines.append("# Imports (us): próprio | acumulado | módulo")
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (own, total) in ranked[:top]:
+            lines.append(f"{own * 1e6:10.0f} | {total * 1e6:10.0f} | {name}")
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        if not self.profile_path:
+            return
+        try:
+            path = Path(self.profile_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(self.report(), encoding="utf-8")
+        except Exception as e:
+            from loguru import logger
+            logger.error(f"Erro ao gravar perfil de inicialização: {e}")
@@ -1,3 +1,118 @@
+from loguru import logger
+
+# Origem curinga: a transição vale a partir de qualquer estado
+ANY = '*'
+
+
+class State:
+    """Estado da máquina: ações de entrada/saída/tick e perfil de percepção.
+
+    ``profile`` lista os detectores que precisam rodar enquanto o bot está
+    neste estado (ex.: sem goto em batalha).
+    """
+
+    def __init__(self, name, on_enter=None, on_exit=None, on_tick=None, profile=()):
+        self.name = name
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+        self.on_tick = on_tick
+        self.profile = tuple(profile)
+
+
+class Transition:
+    """Transição ``source -> target`` habilitada quando ``guard(snapshot)`` é verdadeira."""
+
+    def __init__(self, source, target, guard):
+        self.source = source
+        self.target = target
+        self.guard = guard
+
+
 class StateMachine:
-    def __init__(self):
-        pass
\ No newline at end of file
+    """Máquina de estados guiada por tabela.
+
+    A cada tick recebe o snapshot de percepção do frame (calculado uma
+    vez), avalia as transições do estado atual na ordem em que foram
+    registradas (as de origem ``ANY`` primeiro) e executa a primeira cuja
+    guarda passar: ``on_exit`` do estado antigo, ``on_enter`` do novo. Em
+    seguida roda o ``on_tick`` do estado resultante.
+    """
+
+    def __init__(self, initial):
+        self.states = {}
+        self.transitions = []
+        self.initial = initial
+        self.current = None
+
+    def add_state(self, name, on_enter=None, on_exit=None, on_tick=None, profile=()):
+        self.states[name] = State(name, on_enter, on_exit, on_tick, profile)
+        return self.states[name]
+
+    def add_transition(self, source, target, guard):
+        if target not in self.states:
+            raise ValueError(f"Estado de destino não registrado: {target}")
+        if source != ANY and source not in self.states:
+            raise ValueError(f"Estado de origem não registrado: {source}")
+        self.transitions.append(Transition(source, target, guard))
+
+    @property
+    def state(self):
+        return self.states[self.current if self.current is not None else self.initial]
+
+    @property
+    def profile(self):
+        """Detectores exigidos pelo estado atual."""
+        return self.state.profile
+
+    def step(self, snapshot, refine=None):
+        """Aplica no máximo uma transição e roda o tick do estado resultante.
+
+        ``refine(snapshot, profile)`` é chamado após uma transição para
+        completar o snapshot com os detectores do novo estado.
+        """
+        self.advance(snapshot, refine)
+        state = self.state
+        if state.on_tick is not None:
+            state.on_tick(snapshot)
+        return self.current
+
+    def advance(self, snapshot, refine=None):
+        """Só a parte de transição do ``step`` (sem ``on_tick``).
+
+        Usado por quem executa o tick por conta própria (ex.: handlers
+        assíncronos do AsyncBotController).
+        """
+        if self.current is None:
+            self._enter(self.initial, snapshot)
+
+        for transition in self._candidates():
+            if transition.target == self.current:
+                continue
+            if transition.guard(snapshot):
+                self._switch(transition.target, snapshot)
+                if refine is not None:
+                    refine(snapshot, self.profile)
+                break
+        return self.current
+
+    def _candidates(self):
+        wildcard = [t for t in self.transitions if t.source == ANY]
+        specific = [t for t in self.transitions if t.source == self.current]
+        return wildcard + specific
+
+    def _switch(self, target, snapshot):
+        logger.debug(f"Transição de estado: {self._label(self.current)} -> {self._label(target)}")
+        old = self.states[self.current]
+        if old.on_exit is not None:
+            old.on_exit(snapshot)
+        self._enter(target, snapshot)
+
+    def _enter(self, name, snapshot):
+        self.current = name
+        state = self.states[name]
+        if state.on_enter is not None:
+            state.on_enter(snapshot)
+
+    @staticmethod
+    def _label(name):
+        return getattr(name, 'name', name)
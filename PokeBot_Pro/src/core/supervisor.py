@@ -0,0 +1,191 @@
+import copy
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from loguru import logger
+
+from src.perception.screen_capture import ScreenCapture, ReplayCapture
+from src.perception.ocr_pool import OCRPool
+from src.perception.layout import map_boxes
+from src.perception.rois import parse_box
+from src.action.recording_input import RecordingInput
+from src.core.components import build_shared, build_components
+from src.core.bot_controller import BotController
+
+
+class CooperativeScheduler:
+    """Revezamento justo (FIFO) entre sessões de um mesmo processo.
+
+    Só a sessão com a vez captura, percebe e age (mouse/teclado são
+    compartilhados). A vez é liberada em toda espera (animações, cooldowns,
+    resultado de OCR), então a latência de cada sessão fica limitada ao
+    trabalho de um passo das outras.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._owner = None
+        self.max_wait = {}  # sessão (thread) -> maior espera pela vez, em segundos
+
+    def acquire(self):
+        me = threading.get_ident()
+        started = time.monotonic()
+        with self._cond:
+            self._queue.append(me)
+            while self._owner is not None or self._queue[0] != me:
+                self._cond.wait()
+            self._queue.popleft()
+            self._owner = me
+        waited = time.monotonic() - started
+        if waited > self.max_wait.get(me, 0.0):
+            self.max_wait[me] = waited
+
+    def release(self):
+        with self._cond:
+            if self._owner == threading.get_ident():
+                self._owner = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def released(self):
+        """Libera a vez durante o bloco (espera) e a retoma no fim.
+
+        Threads auxiliares (ex.: OCR especulativo) não têm a vez: o bloco
+        roda direto, sem entrar na fila.
+        """
+        with self._cond:
+            owner = self._owner == threading.get_ident()
+        if not owner:
+            yield
+            return
+        self.release()
+        try:
+            yield
+        finally:
+            self.acquire()
+
+    def sleep(self, seconds):
+        with self.released():
+            time.sleep(seconds)
+
+
+class BotSession:
+    """Uma sessão (cliente do jogo) rodando numa thread própria."""
+
+    def __init__(self, name, controller, scheduler):
+        self.name = name
+        self.controller = controller
+        self.scheduler = scheduler
+        self.thread = threading.Thread(target=self._run, name=f"session-{name}", daemon=True)
+        self.error = None
+
+    def _run(self):
+        self.scheduler.acquire()
+        try:
+            self.controller.run()
+        except Exception as e:
+            self.error = e
+            logger.exception(f"[{self.name}] Sessão encerrada por erro: {e}")
+        finally:
+            self.scheduler.release()
+
+
+def offset_box(box, dx, dy):
+    """Desloca um box (formatos de rois.parse_box), mantendo [x,y,w,h] quando for o caso."""
+    x1, y1, x2, y2 = parse_box(box)
+    if isinstance(box, (list, tuple)) and (box[2], box[3]) != (x2, y2):
+        return [x1 + dx, y1 + dy, box[2], box[3]]
+    return [x1 + dx, y1 + dy, x2 + dx, y2 + dy]
+
+
+def offset_config(config, dx, dy):
+    """Cópia da config com todos os ROIs/áreas deslocados por (dx, dy)."""
+    if not dx and not dy:
+        return copy.deepcopy(config)
+    return map_boxes(config, lambda box: offset_box(box, dx, dy))
+
+
+class Supervisor:
+    """Roda N sessões do bot num único processo.
+
+    Compartilhado: base de conhecimento, registro de templates, banco SQLite
+    e um pool de workers de OCR. Por sessão: região de captura (janela do
+    cliente), deslocamento extra dos ROIs, input, equipe e estratégia.
+
+    Cada sessão mantém seus golpes conhecidos em JSON próprio
+    (``data/known_moves_<nome>.json``), já que a tabela de equipe do banco
+    é única por processo.
+
+    Sessão de replay (``replay_dir``) usa frames gravados e um input que só
+    registra ações, permitindo rodar tudo sem jogo aberto.
+    """
+
+    def __init__(self, config, shared=None):
+        self.cfg = config
+        sup_cfg = config.get('supervisor', {})
+        self.shared = shared or build_shared(config)
+        self.ocr_pool = OCRPool(self.shared['ocr'], workers=sup_cfg.get('ocr_workers', 2))
+        self.scheduler = CooperativeScheduler()
+        self.sessions = [
+            self._build_session(idx, session_cfg)
+            for idx, session_cfg in enumerate(sup_cfg.get('sessions', []) or [])
+        ]
+
+    def _build_session(self, idx, session_cfg):
+        name = session_cfg.get('name') or f"sessao{idx + 1}"
+        dx, dy = session_cfg.get('roi_offset', [0, 0])
+        cfg = offset_config(self.cfg, dx, dy)
+        cfg.setdefault('persistence', {})['backend'] = 'json'
+        if session_cfg.get('location'):
+            cfg.setdefault('bot', {})['location'] = session_cfg['location']
+
+        input_sim = None
+        if session_cfg.get('replay_dir'):
+            screen = ReplayCapture(session_cfg['replay_dir'], loop=session_cfg.get('loop', False))
+            input_sim = RecordingInput(cfg)
+        else:
+            screen = ScreenCapture(cfg, region=session_cfg.get('region'), window_title=session_cfg.get('window_title'))
+
+        components = build_components(
+            cfg,
+            self.shared,
+            screen=screen,
+            input_sim=input_sim,
+            ocr=self.ocr_pool.client(released=self.scheduler.released),
+            moves_db_path=session_cfg.get('moves_db_path', f"data/known_moves_{name}.json"),
+        )
+        components['sleep'] = self.scheduler.sleep
+        controller = BotController(cfg, components)
+        logger.info(f"Sessão '{name}' pronta (região={session_cfg.get('region')}, offset ROIs=({dx}, {dy}))")
+        return BotSession(name, controller, self.scheduler)
+
+    def run(self, duration=None):
+        """Inicia todas as sessões e espera (até ``duration`` segundos, se dado)."""
+        if not self.sessions:
+            logger.warning("Supervisor sem sessões configuradas (supervisor.sessions).")
+            return
+        for session in self.sessions:
+            session.thread.start()
+        deadline = time.monotonic() + duration if duration else None
+        try:
+            while any(s.thread.is_alive() for s in self.sessions):
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                time.sleep(0.2)
+        except KeyboardInterrupt:
+            logger.info("Encerrando sessões...")
+        finally:
+            self.stop()
+
+    def stop(self):
+        for session in self.sessions:
+            session.controller.stop()
+        for session in self.sessions:
+            session.thread.join(timeout=10)
+        self.ocr_pool.shutdown()
+        if self.shared.get('sprites') is not None:
+            self.shared['sprites'].save()
+        if self.shared.get('learning_store') is not None:
+            self.shared['learning_store'].close()
@@ -0,0 +1,268 @@
+import time
+from loguru import logger
+
+
+class _SearchTimeout(Exception):
+    """Sinaliza que o orçamento de tempo do turno acabou no meio da busca."""
+
+
+class BattleSearch:
+    """Busca expectiminimax com aprofundamento iterativo e orçamento de tempo.
+
+    Modelo simplificado de batalha 1x1:
+    - Estado = (HP meu, HP inimigo), em frações do HP máximo, quantizadas.
+    - Nó MAX: escolhemos um dos nossos golpes conhecidos (TeamManager).
+    - Nó de chance: o inimigo usa um dos golpes prováveis com probabilidade
+      uniforme (learnset do `dex.json` até o nível observado).
+    - Nós agimos primeiro; se o inimigo desmaiar, ele não revida.
+
+    A tabela de transposição é mantida entre os turnos da mesma batalha e
+    descartada quando a batalha (nomes, nível ou golpes) muda.
+
+    Com ``store`` (LearningStore), o nível típico da espécie no histórico de
+    encontros substitui o nível quando a HUD não o leu. Com ``moves``
+    (MoveInference), essa mesma consulta vem do índice de learnsets.
+    """
+
+    # Fração do HP máximo tirada por um golpe de poder 100 sem multiplicadores
+    DAMAGE_PER_100_POWER = 0.35
+    # Golpe genérico assumido quando não sabemos nada do inimigo
+    DEFAULT_ENEMY_POWER = 40
+
+    def __init__(self, db, team_manager, config=None, store=None, moves=None):
+        self.db = db
+        self.tm = team_manager
+        self.store = store
+        self.moves = moves
+
+        battle_cfg = (config or {}).get('battle', {})
+        self.time_budget = float(battle_cfg.get('search_time_budget_ms', 40)) / 1000.0
+        self.max_depth = int(battle_cfg.get('search_max_depth', 6))
+        self.hp_steps = int(battle_cfg.get('search_hp_steps', 20))
+        self.switch_margin = float(battle_cfg.get('search_switch_margin', 0.25))
+
+        self._battle_key = None
+        self._tt = {}
+        self._belief = None  # (hp_meu, hp_inimigo) quantizados esperados no próximo turno
+        self._deadline = 0.0
+        self.last_depth = 0
+        self.nodes = 0
+
+    # ---------------------------------------------------------
+    # API usada pela BattleStrategy
+    # ---------------------------------------------------------
+    def choose_move(self, my_pokemon_name, enemy_name, enemy_level=None, my_hp=None, enemy_hp=None):
+        """Retorna o slot (0-3) escolhido pela busca ou None se não há dados."""
+        my_moves = self.tm.get_moves(my_pokemon_name)
+        if not my_moves or not enemy_name:
+            return None
+
+        ours = self._our_damage_table(my_pokemon_name, my_moves, enemy_name)
+        if not any(dmg > 0 for _, dmg in ours):
+            return None
+        theirs = self._enemy_damage_table(enemy_name, enemy_level, my_pokemon_name)
+
+        key = (my_pokemon_name.strip().lower(), enemy_name.strip().lower(), enemy_level,
+               tuple(m.strip().lower() for m in my_moves))
+        self._start_battle(key)
+
+        root = self._root_state(my_hp, enemy_hp)
+        self._deadline = time.perf_counter() + self.time_budget
+        value, slot = self._iterative_deepening(root, ours, theirs)
+
+        # Crença para o próximo turno: dano esperado do golpe escolhido
+        dmg_out = dict(ours).get(slot, 0)
+        dmg_in = sum(theirs) / len(theirs)
+        self._belief = (max(1, root[0] - round(dmg_in)), max(1, root[1] - dmg_out))
+
+        logger.debug(
+            f"Busca: slot={slot} valor={value:.3f} profundidade={self.last_depth} "
+            f"nós={self.nodes} tt={len(self._tt)}"
+        )
+        return slot
+
+    def choose_switch(self, team, my_pokemon_name, enemy_name, enemy_level=None):
+        """Compara o confronto atual com cada membro da equipe.
+
+        Retorna o índice em ``team`` cujo valor de busca supera o do Pokémon
+        atual por pelo menos ``switch_margin``; caso contrário, None.
+        """
+        if not team or not enemy_name:
+            return None
+
+        current = (my_pokemon_name or "").strip().lower()
+        candidates = [(idx, name) for idx, name in enumerate(team) if name and name != current]
+        if not candidates:
+            return None
+
+        # Divide o orçamento do turno entre o atual e os candidatos
+        budget = self.time_budget / (len(candidates) + 1)
+        base_value = self._matchup_value(current, enemy_name, enemy_level, budget) if current else None
+        if base_value is None:
+            base_value = -1.0
+
+        best_idx, best_value = None, base_value + self.switch_margin
+        for idx, name in candidates:
+            value = self._matchup_value(name, enemy_name, enemy_level, budget)
+            if value is not None and value > best_value:
+                best_idx, best_value = idx, value
+
+        if best_idx is not None:
+            logger.info(
+                f"Busca sugere troca para {team[best_idx]} (slot {best_idx}) contra {enemy_name}: "
+                f"valor={best_value:.3f} vs atual={base_value:.3f}"
+            )
+        return best_idx
+
+    def reset(self):
+        """Descarta cache e crença (nova batalha)."""
+        self._battle_key = None
+        self._tt = {}
+        self._belief = None
+
+    # ---------------------------------------------------------
+    # Núcleo da busca
+    # ---------------------------------------------------------
+    def _iterative_deepening(self, root, ours, theirs):
+        best_value, best_slot = 0.0, ours[0][0]
+        order = [slot for slot, _ in ours]
+        self.last_depth = 0
+        self.nodes = 0
+
+        for depth in range(1, self.max_depth + 1):
+            try:
+                value, slot = self._search_root(root, depth, ours, theirs, order)
+            except _SearchTimeout:
+                break
+            best_value, best_slot = value, slot
+            self.last_depth = depth
+            # Ordenação: melhor golpe da iteração anterior primeiro
+            order.remove(slot)
+            order.insert(0, slot)
+            if time.perf_counter() >= self._deadline:
+                break
+
+        return best_value, best_slot
+
+    def _search_root(self, root, depth, ours, theirs, order):
+        damage = dict(ours)
+        best_value, best_slot = float("-inf"), order[0]
+        for slot in order:
+            value = self._after_our_move(root[0], root[1], damage[slot], depth, ours, theirs)
+            if value > best_value:
+                best_value, best_slot = value, slot
+        return best_value, best_slot
+
+    def _max_node(self, my_hp, enemy_hp, depth, ours, theirs):
+        if enemy_hp <= 0:
+            return 1.0 + 0.01 * depth  # vitórias mais rápidas valem mais
+        if my_hp <= 0:
+            return -1.0 - 0.01 * depth
+        if depth == 0:
+            return (my_hp - enemy_hp) / self.hp_steps
+
+        key = (my_hp, enemy_hp, depth)
+        cached = self._tt.get(key)
+        if cached is not None:
+            return cached
+
+        self.nodes += 1
+        if (self.nodes & 63) == 0 and time.perf_counter() >= self._deadline:
+            raise _SearchTimeout()
+
+        best = float("-inf")
+        for _, dmg in ours:
+            value = self._after_our_move(my_hp, enemy_hp, dmg, depth, ours, theirs)
+            if value > best:
+                best = value
+
+        self._tt[key] = best
+        return best
+
+    def _after_our_move(self, my_hp, enemy_hp, dmg_out, depth, ours, theirs):
+        """Nó de chance: média sobre os golpes prováveis do inimigo."""
+        enemy_left = enemy_hp - dmg_out
+        if enemy_left <= 0:
+            return self._max_node(my_hp, 0, depth - 1, ours, theirs)
+
+        total = 0.0
+        for dmg_in in theirs:
+            total += self._max_node(my_hp - dmg_in, enemy_left, depth - 1, ours, theirs)
+        return total / len(theirs)
+
+    # ---------------------------------------------------------
+    # Modelo de dano
+    # ---------------------------------------------------------
+    def _our_damage_table(self, my_pokemon_name, my_moves, enemy_name):
+        enemy_types = self.db.get_pokemon_types(enemy_name)
+        my_types = self.db.get_pokemon_types(my_pokemon_name)
+        table = []
+        for slot, move_name in enumerate(my_moves[:4]):
+            table.append((slot, self._move_damage(move_name, my_types, enemy_types) if move_name else 0))
+        return table
+
+    def _enemy_damage_table(self, enemy_name, enemy_level, my_pokemon_name):
+        likely = self._likely_enemy_moves(enemy_name, enemy_level)
+        enemy_types = self.db.get_pokemon_types(enemy_name)
+        my_types = self.db.get_pokemon_types(my_pokemon_name)
+
+        table = [self._move_damage(name, enemy_types, my_types) for name in likely]
+        if not table:
+            table = [self._quantize(self.DEFAULT_ENEMY_POWER / 100.0 * self.DAMAGE_PER_100_POWER)]
+        return table
+
+    def _likely_enemy_moves(self, enemy_name, enemy_level):
+        if self.moves is not None:
+            return self.moves.likely_enemy_moves(enemy_name, enemy_level)
+        if enemy_level is None and self.store is not None:
+            enemy_level = self.store.typical_level(enemy_name)
+        return self.db.get_likely_moves(enemy_name, enemy_level)
+
+    def _move_damage(self, move_name, attacker_types, defender_types):
+        """Dano esperado em passos de HP (inteiro, 0 para golpes de status)."""
+        power = self.db.get_move_power(move_name)
+        if not power:
+            return 0
+
+        type_id = self.db.get_move_data(move_name).get("type_id")
+        mult = self.db.get_type_multiplier(type_id, defender_types)
+        if type_id is not None and str(type_id) in {str(t) for t in attacker_types or []}:
+            mult *= 1.5  # STAB
+
+        return self._quantize(power / 100.0 * self.DAMAGE_PER_100_POWER * mult, minimum=1 if mult > 0 else 0)
+
+    def _quantize(self, fraction, minimum=1):
+        return max(minimum, int(round(fraction * self.hp_steps)))
+
+    # ---------------------------------------------------------
+    # Estado entre turnos
+    # ---------------------------------------------------------
+    def _start_battle(self, key):
+        if key != self._battle_key:
+            self.reset()
+            self._battle_key = key
+
+    def _root_state(self, my_hp, enemy_hp):
+        belief = self._belief or (self.hp_steps, self.hp_steps)
+        my_q = self._quantize(my_hp) if my_hp is not None else belief[0]
+        enemy_q = self._quantize(enemy_hp) if enemy_hp is not None else belief[1]
+        return (min(my_q, self.hp_steps), min(enemy_q, self.hp_steps))
+
+    def _matchup_value(self, my_pokemon_name, enemy_name, enemy_level, budget):
+        """Valor da busca para um confronto hipotético, sem tocar no cache da batalha."""
+        my_moves = self.tm.get_moves(my_pokemon_name)
+        if not my_moves:
+            return None
+        ours = self._our_damage_table(my_pokemon_name, my_moves, enemy_name)
+        if not any(dmg > 0 for _, dmg in ours):
+            return None
+        theirs = self._enemy_damage_table(enemy_name, enemy_level, my_pokemon_name)
+
+        saved_tt, saved_deadline = self._tt, self._deadline
+        self._tt = {}
+        self._deadline = time.perf_counter() + budget
+        try:
+            value, _ = self._iterative_deepening((self.hp_steps, self.hp_steps), ours, theirs)
+        finally:
+            self._tt, self._deadline = saved_tt, saved_deadline
+        return value
@@ -2,9 +2,13 @@ from loguru import logger
 
 
 class BattleStrategy:
-    def __init__(self, db, team_manager):
+    def __init__(self, db, team_manager, search=None, moves=None):
         self.db = db
         self.tm = team_manager
+        # Busca com lookahead (BattleSearch); None mantém a escolha gulosa
+        self.search = search
+        # MoveInference: golpes previstos pelo learnset quando ainda não lemos os nossos
+        self.moves = moves
 
         # Exemplos simples de whitelist/blacklist (podem ser editados depois)
         # Nomes em minúsculo para facilitar comparação
@@ -14,19 +18,33 @@ class BattleStrategy:
     # ---------------------------------------------------------
     # Escolha de movimento
     # ---------------------------------------------------------
-    def get_best_move(self, my_pokemon_name, enemy_name):
+    def get_best_move(self, my_pokemon_name, enemy_name, enemy_level=None):
         """Escolhe o melhor movimento baseado em power, tipo e categoria.
 
+        - Com ``search`` configurado, usa a busca com lookahead primeiro.
         - Usa dados do pokeapi (tipo_id, power, categoria).
         - Aplica multiplicador de eficácia de tipo.
         - Evita golpes puramente de status quando possível.
         """
+        if self.search is not None:
+            try:
+                slot = self.search.choose_move(my_pokemon_name, enemy_name, enemy_level)
+                if slot is not None:
+                    return slot
+            except Exception as e:
+                logger.error(f"Erro na busca de batalha, usando escolha gulosa: {e}")
 
         enemy_types = self.db.get_pokemon_types(enemy_name)
-        logger.info(f"Inimigo: {enemy_name} | tipos={enemy_types}")
+        if self.moves is not None:
+            likely = self.moves.likely_enemy_moves(enemy_name, enemy_level)
+            logger.info(f"Inimigo: {enemy_name} | tipos={enemy_types} | golpes prováveis={likely}")
+        else:
+            logger.info(f"Inimigo: {enemy_name} | tipos={enemy_types}")
 
         my_moves = self.tm.get_moves(my_pokemon_name)
-        if not my_moves:
+        if not any(my_moves or []) and self.moves is not None:
+            my_moves = self.moves.predict(my_pokemon_name)
+        if not any(my_moves or []):
             logger.warning("Movimentos desconhecidos. Usando Slot 1.")
             return 0
 
@@ -92,10 +110,11 @@ class BattleStrategy:
     # ---------------------------------------------------------
     # Decisão de troca (esqueleto, depende de integração com HUD)
     # ---------------------------------------------------------
-    def choose_switch_target(self, enemy_name):
+    def choose_switch_target(self, enemy_name, my_pokemon_name=None, enemy_level=None):
         """Escolhe um alvo de troca na equipe atual.
 
-        Por enquanto, usa apenas nomes da equipe do TeamManager e procura
+        Com ``search`` configurado e o Pokémon atual conhecido, compara o
+        valor da busca de cada membro contra o do atual. Sem busca, procura
         o primeiro que tenha pelo menos um golpe com multiplicador > 1.0.
         Retorna o índice na lista current_team, ou None se não vale trocar.
         """
@@ -103,6 +122,12 @@ class BattleStrategy:
         if not team:
             return None
 
+        if self.search is not None and my_pokemon_name:
+            try:
+                return self.search.choose_switch(team, my_pokemon_name, enemy_name, enemy_level)
+            except Exception as e:
+                logger.error(f"Erro na busca de troca, usando regra simples: {e}")
+
         enemy_types = self.db.get_pokemon_types(enemy_name)
         if not enemy_types:
             return None
@@ -0,0 +1,158 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from loguru import logger
+
+
+class LearningStore:
+    """Banco SQLite embutido com o que o bot aprende entre execuções.
+
+    Tabelas:
+    - ``known_moves``: golpes conhecidos por Pokémon (substitui o JSON quando
+      ``persistence.backend`` é "sqlite").
+    - ``team``: última equipe lida do HUD/menu.
+    - ``encounters``: histórico de encontros (espécie, nível, local, resultado,
+      turnos, checagens de shiny), indexado por espécie e tempo; dá também o
+      nível típico de cada espécie.
+
+    Usa WAL, SQL constante (o módulo sqlite3 mantém os statements preparados
+    em cache por conexão) e grava encontros em lote a cada ``batch_size``.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS known_moves (
+        pokemon TEXT PRIMARY KEY,
+        moves   TEXT NOT NULL,
+        updated REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS team (
+        slot    INTEGER PRIMARY KEY,
+        pokemon TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS encounters (
+        id           INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts           REAL NOT NULL,
+        species      TEXT NOT NULL,
+        level        INTEGER,
+        location     TEXT,
+        outcome      TEXT,
+        turns        INTEGER NOT NULL DEFAULT 0,
+        shiny_checks INTEGER NOT NULL DEFAULT 0,
+        shiny        INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_encounters_species_ts ON encounters (species, ts);
+    CREATE INDEX IF NOT EXISTS idx_encounters_ts ON encounters (ts);
+    """
+
+    SQL_UPSERT_MOVES = (
+        "INSERT INTO known_moves (pokemon, moves, updated) VALUES (?, ?, ?) "
+        "ON CONFLICT(pokemon) DO UPDATE SET moves = excluded.moves, updated = excluded.updated"
+    )
+    SQL_SELECT_MOVES = "SELECT pokemon, moves FROM known_moves"
+    SQL_DELETE_TEAM = "DELETE FROM team"
+    SQL_INSERT_TEAM = "INSERT INTO team (slot, pokemon) VALUES (?, ?)"
+    SQL_SELECT_TEAM = "SELECT pokemon FROM team ORDER BY slot"
+    SQL_INSERT_ENCOUNTER = (
+        "INSERT INTO encounters (ts, species, level, location, outcome, turns, shiny_checks, shiny) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    SQL_TYPICAL_LEVEL = (
+        "SELECT AVG(level) FROM (SELECT level FROM encounters "
+        "WHERE species = ? AND level IS NOT NULL ORDER BY ts DESC LIMIT 50)"
+    )
+    SQL_SPECIES_STATS = (
+        "SELECT species, COUNT(*), AVG(turns), SUM(shiny) FROM encounters "
+        "WHERE ts >= ? GROUP BY species ORDER BY COUNT(*) DESC"
+    )
+
+    def __init__(self, db_path="data/pokebot.db", batch_size=20):
+        self.db_path = Path(db_path)
+        self.batch_size = max(1, int(batch_size))
+        self._lock = threading.Lock()
+        self._pending_encounters = []
+
+        if str(db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False, cached_statements=64)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+    # --------- Golpes conhecidos / equipe ---------
+    def load_known_moves(self):
+        with self._lock:
+            rows = self.conn.execute(self.SQL_SELECT_MOVES).fetchall()
+        return {pokemon: json.loads(moves) for pokemon, moves in rows}
+
+    def save_known_moves(self, pokemon_name, moves):
+        with self._lock, self.conn:
+            self.conn.execute(
+                self.SQL_UPSERT_MOVES,
+                (pokemon_name, json.dumps(moves, ensure_ascii=False), time.time()),
+            )
+
+    def load_team(self):
+        with self._lock:
+            return [row[0] for row in self.conn.execute(self.SQL_SELECT_TEAM)]
+
+    def save_team(self, team):
+        with self._lock, self.conn:
+            self.conn.execute(self.SQL_DELETE_TEAM)
+            self.conn.executemany(self.SQL_INSERT_TEAM, list(enumerate(team)))
+
+    # --------- Encontros ---------
+    def log_encounter(self, species, level=None, location=None, outcome=None,
+                      turns=0, shiny_checks=0, shiny=False, ts=None):
+        """Enfileira um encontro; grava em lote a cada ``batch_size``."""
+        if not species:
+            return
+        row = (
+            ts if ts is not None else time.time(),
+            species.strip().lower(),
+            level,
+            location,
+            outcome,
+            int(turns),
+            int(shiny_checks),
+            1 if shiny else 0,
+        )
+        with self._lock:
+            self._pending_encounters.append(row)
+            should_flush = len(self._pending_encounters) >= self.batch_size
+        if should_flush or shiny:
+            self.flush()
+
+    def flush(self):
+        """Grava os encontros pendentes numa única transação."""
+        with self._lock:
+            pending, self._pending_encounters = self._pending_encounters, []
+            if not pending:
+                return
+            try:
+                with self.conn:
+                    self.conn.executemany(self.SQL_INSERT_ENCOUNTER, pending)
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao gravar {len(pending)} encontros no SQLite: {e}")
+
+    # --------- Consultas ---------
+    def typical_level(self, species):
+        """Nível médio dos últimos encontros da espécie (None se nunca vista)."""
+        if not species:
+            return None
+        with self._lock:
+            row = self.conn.execute(self.SQL_TYPICAL_LEVEL, (species.strip().lower(),)).fetchone()
+        return int(round(row[0])) if row and row[0] is not None else None
+
+    def species_stats(self, since=0.0):
+        """``[(espécie, encontros, turnos_médios, shinies)]`` desde ``since``."""
+        self.flush()
+        with self._lock:
+            return self.conn.execute(self.SQL_SPECIES_STATS, (since,)).fetchall()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self.conn.close()
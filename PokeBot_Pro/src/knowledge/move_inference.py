@@ -0,0 +1,149 @@
+"""Golpes inferidos do learnset e do histórico, conferidos por pixels em vez de OCR.
+
+Nosso Pokémon ativo: a previsão vem, em ordem, dos golpes já lidos antes
+(``TeamManager``), de ``personagens.json`` (``movimentos_atuais`` do
+elenco) e, por último, dos 4 últimos golpes do learnset (``dex.json`` ->
+``movimentos_por_nivel``) até o nível do elenco. Cada botão de golpe é
+conferido pela assinatura de pixels (``region_signature``) guardada da
+última vez que aquele golpe foi lido por OCR; só os slots sem assinatura
+conhecida ou que não batem com nenhum candidato vão para o OCR, e a
+leitura ensina a assinatura (``data/move_signatures.json``). Só leituras de
+golpes que existem na dex ensinam: um OCR vazio ou com lixo não pode virar a
+assinatura "certa" daquele botão.
+
+Inimigo: ``likely_enemy_moves`` dá os últimos golpes do learnset até o
+nível observado (ou o nível típico da espécie no LearningStore), para a
+estratégia e a busca.
+"""
+import json
+from pathlib import Path
+import numpy as np
+from loguru import logger
+
+from .persistence import WriteBehindJsonStore
+from ..perception.speculative import signatures_match
+
+
+class MoveInference:
+    def __init__(self, db, team_manager, config=None, store=None):
+        cfg = (config or {}).get('move_inference', {}) or {}
+        self.db = db
+        self.tm = team_manager
+        self.store = store
+        self.tolerance = float(cfg.get('tolerance', 4.0))
+        self.roster = self._load_roster(Path(cfg.get('personagens_path', 'data/personagens.json')))
+        self._learnsets = {}
+        self._signatures = {}  # "golpe@LxA" -> assinatura (lista de linhas, uint8)
+        self._arrays = {}
+        self._signature_store = WriteBehindJsonStore(
+            cfg.get('signatures_path', 'data/move_signatures.json'),
+            snapshot=lambda: dict(self._signatures),
+            debounce=float(cfg.get('flush_debounce_s', 2.0)),
+        )
+        self._signatures = self._signature_store.load()
+        self.verified = 0   # slots confirmados só por pixels
+        self.ocr_slots = 0  # slots que precisaram de OCR
+
+    @staticmethod
+    def _load_roster(path):
+        """espécie (lower) -> {'level', 'moves'} do elenco; membros do time ativo têm prioridade."""
+        if not path.exists():
+            return {}
+        try:
+            with path.open('r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Erro ao carregar {path}: {e}")
+            return {}
+        elenco = data.get('elenco') or {}
+        active = data.get('time_ativo') or []
+        roster = {}
+        for member_id in list(active) + [m for m in elenco if m not in active]:
+            member = elenco.get(member_id) or {}
+            species = str(member.get('nome_base') or '').strip().lower()
+            if species and species not in roster:
+                roster[species] = {'level': member.get('level'), 'moves': list(member.get('movimentos_atuais') or [])}
+        return roster
+
+    # --------- Previsão ---------
+    def learnset(self, species, level=None):
+        """Nomes dos golpes de level-up até ``level`` (índice por espécie montado uma vez)."""
+        key = (species or '').strip().lower()
+        if key not in self._learnsets:
+            self._learnsets[key] = [(lvl, name) for lvl, name, _ in self.db.get_level_up_moves(species)]
+        return [name for lvl, name in self._learnsets[key] if level is None or lvl <= int(level)]
+
+    def predict(self, species, level=None):
+        """4 golpes previstos (na ordem dos slots) para o nosso Pokémon."""
+        known = self.tm.get_moves(species) if self.tm is not None else []
+        if any(known):
+            moves = list(known)
+        else:
+            member = self.roster.get((species or '').strip().lower()) or {}
+            moves = list(member.get('moves') or [])
+            if not moves:
+                moves = self._last_learned(self.learnset(species, level or member.get('level')))
+        return (moves + [''] * 4)[:4]
+
+    @staticmethod
+    def _last_learned(names, max_moves=4):
+        last = []
+        for name in names:
+            if name in last:
+                last.remove(name)
+            last.append(name)
+        return last[-max_moves:]
+
+    def likely_enemy_moves(self, species, level=None, max_moves=4):
+        """Golpes prováveis do inimigo: os últimos do learnset até o nível (lido ou típico)."""
+        if level is None and self.store is not None:
+            level = self.store.typical_level(species)
+        return self._last_learned(self.learnset(species, level), max_moves)
+
+    # --------- Conferência por pixels ---------
+    @staticmethod
+    def _key(name, signature):
+        return f"{(name or '').strip().lower()}@{signature.shape[1]}x{signature.shape[0]}"
+
+    def _signature(self, key):
+        array = self._arrays.get(key)
+        if array is None and key in self._signatures:
+            array = self._arrays[key] = np.asarray(self._signatures[key], dtype=np.uint8)
+        return array
+
+    def match_slots(self, species, signatures, level=None):
+        """(golpes por slot, índices que precisam de OCR).
+
+        Cada slot é conferido primeiro contra o golpe previsto para ele e
+        depois contra os demais candidatos (previstos, histórico e learnset).
+        """
+        predicted = self.predict(species, level)
+        candidates = [c for c in dict.fromkeys(predicted + self.learnset(species)) if c]
+        moves, pending = [''] * len(signatures), []
+        for i, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            expected = predicted[i] if i < len(predicted) else ''
+            for name in ([expected] if expected else []) + [c for c in candidates if c != expected]:
+                stored = self._signature(self._key(name, signature))
+                if stored is not None and signatures_match(stored, signature, self.tolerance):
+                    moves[i] = name
+                    self.verified += 1
+                    break
+            else:
+                pending.append(i)
+                self.ocr_slots += 1
+        return moves, pending
+
+    def learn_slot(self, name, signature):
+        """Guarda a assinatura do botão de um golpe lido por OCR; devolve se aprendeu."""
+        if signature is None or not name or not self.db.get_move_data(name):
+            return False
+        key = self._key(name, signature)
+        self._signatures[key] = signature.tolist()
+        self._arrays[key] = signature
+        self._signature_store.mark_dirty(key, self._signatures[key])
+        return True
+
+    def close(self):
+        self._signature_store.close()
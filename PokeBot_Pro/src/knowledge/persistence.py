@@ -0,0 +1,182 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from loguru import logger
+
+RETRY_DELAY = 1.0  # s mínimos entre tentativas depois de uma escrita que falhou
+
+
+def atomic_write_json(path, data, indent=2):
+    """Grava JSON em arquivo temporário no mesmo diretório e troca via os.replace.
+
+    Um crash no meio da escrita deixa o arquivo antigo intacto.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class WriteBehindJsonStore:
+    """Persistência write-behind de um dicionário JSON.
+
+    - ``mark_dirty`` só registra a mudança; a escrita acontece numa thread
+      de fundo depois de ``debounce`` segundos sem novas mudanças.
+    - Escrita completa sempre atômica (temp + rename).
+    - Com ``journal=True``, cada mudança vira uma linha num arquivo
+      append-only (``<arquivo>.journal``), custo O(mudança); o arquivo
+      principal só é reescrito a cada ``compact_every`` entradas e no ``close``.
+    """
+
+    def __init__(self, path, snapshot, debounce=2.0, journal=False, compact_every=200, indent=2):
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.name + ".journal")
+        self._snapshot = snapshot  # callable que devolve o dict atual
+        self.debounce = float(debounce)
+        self.use_journal = bool(journal)
+        self.compact_every = int(compact_every)
+        self.indent = indent
+
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()  # serializa escritas (worker x flush)
+        self._pending = []          # mudanças ainda não escritas no journal
+        self._dirty = False
+        self._last_change = 0.0
+        self._retry_after = 0.0
+        self._journal_entries = 0
+        self._closed = False
+        self._thread = None
+
+    # --------- Leitura ---------
+    def load(self):
+        """Lê o arquivo principal e reaplica o journal, se existir."""
+        data = {}
+        if self.path.exists():
+            try:
+                with self.path.open('r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.error(f"Erro ao carregar {self.path}: {e}")
+                data = {}
+
+        if self.journal_path.exists():
+            with self.journal_path.open('r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Última linha pode estar truncada após um crash
+                        logger.warning(f"Linha inválida ignorada no journal {self.journal_path}")
+                        continue
+                    data[entry['k']] = entry['v']
+                    self._journal_entries += 1
+        return data
+
+    # --------- Escrita ---------
+    def mark_dirty(self, key=None, value=None):
+        """Registra uma mudança; não faz I/O na thread chamadora."""
+        with self._cond:
+            if self._closed:
+                return
+            self._dirty = True
+            self._last_change = time.monotonic()
+            if self.use_journal and key is not None:
+                self._pending.append({'k': key, 'v': value})
+            self._ensure_thread()
+            self._cond.notify()
+
+    def flush(self):
+        """Escreve o estado completo agora (atômico) e zera o journal."""
+        with self._cond:
+            pending, self._pending = self._pending, []
+            self._dirty = False
+        try:
+            self._write_full()
+        except Exception:
+            with self._cond:
+                self._pending = pending + self._pending
+                self._dirty = True
+            raise
+
+    def close(self):
+        """Para a thread de fundo e faz o flush final."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        # Depois do join: uma escrita do worker que falhou já devolveu a mudança
+        with self._cond:
+            dirty = self._dirty or self._journal_entries > 0
+        if dirty:
+            self.flush()
+
+    # --------- Interno ---------
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="write-behind", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Debounce: espera a rajada de mudanças acabar
+                remaining = max(self._last_change + self.debounce, self._retry_after) - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(timeout=remaining)
+                    continue
+                pending, self._pending = self._pending, []
+                self._dirty = False
+
+            try:
+                if self.use_journal and pending and self._journal_entries + len(pending) < self.compact_every:
+                    self._append_journal(pending)
+                else:
+                    self._write_full()
+            except Exception as e:
+                # Ex.: arquivo travado (OneDrive/antivírus no Windows): a mudança
+                # volta para a fila e a escrita é tentada de novo após RETRY_DELAY
+                logger.error(f"Erro ao persistir {self.path} (nova tentativa em breve): {e}")
+                with self._cond:
+                    self._pending = pending + self._pending
+                    self._dirty = True
+                    self._retry_after = time.monotonic() + RETRY_DELAY
+
+    def _append_journal(self, entries):
+        with self._io_lock:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal_path.open('a', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_entries += len(entries)
+
+    def _write_full(self):
+        with self._io_lock:
+            atomic_write_json(self.path, self._snapshot(), indent=self.indent)
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._journal_entries = 0
@@ -24,6 +24,10 @@ class PokemonDatabase:
         self.pokeapi_moves = self._load_json("pokeapi_moves.json")
         self.type_efficacy = self._load_json("type_efficacy.json")
 
+        # Índices derivados, montados sob demanda
+        self._dex_lower = None
+        self._learnset_power_index = None
+
     def _load_json(self, filename: str):
         path = self.data_dir / filename
         if not path.exists():
@@ -61,6 +65,21 @@ class PokemonDatabase:
 
         return []
 
+    def canonical_name(self, pokemon_name: str):
+        """Nome como está na dex se o Pokémon existe (confirma leituras de OCR); senão None."""
+        if not pokemon_name or not pokemon_name.strip():
+            return None
+        entry_key = pokemon_name.strip()
+        if self._dex_entry(entry_key):
+            if entry_key in self.dex_legacy:
+                return entry_key
+            if entry_key.capitalize() in self.dex_legacy:
+                return entry_key.capitalize()
+            return self._dex_lower.get(entry_key.lower())
+        if entry_key.lower() in self.pokeapi_pokemon:
+            return entry_key.capitalize()
+        return None
+
     def get_weaknesses(self, pokemon_name: str):
         """Retorna lista de type_ids ou nomes de tipos aos quais o Pokémon é fraco.
 
@@ -160,3 +179,98 @@ class PokemonDatabase:
 
         logger.debug(f"Dados de golpe não encontrados para '{move_name}'")
         return {}
+
+    def get_move_power(self, move_name: str):
+        """Retorna o poder base de um golpe (0 se desconhecido ou de status).
+
+        Os caches da PokeAPI vêm com ``power`` zerado, então cai para
+        `movimentos.json` e, por último, para o poder registrado nos learnsets
+        do `dex.json`.
+        """
+        if not move_name:
+            return 0
+
+        try:
+            power = float(self.get_move_data(move_name).get("power", 0) or 0)
+        except (TypeError, ValueError):
+            power = 0.0
+
+        if not power:
+            legacy = self.moves_legacy.get(move_name) or self.moves_legacy.get(move_name.strip().title())
+            if legacy:
+                try:
+                    power = float(legacy.get("poder", 0) or legacy.get("power", 0) or 0)
+                except (TypeError, ValueError):
+                    power = 0.0
+
+        if not power:
+            power = float(self._learnset_powers().get(move_name.strip().lower(), 0) or 0)
+
+        return power
+
+    # ---------- Learnsets ----------
+
+    def get_level_up_moves(self, pokemon_name: str, level=None):
+        """Retorna ``[(nivel, golpe, poder)]`` aprendidos por level-up até ``level``.
+
+        Usa `movimentos_por_nivel` do `dex.json`. Sem ``level``, devolve o
+        learnset inteiro. A lista sai ordenada por nível.
+        """
+        entry = self._dex_entry(pokemon_name)
+        if not entry:
+            return []
+
+        learned = []
+        for lvl_str, moves in (entry.get("movimentos_por_nivel") or {}).items():
+            try:
+                lvl = int(lvl_str)
+            except (TypeError, ValueError):
+                continue
+            if level is not None and lvl > int(level):
+                continue
+            for move in moves or []:
+                if not move:
+                    continue
+                name = move[0]
+                power = move[1] if len(move) > 1 and move[1] is not None else 0
+                learned.append((lvl, name, power))
+
+        learned.sort(key=lambda item: item[0])
+        return learned
+
+    def get_likely_moves(self, pokemon_name: str, level=None, max_moves: int = 4):
+        """Golpes prováveis de um Pokémon selvagem no nível observado.
+
+        Como nos jogos principais, um selvagem conhece os últimos ``max_moves``
+        golpes aprendidos por level-up até o seu nível.
+        """
+        names = []
+        for _, name, _ in self.get_level_up_moves(pokemon_name, level):
+            if name in names:
+                names.remove(name)
+            names.append(name)
+        return names[-max_moves:]
+
+    def _dex_entry(self, pokemon_name: str):
+        if not pokemon_name:
+            return None
+        key = pokemon_name.strip()
+        entry = self.dex_legacy.get(key) or self.dex_legacy.get(key.capitalize())
+        if entry:
+            return entry
+        if self._dex_lower is None:
+            self._dex_lower = {name.lower(): name for name in self.dex_legacy}
+        real_name = self._dex_lower.get(key.lower())
+        return self.dex_legacy.get(real_name) if real_name else None
+
+    def _learnset_powers(self):
+        """Índice ``golpe (lower) -> poder`` montado uma única vez a partir do dex."""
+        if self._learnset_power_index is None:
+            index = {}
+            for entry in self.dex_legacy.values():
+                for moves in (entry.get("movimentos_por_nivel") or {}).values():
+                    for move in moves or []:
+                        if move and len(move) > 1 and move[1]:
+                            index.setdefault(str(move[0]).lower(), move[1])
+            self._learnset_power_index = index
+        return self._learnset_power_index
@@ -1,22 +1,41 @@
-import json
 from pathlib import Path
+from .persistence import WriteBehindJsonStore
 
 
 class TeamManager:
-    """Gerencia equipe atual (volátil) e golpes conhecidos (persistente)."""
+    """Gerencia equipe atual (volátil) e golpes conhecidos (persistente).
 
-    def __init__(self):
+    A escrita de `known_moves.json` é write-behind: a batalha só marca a
+    mudança e uma thread de fundo grava (de forma atômica) depois do debounce.
+    Com ``learning_store`` (LearningStore/SQLite), golpes e equipe ficam no
+    banco e a equipe sobrevive a reinícios. Chame ``close()`` ao encerrar o
+    bot para o flush final.
+    """
+
+    def __init__(self, moves_db_path="data/known_moves.json", persistence_cfg=None, learning_store=None):
+        persistence_cfg = persistence_cfg or {}
         # Banco de golpes conhecidos (persistente)
-        self.moves_db_path = Path("data/known_moves.json")
+        self.moves_db_path = Path(moves_db_path)
+        self.learning_store = learning_store
         self.current_team = []  # Lista volátil, atualizada em tempo real
         self.known_moves = {}   # Dicionário persistente {pokemon_name: [moves]}
+        self._store = WriteBehindJsonStore(
+            self.moves_db_path,
+            snapshot=lambda: dict(self.known_moves),
+            debounce=persistence_cfg.get('flush_debounce_s', 2.0),
+            journal=persistence_cfg.get('journal', False),
+            compact_every=persistence_cfg.get('journal_compact_every', 200),
+        )
         self._load_moves()
 
     # --------- API nova ---------
     def update_team_from_hud(self, ocr_results_list):
         """Atualiza a equipe atual a partir dos nomes lidos no HUD (exploração)."""
         # Limita a 6 slots e normaliza
-        self.current_team = [name.lower().strip() for name in ocr_results_list[:6] if name]
+        team = [name.lower().strip() for name in ocr_results_list[:6] if name]
+        if team != self.current_team and self.learning_store is not None:
+            self.learning_store.save_team(team)
+        self.current_team = team
 
     def update_pokemon_moves(self, pokemon_name, moves_list):
         """Atualiza golpes conhecidos de um pokémon (chamado na batalha)."""
@@ -32,7 +51,10 @@ class TeamManager:
         # Atualiza apenas se algo mudou para evitar escrita desnecessária em disco
         if name not in self.known_moves or self.known_moves[name] != cleaned_moves:
             self.known_moves[name] = cleaned_moves
-            self._save_moves()
+            if self.learning_store is not None:
+                self.learning_store.save_known_moves(name, cleaned_moves)
+            else:
+                self._store.mark_dirty(name, cleaned_moves)
 
     def get_moves_for(self, pokemon_name):
         if not pokemon_name:
@@ -49,12 +71,24 @@ class TeamManager:
         return self.get_moves_for(pokemon_name)
 
     # --------- Persistência interna ---------
+    def flush(self):
+        """Força a gravação imediata (atômica) dos golpes conhecidos."""
+        self._store.flush()
+
+    def close(self):
+        """Encerra a thread de persistência com flush final."""
+        self._store.close()
+
     def _load_moves(self):
-        if self.moves_db_path.exists():
-            with self.moves_db_path.open('r', encoding='utf-8') as f:
-                self.known_moves = json.load(f)
-
-    def _save_moves(self):
-        self.moves_db_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.moves_db_path.open('w', encoding='utf-8') as f:
-            json.dump(self.known_moves, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+        self.known_moves = self._store.load()
+        if self.learning_store is None:
+            return
+
+        # Migra o JSON legado para o banco na primeira execução com SQLite
+        stored = self.learning_store.load_known_moves()
+        for name, moves in self.known_moves.items():
+            if name not in stored:
+                self.learning_store.save_known_moves(name, moves)
+                stored[name] = moves
+        self.known_moves = stored
+        self.current_team = self.learning_store.load_team()
\ No newline at end of file
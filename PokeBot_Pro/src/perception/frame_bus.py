@@ -0,0 +1,88 @@
+"""Barramento de frames em memória compartilhada (multiprocessing.shared_memory).
+
+O processo de captura publica cada frame num anel de ``slots`` buffers
+compartilhados; processos de percepção se conectam pelo nome e leem o
+frame sem cópia (view numpy sobre a memória compartilhada).
+
+Cada slot tem um número de sequência no cabeçalho. O escritor marca o
+slot como "em escrita" (-1), copia o frame e grava a sequência; o leitor
+confere a sequência antes e depois de usar o frame (``valid``) e descarta
+o resultado se o slot foi reescrito no meio (anel deu a volta).
+"""
+from multiprocessing import shared_memory
+import numpy as np
+
+_HEADER_DTYPE = np.int64
+
+
+class FrameBus:
+    def __init__(self, shape, slots=4, name=None, create=True):
+        self.shape = tuple(int(v) for v in shape)
+        self.slots = int(slots)
+        self.frame_bytes = int(np.prod(self.shape))
+        header_bytes = self.slots * np.dtype(_HEADER_DTYPE).itemsize
+        size = header_bytes + self.slots * self.frame_bytes
+        self.owner = create
+        if create:
+            self.shm = shared_memory.SharedMemory(create=True, size=size, name=name)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            _untrack(self.shm)
+        self.name = self.shm.name
+        self.seqs = np.ndarray((self.slots,), dtype=_HEADER_DTYPE, buffer=self.shm.buf)
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf, offset=header_bytes)
+        if create:
+            self.seqs[:] = 0
+        self._next_seq = 0
+
+    @classmethod
+    def attach(cls, descriptor):
+        """Conecta (lado do worker) a partir de ``descriptor()`` do escritor."""
+        name, shape, slots = descriptor
+        return cls(shape, slots, name=name, create=False)
+
+    def descriptor(self):
+        """Dados para outro processo se conectar: (nome, shape, slots)."""
+        return (self.name, self.shape, self.slots)
+
+    # --------- Escritor ---------
+    def publish(self, frame):
+        """Copia ``frame`` para o próximo slot do anel; retorna (seq, slot)."""
+        if frame.shape != self.shape:
+            raise ValueError(f"Frame {frame.shape} não cabe no barramento {self.shape}")
+        self._next_seq += 1
+        seq = self._next_seq
+        slot = seq % self.slots
+        self.seqs[slot] = -1
+        np.copyto(self.frames[slot], frame)
+        self.seqs[slot] = seq
+        return seq, slot
+
+    # --------- Leitor ---------
+    def view(self, slot):
+        """Frame do slot, sem cópia."""
+        return self.frames[slot]
+
+    def valid(self, seq, slot):
+        """O slot ainda guarda o frame ``seq``?"""
+        return int(self.seqs[slot]) == seq
+
+    def close(self):
+        # Solta as views antes de fechar o mapeamento
+        self.seqs = None
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _untrack(shm):
+    """Leitores não devem apagar o segmento ao sair (resource_tracker do Python < 3.13)."""
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    except Exception:
+        pass
@@ -1,55 +1,145 @@
-import cv2
+import re
 import numpy as np
-import winsound
 from enum import Enum
 from loguru import logger
+from .template_registry import TemplateRegistry
+from .matching import TemplateMatcher
+from .rois import RoiSet
+from .speculative import region_signature
 
 class GameState(Enum):
     EXPLORING = "exploring"
     IN_BATTLE = "in_battle"
     SHINY_FOUND = "shiny_found"
+    DIALOG = "dialog"
+    MENU = "menu"
     UNKNOWN = "unknown"
 
+
+class PerceptionSnapshot:
+    """Resultado da percepção de um frame, calculado uma única vez por tick.
+
+    Campos ficam None enquanto o detector correspondente não rodou neste
+    frame (ver ``detectors``), para que guardas não confundam "não avaliado"
+    com "falso".
+    """
+
+    def __init__(self, image, frame_id=None):
+        self.image = image
+        self.frame_id = frame_id
+        self.detectors = set()
+        self.shiny = None
+        self.in_battle = None
+        self.battle_scores = {}
+        self.talk = None   # (score, (x, y), (w, h)) relativo ao frame
+        self.goto = None   # (score, (x, y), (w, h)) relativo ao frame
+        self.scene = None  # GameState do classificador de cena (None = incerto/não rodou)
+
+    @property
+    def state(self):
+        if self.shiny:
+            return GameState.SHINY_FOUND
+        if self.in_battle:
+            return GameState.IN_BATTLE
+        if self.scene in (GameState.DIALOG, GameState.MENU):
+            return self.scene
+        return GameState.EXPLORING
+
+
 class GameStateDetector:
-    def __init__(self, screen_capture, ocr_engine, config):
+    def __init__(self, screen_capture, ocr_engine, config, templates=None, matcher=None, sprites=None,
+                 classifier=None):
         self.cap = screen_capture
         self.ocr = ocr_engine
-        self.rois = config.get('rois', {})
+        # Classificador de cena (SceneClassifier): com cena segura fora de batalha, pula os templates
+        self.classifier = classifier
+        self.skip_shiny_outside_battle = bool(
+            config.get('scene_classifier', {}).get('skip_shiny_outside_battle', False))
+        # Índice de sprites (SpriteIndex): identifica o inimigo sem OCR quando há match confiável
+        self.sprites = sprites
+        # ROIs/áreas parseados e validados uma vez (ValueError se algum box for ambíguo)
+        self.rois = RoiSet.of(config)
         self.cfg_detection = config.get('detection', {})
-        self.templates = self._load_templates(config)
-
-    def _load_templates(self, config):
-        # Carrega imagem de shiny, talk e botões de batalha
-        assets_dir = config.get('assets', {}).get('templates_dir', 'assets/templates/')
-        shiny_path = assets_dir + config.get('assets', {}).get('shiny_image', 'shiny.png')
-        talk_path = assets_dir + config.get('assets', {}).get('talk_image', 'talk.png')
-        fight_path = assets_dir + config.get('assets', {}).get('fight_image', 'fight.png')
-        bag_path = assets_dir + config.get('assets', {}).get('bag_image', 'bag.png')
-        pokemon_path = assets_dir + config.get('assets', {}).get('pokemon_image', 'pokemon.png')
-        run_path = assets_dir + config.get('assets', {}).get('run_image', 'run.png')
-        return {
-            'shiny': cv2.imread(shiny_path),
-            'talk': cv2.imread(talk_path),
-            'fight': cv2.imread(fight_path),
-            'bag': cv2.imread(bag_path),
-            'pokemon': cv2.imread(pokemon_path),
-            'run': cv2.imread(run_path),
-        }
+        # Registro compartilhado (TemplateRegistry) evita reler templates por sessão
+        if templates is None:
+            templates = TemplateRegistry(config)
+        self.templates = self._load_templates(templates)
+        # Todo matching passa pelo TemplateMatcher (cinza/reduzido, score em [0,1])
+        self.matcher = matcher or TemplateMatcher(templates, config)
+
+    def apply_layout(self, config, matcher):
+        """Troca ROIs/áreas e matcher pelos da geometria atual (ver Layout)."""
+        self.rois = RoiSet.of(config)
+        self.cfg_detection = config.get('detection', {})
+        self.matcher = matcher
+
+    def _load_templates(self, registry):
+        # Carrega imagem de shiny, talk, goto e botões de batalha
+        return registry.as_dict(('shiny', 'talk', 'goto', 'fight', 'bag', 'pokemon', 'run'))
 
     def detect_state(self, image):
-        # 1. Verifica SHINY (Prioridade Absoluta)
-        if self._detect_shiny(image):
-            return GameState.SHINY_FOUND
+        """Classifica o frame (shiny > batalha > exploração)."""
+        return self.perceive(image, ('shiny', 'battle')).state
+
+    def perceive(self, image, profile, snapshot=None, frame_id=None):
+        """Roda apenas os detectores de ``profile`` sobre o frame.
+
+        Detectores: 'scene', 'shiny', 'battle', 'talk', 'goto'. Com
+        ``snapshot``, completa um resultado já existente sem repetir
+        detectores que já rodaram neste frame. 'scene' (o classificador de
+        miniatura) vem primeiro no perfil: se ele tiver certeza de que a
+        cena não é de batalha, 'battle' e 'talk' (e 'shiny', que só aparece
+        em batalha) nem rodam; 'goto' roda porque o clique precisa da posição.
+        """
+        if snapshot is None:
+            snapshot = PerceptionSnapshot(image, frame_id)
+
+        for name in profile:
+            if name in snapshot.detectors:
+                continue
+            snapshot.detectors.add(name)
+            if name == 'scene':
+                self._classify_scene(image, snapshot)
+            elif name == 'shiny':
+                snapshot.shiny = self._detect_shiny(image)
+            elif name == 'battle':
+                snapshot.battle_scores = self._battle_scores(image)
+                battle_thresh = float(self.cfg_detection.get('battle_button_threshold', 0.75))
+                snapshot.in_battle = any(v >= battle_thresh for v in snapshot.battle_scores.values())
+            elif name == 'talk':
+                snapshot.talk = self._match_talk(image)
+            elif name == 'goto':
+                snapshot.goto = self._match_template(image, 'goto')
+            else:
+                logger.warning(f"Detector desconhecido no perfil de percepção: '{name}'")
+
+        return snapshot
+
+    def _classify_scene(self, image, snapshot):
+        if self.classifier is None:
+            return
+        snapshot.scene = self.classifier.classify(image)
+        if snapshot.scene is None or snapshot.scene == GameState.IN_BATTLE:
+            # Incerto, ou batalha: os botões (templates) dizem se dá para agir
+            return
+        snapshot.in_battle = False
+        snapshot.detectors.update(('battle', 'talk'))
+        # Shiny nunca é pulado em DIALOG: a introdução do encontro ("A wild ... appeared!")
+        # parece diálogo e é justamente quando o shiny aparece
+        if self.skip_shiny_outside_battle and snapshot.scene != GameState.DIALOG and 'shiny' not in snapshot.detectors:
+            snapshot.shiny = False
+            snapshot.detectors.add('shiny')
 
-        # 2. Verifica Botões de Batalha (qualquer um dos 4) via template matching
-        # em uma única região ampla de combate (battle_area)
-        battle_area = self.cfg_detection.get('battle_area')
-        if battle_area and isinstance(battle_area, (list, tuple)) and len(battle_area) == 4:
-            x1, y1, x2, y2 = battle_area
-            battle_roi = image[y1:y2, x1:x2]
-        else:
-            battle_roi = image
+    def battle_hint(self, image):
+        """Checagem barata: botões de batalha só nos próprios ROIs, parando no primeiro encontrado."""
+        battle_thresh = float(self.cfg_detection.get('battle_button_threshold', 0.75))
+        return any(v >= battle_thresh for v in self._battle_scores(image).values())
+
+    def _button_area(self, tpl_key):
+        return self.rois.button_area(tpl_key, int(self.cfg_detection.get('button_padding', 24)))
 
+    def _battle_scores(self, image):
+        """Scores dos 4 botões de batalha (FIGHT/ITEMS/POKEMON/RUN), cada um no ROI do botão."""
         battle_templates = {
             'fight': 'fight',
             'items': 'bag',
@@ -59,33 +149,36 @@ class GameStateDetector:
 
         battle_thresh = float(self.cfg_detection.get('battle_button_threshold', 0.75))
 
+        scores = {}
         for name, tpl_key in battle_templates.items():
-            template = self.templates.get(tpl_key)
-            if template is None:
-                continue
-
-            try:
-                res = cv2.matchTemplate(battle_roi, template, cv2.TM_CCOEFF_NORMED)
-                _, max_val, _, _ = cv2.minMaxLoc(res)
-            except cv2.error as e:
-                logger.error(f"Erro em matchTemplate para {tpl_key}: {e}")
+            match = self.matcher.match(image, tpl_key, self._button_area(tpl_key))
+            if match is None:
                 continue
 
+            max_val = match[0]
+            scores[name] = max_val
             if max_val >= battle_thresh:
                 logger.debug(
                     f"Botão de batalha '{name}' detectado com score={max_val:.3f} (threshold={battle_thresh})"
                 )
-                return GameState.IN_BATTLE
+                # Um botão basta para afirmar que estamos em batalha
+                break
 
-        return GameState.EXPLORING
+        return scores
+
+    def _match_talk(self, image):
+        """Procura o ícone de diálogo só em talk_search_area (evita confusão com chat)."""
+        return self.matcher.match(image, 'talk', self.rois.get('detection.talk_search_area'))
+
+    def _match_template(self, image, tpl_key):
+        """Retorna (score, (x, y), (w, h)) do melhor match ou None sem template."""
+        return self.matcher.match(image, tpl_key)
 
     def _detect_shiny(self, image):
-        template = self.templates.get('shiny')
-        if template is None:
+        match = self.matcher.match(image, 'shiny')
+        if match is None:
             return False
-
-        res = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, _ = cv2.minMaxLoc(res)
+        max_val = match[0]
 
         # Threshold configurável via settings.yaml (fallback 0.85)
         shiny_thresh = float(self.cfg_detection.get('shiny_threshold', 0.85))
@@ -96,19 +189,42 @@ class GameStateDetector:
 
         return False
 
-    def get_battle_info(self, image):
-        """Extrai nome do inimigo, nome do player e (futuro) HP."""
-        # Nome do inimigo
-        enemy_name_img = self._crop_roi(image, self.rois.get('enemy_name'))
-        enemy_name_raw = self.ocr.extract_text_optimized(
-            enemy_name_img,
-            whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz- ",
-            invert_for_white_text=True,
-        )
-        enemy_name = enemy_name_raw.replace("Lv", "").strip()
+    def identify_enemy(self, image):
+        """(espécie pelo sprite ou None, hash do sprite ou None) — sem OCR."""
+        if self.sprites is None or 'enemy_sprite' not in self.rois:
+            return None, None
+        sprite_code = self.sprites.hash(self._crop_roi(image, 'enemy_sprite'))
+        match = self.sprites.lookup(sprite_code)
+        return (match[0] if match is not None else None), sprite_code
+
+    def learn_enemy(self, sprite_code, enemy_name):
+        """Leitura OCR confirmada pela dex ensina o índice de sprites; devolve o nome (corrigido)."""
+        if sprite_code is None or self.sprites is None:
+            return enemy_name
+        return self.sprites.learn(sprite_code, enemy_name) or enemy_name
+
+    def get_battle_info(self, image, enemy=None):
+        """Extrai nome do inimigo, nome do player e (futuro) HP.
+
+        ``enemy`` = (nome, hash do sprite) já identificado fora daqui (a
+        ProcessPerception consulta o índice de sprites no processo principal);
+        com nome, o OCR do nome do inimigo é pulado.
+        """
+        # Inimigo: pelo sprite (índice de hashes); OCR do nome só sem match confiável
+        enemy_name, sprite_code = enemy if enemy is not None else self.identify_enemy(image)
+        enemy_source = 'sprite' if enemy_name else 'ocr'
+
+        if not enemy_name:
+            enemy_name_img = self._crop_roi(image, 'enemy_name')
+            enemy_name_raw = self.ocr.extract_text_optimized(
+                enemy_name_img,
+                whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz- ",
+                invert_for_white_text=True,
+            )
+            enemy_name = self.learn_enemy(sprite_code, enemy_name_raw.replace("Lv", "").strip())
 
         # Nome do Pokémon do player (HUD)
-        player_name_img = self._crop_roi(image, self.rois.get('player_name'))
+        player_name_img = self._crop_roi(image, 'player_name')
         player_name_raw = self.ocr.extract_text_optimized(
             player_name_img,
             whitelist="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz- ",
@@ -116,31 +232,43 @@ class GameStateDetector:
         )
         player_name = player_name_raw.replace("Lv", "").strip()
 
+        # Nível do inimigo (usado para estimar os golpes prováveis dele)
+        enemy_level = None
+        if 'enemy_level' in self.rois:
+            enemy_level_img = self._crop_roi(image, 'enemy_level')
+            enemy_level_raw = self.ocr.extract_text_optimized(
+                enemy_level_img,
+                whitelist="Lv0123456789",
+                invert_for_white_text=True,
+            )
+            enemy_level = self._parse_level(enemy_level_raw)
+
         return {
             "enemy_name": enemy_name,
+            "enemy_source": enemy_source,
             "player_name": player_name,
-            # Adicionar leitura de HP e Level aqui usando as ROIs
+            "enemy_level": enemy_level,
+            # Adicionar leitura de HP aqui usando as ROIs
         }
 
-    def _crop_roi(self, image, roi_coords):
-        """Recorta ROI aceitando formatos [x,y,w,h] ou [x1,y1,x2,y2]."""
-        if not roi_coords or len(roi_coords) != 4:
-            return image
-
-        x1, y1, x2, y2 = roi_coords
-
-        # Se parecer [x,y,w,h] (w/h positivos pequenos), converte para [x1,y1,x2,y2]
-        if x2 <= x1 or y2 <= y1:
-            x, y, w, h = roi_coords
-            x1, y1, x2, y2 = int(x), int(y), int(x + w), int(y + h)
-
-        h_img, w_img = image.shape[:2]
-        x1 = max(0, min(int(x1), w_img - 1))
-        x2 = max(0, min(int(x2), w_img))
-        y1 = max(0, min(int(y1), h_img - 1))
-        y2 = max(0, min(int(y2), h_img))
+    def hud_signature(self, image):
+        """Assinatura barata das ROIs de nome/nível e sprites (valida leituras reaproveitadas)."""
+        return tuple(
+            region_signature(self._crop_roi(image, key))
+            for key in ('enemy_name', 'player_name', 'enemy_level', 'enemy_sprite', 'player_sprite')
+            if key in self.rois
+        )
 
-        if x2 <= x1 or y2 <= y1:
-            return image
+    @staticmethod
+    def _parse_level(text):
+        """Extrai o nível de textos como 'Lv12' / 'Lv 12'; None se inválido."""
+        match = re.search(r"(\d{1,3})", text or "")
+        if not match:
+            return None
+        level = int(match.group(1))
+        return level if 1 <= level <= 100 else None
 
-        return image[y1:y2, x1:x2]
\ No newline at end of file
+    def _crop_roi(self, image, name):
+        """View do ROI ``name`` recortado à geometria do frame (o frame inteiro se não houver)."""
+        roi = self.rois.bind(image.shape).get(name)
+        return roi.crop(image) if roi is not None else image
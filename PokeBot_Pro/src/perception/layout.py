@@ -0,0 +1,272 @@
+"""Layout independente de resolução/DPI.
+
+As coordenadas de ``settings.yaml`` (``rois``, ``battle_area``,
+``talk_search_area``) e os templates valem para uma resolução base
+(``layout.base_resolution``, 1920x1080). Quando o frame tem outra
+geometria, ``Layout`` detecta uma única vez a escala e o canto do
+viewport do jogo por busca multiescala de templates âncora e guarda, por
+escala, a config com ROIs transformados e um matcher com templates
+redimensionados. Só volta a detectar quando a geometria do frame muda
+(ou, sem âncora confiável, a cada ``retry_interval`` segundos).
+
+A âncora (botão FIGHT) só aparece em batalha: na exploração a busca
+multiescala não acha nada e custa centenas de ms. Por isso as novas
+tentativas rodam numa thread, sobre uma cópia do frame, e ``update`` só
+aplica o resultado num tick seguinte; o tick nunca espera a busca.
+"""
+import copy
+import threading
+import time
+import cv2
+import numpy as np
+from loguru import logger
+
+from .matching import TemplateMatcher, to_gray
+from .rois import parse_box
+
+# Chaves de detection com áreas no mesmo formato dos ROIs
+AREA_KEYS = ('battle_area', 'talk_search_area')
+# Valores escalares em pixels dentro de rois (ex.: altura de linha de menus)
+PIXEL_KEYS = ('slot_height',)
+
+
+def is_box(value):
+    return isinstance(value, (list, tuple)) and len(value) == 4 and all(
+        isinstance(v, (int, float)) for v in value
+    )
+
+
+def map_boxes(config, fn, scalar_fn=None):
+    """Cópia da config com ``fn(box)`` aplicado a todos os ROIs e áreas de detecção.
+
+    ``scalar_fn`` (opcional) transforma valores em pixels como ``slot_height``.
+    """
+    cfg = copy.deepcopy(config)
+
+    def walk(node):
+        for key, value in node.items():
+            if isinstance(value, dict):
+                walk(value)
+            elif is_box(value):
+                node[key] = fn(value)
+            elif scalar_fn is not None and key in PIXEL_KEYS and isinstance(value, (int, float)):
+                node[key] = scalar_fn(value)
+
+    walk(cfg.get('rois', {}) or {})
+    detection = cfg.get('detection', {}) or {}
+    for key in AREA_KEYS:
+        if is_box(detection.get(key)):
+            detection[key] = fn(detection[key])
+    return cfg
+
+
+class LayoutTransform:
+    """Escala + deslocamento do viewport do jogo dentro do frame."""
+
+    def __init__(self, scale=1.0, offset=(0, 0), confident=True):
+        self.scale = float(scale)
+        self.offset = (int(round(offset[0])), int(round(offset[1])))
+        self.confident = confident
+
+    @property
+    def identity(self):
+        return abs(self.scale - 1.0) < 1e-6 and self.offset == (0, 0)
+
+    def box(self, box):
+        """ROI da resolução base -> [x1,y1,x2,y2] no frame."""
+        x1, y1, x2, y2 = parse_box(box)
+        ox, oy = self.offset
+        s = self.scale
+        return [int(round(x1 * s)) + ox, int(round(y1 * s)) + oy,
+                int(round(x2 * s)) + ox, int(round(y2 * s)) + oy]
+
+    def point(self, x, y):
+        return int(round(x * self.scale)) + self.offset[0], int(round(y * self.scale)) + self.offset[1]
+
+    def apply(self, config):
+        if self.identity:
+            return copy.deepcopy(config)
+        return map_boxes(config, self.box, lambda v: max(1, int(round(v * self.scale))))
+
+    def __repr__(self):
+        return f"LayoutTransform(scale={self.scale:.3f}, offset={self.offset}, confident={self.confident})"
+
+
+class ScaledTemplates:
+    """Templates do registro redimensionados para uma escala (cacheados)."""
+
+    def __init__(self, registry, scale):
+        self.registry = registry
+        self.scale = scale
+        self._cache = {}
+
+    def get(self, key):
+        if key not in self._cache:
+            template = self.registry.get(key)
+            if template is not None and abs(self.scale - 1.0) > 1e-6:
+                interpolation = cv2.INTER_AREA if self.scale < 1.0 else cv2.INTER_LINEAR
+                template = cv2.resize(template, None, fx=self.scale, fy=self.scale, interpolation=interpolation)
+            self._cache[key] = template
+        return self._cache[key]
+
+
+class Layout:
+    """Detecta viewport/escala e entrega config + matcher para a geometria atual."""
+
+    def __init__(self, config, templates, matcher=None):
+        self.base_config = config
+        layout_cfg = config.get('layout', {}) or {}
+        self.base_w, self.base_h = layout_cfg.get('base_resolution', [1920, 1080])
+        # âncora -> canto superior esquerdo do template na resolução base
+        self.anchors = dict(layout_cfg.get('anchors', {}) or {})
+        self.anchor_threshold = float(layout_cfg.get('anchor_threshold', 0.8))
+        self.search_range = float(layout_cfg.get('search_range', 0.25))
+        self.search_step = float(layout_cfg.get('search_step', 0.025))
+        self.retry_interval = float(layout_cfg.get('retry_interval', 5.0))
+        self.templates = templates
+        self.base_matcher = matcher or TemplateMatcher(templates, config)
+
+        self.geometry = None
+        self.transform = None
+        self._last_attempt = 0.0
+        self._lock = threading.Lock()
+        self._retry = None         # thread da nova busca de âncoras
+        self._retry_found = None   # LayoutTransform achada por ela
+        self._generation = 0       # muda com a geometria: descarta buscas antigas
+        self._configs = {}   # (escala, offset) -> config transformada
+        self._matchers = {}  # escala -> TemplateMatcher com templates redimensionados
+
+    def update(self, frame):
+        """Retorna a nova LayoutTransform se a geometria mudou (ou foi redetectada); senão None."""
+        geometry = frame.shape[:2]
+        if geometry == self.geometry:
+            if self.transform.confident:
+                return None
+            with self._lock:
+                found, self._retry_found = self._retry_found, None
+            if found is not None:
+                return self._apply(found, geometry)
+            self._start_retry(frame)
+            return None
+
+        self.geometry = geometry
+        with self._lock:
+            self._generation += 1
+            self._retry_found = None
+        return self._apply(self.detect(frame), geometry)
+
+    def _apply(self, transform, geometry):
+        changed = self.transform is None or (transform.scale, transform.offset) != (
+            self.transform.scale, self.transform.offset)
+        self.transform = transform
+        if changed:
+            logger.info(f"Layout do jogo: frame {geometry[1]}x{geometry[0]} -> {transform}")
+        return transform if changed else None
+
+    def _start_retry(self, frame):
+        """Nova busca de âncoras em segundo plano, no máximo uma a cada ``retry_interval`` s."""
+        if self._retry is not None and self._retry.is_alive():
+            return
+        if time.monotonic() - self._last_attempt < self.retry_interval:
+            return
+        self._last_attempt = time.monotonic()
+        # O frame pode vir de um buffer reaproveitado da captura: a busca usa uma cópia
+        self._retry = threading.Thread(target=self._retry_worker, args=(frame.copy(), self._generation),
+                                       name="layout-retry", daemon=True)
+        self._retry.start()
+
+    def _retry_worker(self, frame, generation):
+        try:
+            found = self._search_anchors(frame)
+        except Exception as e:
+            logger.error(f"Erro na busca de âncoras do layout: {e}")
+            return
+        with self._lock:
+            if found is not None and generation == self._generation:
+                self._retry_found = found
+
+    def detect(self, frame):
+        """Escala/viewport do frame: caminho rápido na resolução base, senão busca de âncoras."""
+        self._last_attempt = time.monotonic()
+        h, w = frame.shape[:2]
+        if (w, h) == (self.base_w, self.base_h):
+            return LayoutTransform(1.0, (0, 0))
+
+        found = self._search_anchors(frame)
+        if found is not None:
+            return found
+
+        # Sem âncora visível: assume viewport centralizado ocupando o máximo possível
+        s0 = min(w / self.base_w, h / self.base_h)
+        offset = ((w - self.base_w * s0) / 2, (h - self.base_h * s0) / 2)
+        return LayoutTransform(s0, offset, confident=not self.anchors)
+
+    def _search_anchors(self, frame):
+        if not self.anchors:
+            return None
+        h, w = frame.shape[:2]
+        s0 = min(w / self.base_w, h / self.base_h)
+        scales = np.arange(s0 * (1 - self.search_range), s0 * (1 + self.search_range) + 1e-9, s0 * self.search_step)
+        gray = to_gray(frame)
+
+        best = None
+        for key, (ax, ay) in self.anchors.items():
+            template = self.templates.get(key)
+            if template is None:
+                continue
+            tpl_gray = to_gray(template)
+            for scale in scales:
+                tpl = cv2.resize(tpl_gray, None, fx=scale, fy=scale,
+                                 interpolation=cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR)
+                if tpl.shape[0] < 4 or tpl.shape[1] < 4 or tpl.shape[0] > h or tpl.shape[1] > w:
+                    continue
+                res = cv2.matchTemplate(gray, tpl, cv2.TM_CCOEFF_NORMED)
+                _, score, _, loc = cv2.minMaxLoc(res)
+                if best is None or score > best[0]:
+                    best = (score, float(scale), loc, (ax, ay), key)
+
+        if best is None or best[0] < self.anchor_threshold:
+            logger.debug(f"Nenhuma âncora de layout confiável (melhor={best[0] if best else None})")
+            return None
+        best = self._refine(gray, best, s0 * self.search_step)
+        score, scale, (x, y), (ax, ay), key = best
+        logger.debug(f"Âncora '{key}' em ({x}, {y}) com escala {scale:.3f} (score={score:.3f})")
+        return LayoutTransform(scale, (x - ax * scale, y - ay * scale))
+
+    def _refine(self, gray, best, step, substeps=10):
+        """Escala fina ao redor da melhor escala, buscando só perto da posição achada."""
+        score, scale, (x, y), anchor, key = best
+        tpl_gray = to_gray(self.templates.get(key))
+        for candidate in np.linspace(scale - step, scale + step, 2 * substeps + 1):
+            tpl = cv2.resize(tpl_gray, None, fx=candidate, fy=candidate,
+                             interpolation=cv2.INTER_AREA if candidate < 1.0 else cv2.INTER_LINEAR)
+            pad = int(np.ceil(max(tpl.shape) * step / max(candidate, 1e-6))) + 4
+            x0, y0 = max(0, x - pad), max(0, y - pad)
+            window = gray[y0:y + tpl.shape[0] + pad, x0:x + tpl.shape[1] + pad]
+            if window.shape[0] < tpl.shape[0] or window.shape[1] < tpl.shape[1]:
+                continue
+            _, cand_score, _, (wx, wy) = cv2.minMaxLoc(cv2.matchTemplate(window, tpl, cv2.TM_CCOEFF_NORMED))
+            if cand_score > score:
+                score, scale, x, y = cand_score, float(candidate), x0 + wx, y0 + wy
+        return score, scale, (x, y), anchor, key
+
+    def rebase(self, config):
+        """Nova config base sem mudar ROIs/templates/layout: mantém escala, âncoras e matchers."""
+        self.base_config = config
+        self._configs = {}
+
+    def config_for(self, transform):
+        """Config com ROIs/áreas transformados (cacheada por escala e deslocamento)."""
+        key = (round(transform.scale, 4), transform.offset)
+        if key not in self._configs:
+            self._configs[key] = transform.apply(self.base_config)
+        return self._configs[key]
+
+    def matcher_for(self, transform):
+        """Matcher com templates na escala do frame (cacheado por escala)."""
+        if transform.identity or abs(transform.scale - 1.0) < 1e-6:
+            return self.base_matcher
+        key = round(transform.scale, 4)
+        if key not in self._matchers:
+            self._matchers[key] = TemplateMatcher(ScaledTemplates(self.templates, transform.scale), self.base_config)
+        return self._matchers[key]
@@ -0,0 +1,191 @@
+"""Template matching com uma única API: ``match(frame, template_id, roi)``.
+
+Por trás da API, cada template usa o método mais barato que mantém a
+precisão, escolhido uma vez e cacheado junto com as versões preparadas do
+template (cinza, reduzida):
+
+- ``gray``: TM_CCOEFF_NORMED em escala de cinza (~5x mais barato que BGR);
+- ``pyramid``: busca grossa em cinza reduzido (``downscale``) e refino em
+  resolução cheia numa janela pequena ao redor dos melhores candidatos;
+- ``exact``: diferença quadrática em cinza, para pixel-art que aparece
+  idêntica na tela; score = 1 - RMS/``exact_tolerance``;
+- ``color``: o matchTemplate BGR original (referência).
+
+Templates em que a cor importa (canais bem diferentes, ex.: estrela do
+shiny) têm o score final de ``gray``/``pyramid`` recalculado em BGR só na
+posição achada, o que custa uma janela do tamanho do template.
+
+Todos os métodos devolvem score em [0, 1] (TM_CCOEFF_NORMED ou, no
+``exact``, similaridade equivalente), então os thresholds de
+``settings.yaml -> detection`` continuam valendo.
+"""
+import threading
+import cv2
+import numpy as np
+from loguru import logger
+
+from .rois import ROI
+
+METHODS = ('color', 'gray', 'pyramid', 'exact')
+
+
+def to_gray(image):
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+class _PreparedTemplate:
+    """Versões do template usadas pelos métodos (calculadas uma vez)."""
+
+    def __init__(self, bgr, method, downscale, color_check=False):
+        self.bgr = bgr
+        self.gray = to_gray(bgr)
+        self.h, self.w = bgr.shape[:2]
+        self.method = method
+        self.color_check = color_check and method in ('gray', 'pyramid')
+        self.small = None
+        if method == 'pyramid':
+            self.small = cv2.resize(self.gray, None, fx=downscale, fy=downscale, interpolation=cv2.INTER_AREA)
+
+
+class TemplateMatcher:
+    """Matching de templates do TemplateRegistry com método escolhido por template."""
+
+    def __init__(self, templates, config=None):
+        # ``templates``: TemplateRegistry ou dict chave -> imagem BGR
+        self.templates = templates
+        cfg = (config or {}).get('matching', {})
+        self.downscale = float(cfg.get('downscale', 0.5))
+        self.min_template_side = int(cfg.get('min_template_side', 24))
+        self.refine_candidates = max(1, int(cfg.get('refine_candidates', 2)))
+        self.exact_tolerance = float(cfg.get('exact_tolerance', 32.0))
+        self.color_spread = float(cfg.get('color_spread', 20.0))
+        self.methods = dict(cfg.get('methods', {}) or {})
+        self._prepared = {}
+        self._lock = threading.Lock()
+
+    # --------- API ---------
+    def match(self, frame, template_id, roi=None):
+        """Melhor match de ``template_id`` em ``frame`` (opcionalmente só dentro de ``roi``, um ROI ou box).
+
+        Retorna (score, (x, y), (w, h)) com (x, y) em coordenadas do frame,
+        ou None se não houver template ou a área for menor que ele.
+        """
+        tpl = self._prepare(template_id)
+        if tpl is None:
+            return None
+
+        ox, oy = 0, 0
+        if roi:
+            # ROI já parseado (RoiSet) ou box cru, validado aqui
+            roi = ROI.parse(roi).clamp(frame.shape)
+            if roi is None:
+                return None
+            frame = roi.crop(frame)
+            ox, oy = roi.x1, roi.y1
+
+        if frame.shape[0] < tpl.h or frame.shape[1] < tpl.w:
+            logger.debug(f"Área de busca menor que o template '{template_id}': {frame.shape[:2]}")
+            return None
+
+        try:
+            score, (x, y) = getattr(self, f"_match_{tpl.method}")(frame, tpl)
+            if tpl.color_check and frame.ndim == 3:
+                window = np.ascontiguousarray(frame[y:y + tpl.h, x:x + tpl.w, :3])
+                score, _ = self._best(cv2.matchTemplate(window, tpl.bgr, cv2.TM_CCOEFF_NORMED))
+        except cv2.error as e:
+            logger.error(f"Erro em matchTemplate para {template_id}: {e}")
+            return None
+        return (score, (x + ox, y + oy), (tpl.w, tpl.h))
+
+    def method_for(self, template_id):
+        tpl = self._prepare(template_id)
+        return tpl.method if tpl is not None else None
+
+    # --------- Preparação ---------
+    def _prepare(self, template_id):
+        with self._lock:
+            if template_id in self._prepared:
+                return self._prepared[template_id]
+        bgr = self.templates.get(template_id)
+        prepared = None
+        if bgr is not None:
+            prepared = _PreparedTemplate(
+                bgr, self._choose_method(template_id, bgr), self.downscale, self._colorful(bgr)
+            )
+            logger.debug(
+                f"Template '{template_id}' {bgr.shape[1]}x{bgr.shape[0]}: método '{prepared.method}'"
+                f"{' + confirmação em cor' if prepared.color_check else ''}"
+            )
+        with self._lock:
+            self._prepared[template_id] = prepared
+        return prepared
+
+    def _choose_method(self, template_id, bgr):
+        method = self.methods.get(template_id, 'auto')
+        if method in METHODS:
+            return method
+        if method != 'auto':
+            logger.warning(f"Método de matching desconhecido para '{template_id}': {method}; usando auto")
+        # Template grande o bastante para sobreviver à redução
+        if self.downscale < 1.0 and min(bgr.shape[:2]) >= self.min_template_side:
+            return 'pyramid'
+        return 'gray'
+
+    def _colorful(self, bgr):
+        """Canais bem diferentes entre si: a cor ajuda a distinguir o template."""
+        if bgr.ndim != 3:
+            return False
+        b, g, r = (bgr[..., i].astype(np.float32) for i in range(3))
+        spread = float((np.abs(b - g) + np.abs(g - r) + np.abs(r - b)).mean() / 3)
+        return spread >= self.color_spread
+
+    # --------- Métodos ---------
+    @staticmethod
+    def _best(res):
+        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        return float(max_val), max_loc
+
+    def _match_color(self, frame, tpl):
+        if frame.ndim == 2:
+            return self._match_gray(frame, tpl)
+        return self._best(cv2.matchTemplate(np.ascontiguousarray(frame[..., :3]), tpl.bgr, cv2.TM_CCOEFF_NORMED))
+
+    def _match_gray(self, frame, tpl):
+        return self._best(cv2.matchTemplate(to_gray(frame), tpl.gray, cv2.TM_CCOEFF_NORMED))
+
+    def _match_exact(self, frame, tpl):
+        res = cv2.matchTemplate(to_gray(frame).astype(np.float32), tpl.gray.astype(np.float32), cv2.TM_SQDIFF)
+        min_val, _, min_loc, _ = cv2.minMaxLoc(res)
+        rms = float(np.sqrt(max(min_val, 0.0) / (tpl.h * tpl.w)))
+        return max(0.0, 1.0 - rms / self.exact_tolerance), min_loc
+
+    def _match_pyramid(self, frame, tpl):
+        gray = to_gray(frame)
+        s = self.downscale
+        small = cv2.resize(gray, None, fx=s, fy=s, interpolation=cv2.INTER_AREA)
+        if small.shape[0] < tpl.small.shape[0] or small.shape[1] < tpl.small.shape[1]:
+            return self._match_gray(gray, tpl)
+
+        coarse = cv2.matchTemplate(small, tpl.small, cv2.TM_CCOEFF_NORMED)
+        pad = int(np.ceil(1.0 / s)) + 1
+        best = (-1.0, (0, 0))
+        for _ in range(self.refine_candidates):
+            _, _, _, (cx, cy) = cv2.minMaxLoc(coarse)
+            # Refino em resolução cheia numa janela pequena ao redor do candidato
+            x0 = max(0, int(cx / s) - pad)
+            y0 = max(0, int(cy / s) - pad)
+            x1 = min(gray.shape[1], int(cx / s) + tpl.w + pad)
+            y1 = min(gray.shape[0], int(cy / s) + tpl.h + pad)
+            window = gray[y0:y1, x0:x1]
+            if window.shape[0] >= tpl.h and window.shape[1] >= tpl.w:
+                score, (wx, wy) = self._best(cv2.matchTemplate(window, tpl.gray, cv2.TM_CCOEFF_NORMED))
+                if score > best[0]:
+                    best = (score, (x0 + wx, y0 + wy))
+            # Suprime a vizinhança para o próximo candidato
+            th, tw = tpl.small.shape[:2]
+            coarse[max(0, cy - th // 2):cy + th // 2 + 1, max(0, cx - tw // 2):cx + tw // 2 + 1] = -1.0
+        return best
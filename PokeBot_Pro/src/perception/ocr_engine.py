@@ -1,17 +1,33 @@
 import cv2
 import numpy as np
-import pytesseract
 from loguru import logger
 import re
 import os
 from difflib import get_close_matches
+from .image_processing import ensure_bgr
 
 
 class OCREngine:
     def __init__(self, tesseract_path):
+        self._pytesseract = None
+        self.configure(tesseract_path)
+
+    def configure(self, tesseract_path):
+        """(Re)aponta o executável do Tesseract (também usado na recarga da config)."""
         if not os.path.exists(tesseract_path):
             logger.error(f"Tesseract não encontrado em: {tesseract_path}")
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+        self.tesseract_path = tesseract_path
+        if self._pytesseract is not None:
+            self._pytesseract.pytesseract.tesseract_cmd = tesseract_path
+
+    @property
+    def pytesseract(self):
+        """pytesseract importado no primeiro OCR (fora do caminho da inicialização)."""
+        if self._pytesseract is None:
+            import pytesseract
+            pytesseract.pytesseract.tesseract_cmd = self.tesseract_path
+            self._pytesseract = pytesseract
+        return self._pytesseract
 
     def extract_text_optimized(self, image, whitelist=None, invert_for_white_text=False):
         """Extrai texto com pré-processamento forte e suporte a texto branco.
@@ -24,6 +40,8 @@ class OCREngine:
         try:
             if image is None or image.size == 0:
                 return ""
+            if image.ndim == 3 and image.shape[2] == 4:
+                image = ensure_bgr(image)
 
             # Upscale para melhorar leitura de fontes pequenas
             img_big = cv2.resize(image, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
@@ -66,7 +84,7 @@ class OCREngine:
             if whitelist:
                 config += f" -c tessedit_char_whitelist={whitelist}"
 
-            text = pytesseract.image_to_string(ocr_img, config=config)
+            text = self.pytesseract.image_to_string(ocr_img, config=config)
             return text.strip()
         except Exception as e:
             logger.error(f"Erro no OCR Otimizado: {e}")
@@ -85,7 +103,7 @@ class OCREngine:
                 "-c tessedit_char_whitelist="
                 "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789- "
             )
-            text = pytesseract.image_to_string(processed_image, config=config)
+            text = self.pytesseract.image_to_string(processed_image, config=config)
             return text.strip()
         except Exception as e:
             logger.error(f"Erro no OCR (read_text): {e}")
@@ -95,6 +113,7 @@ class OCREngine:
         """Prepara texto branco sobre fundo colorido/dinâmico (HUD de batalha, moves)."""
         if image is None or image.size == 0:
             return image
+        image = ensure_bgr(image)
 
         # Upscaling forte para definir bordas das letras
         img_big = cv2.resize(
@@ -177,6 +196,7 @@ class OCREngine:
         try:
             if image_roi is None or image_roi.size == 0:
                 return []
+            image_roi = ensure_bgr(image_roi)
 
             # 1. Upscaling forte para fontes pequenas
             img_big = cv2.resize(
@@ -205,7 +225,7 @@ class OCREngine:
                 "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
             )
 
-            text = pytesseract.image_to_string(inverted, config=config)
+            text = self.pytesseract.image_to_string(inverted, config=config)
 
             # 6. Limpeza das linhas
             names = [line.strip() for line in text.split("\n") if line.strip()]
@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+
+class OCRPool:
+    """Pool de workers de OCR compartilhado entre sessões.
+
+    O Tesseract roda como subprocesso, então threads dão paralelismo real;
+    o pool limita quantos rodam ao mesmo tempo, não importa quantas sessões.
+    """
+
+    # Métodos do OCREngine que passam pelo pool
+    POOLED = ('extract_text_optimized', 'read_text', 'ocr_party_list')
+
+    def __init__(self, ocr_engine, workers=2):
+        self.engine = ocr_engine
+        self.executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="ocr")
+
+    def submit(self, method, *args, **kwargs):
+        return self.executor.submit(getattr(self.engine, method), *args, **kwargs)
+
+    def client(self, released=None):
+        """Fachada com a API do OCREngine para uma sessão.
+
+        ``released``: context manager que libera a vez da sessão enquanto
+        ela espera o resultado (ver CooperativeScheduler).
+        """
+        return _OCRClient(self, released)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _OCRClient:
+    def __init__(self, pool, released=None):
+        self._pool = pool
+        self._released = released or nullcontext
+
+    def __getattr__(self, name):
+        attr = getattr(self._pool.engine, name)
+        if name not in OCRPool.POOLED:
+            # Limpeza/pré-processamento leve roda direto na thread da sessão
+            return attr
+
+        def pooled(*args, **kwargs):
+            future = self._pool.submit(name, *args, **kwargs)
+            with self._released():
+                return future.result()
+
+        return pooled
@@ -0,0 +1,252 @@
+"""Percepção em processos separados, lendo frames do FrameBus.
+
+O GIL limita quanto matching/pré-processamento roda em paralelo num só
+processo. Aqui cada worker é um processo com o seu próprio
+GameStateDetector, responsável por um grupo de detectores
+(``perception.processes.groups``, ex.: ``[[shiny], [battle], [talk, goto]]``;
+``battle_info`` é o OCR da HUD). O controller publica o frame uma vez no
+barramento de memória compartilhada, manda só (seq, slot, perfil) para os
+workers envolvidos e junta as respostas num PerceptionSnapshot.
+
+Resposta atrasada ou de um slot já reescrito é descartada e o detector
+local do controller cobre o que faltou, então o resultado é sempre o
+mesmo da percepção em processo único. Cada grupo espera o seu próprio
+prazo: os templates respondem em milissegundos (``timeout``), o OCR da HUD
+leva chamadas do tesseract (``battle_info_timeout``) e refazê-lo aqui só
+porque o worker demorou dobraria o custo.
+"""
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from loguru import logger
+
+from .frame_bus import FrameBus
+from .game_state_detector import PerceptionSnapshot
+
+# Campos do PerceptionSnapshot preenchidos por cada detector
+SNAPSHOT_FIELDS = {
+    'shiny': ('shiny',),
+    'battle': ('battle_scores', 'in_battle'),
+    'talk': ('talk',),
+    'goto': ('goto',),
+}
+
+DEFAULT_GROUPS = [['shiny'], ['battle'], ['talk', 'goto']]
+
+
+def _worker_main(config, detectors, tasks, results):
+    """Loop do processo worker: lê frames do barramento sem cópia e responde com os campos."""
+    from .game_state_detector import GameStateDetector
+    from .template_registry import TemplateRegistry
+    from .matching import TemplateMatcher
+    from .layout import ScaledTemplates
+
+    ocr = None
+    if 'battle_info' in detectors:
+        from .ocr_engine import OCREngine
+        ocr = OCREngine(config['ocr']['tesseract_path'])
+    registry = TemplateRegistry(config)
+    detector = GameStateDetector(None, ocr, config, templates=registry)
+    bus = None
+    descriptor = None
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        kind = task[0]
+        if kind == 'layout':
+            # Mesma geometria do controller: ROIs transformados + templates na escala
+            _, layout_config, scale = task
+            templates = registry if abs(scale - 1.0) < 1e-6 else ScaledTemplates(registry, scale)
+            detector.apply_layout(layout_config, TemplateMatcher(templates, layout_config))
+            continue
+
+        _, request_id, bus_descriptor, seq, slot, names, enemy = task
+        try:
+            if bus_descriptor != descriptor:
+                if bus is not None:
+                    bus.close()
+                bus = FrameBus.attach(bus_descriptor)
+                descriptor = bus_descriptor
+            if not bus.valid(seq, slot):
+                results.put((request_id, None))
+                continue
+            frame = bus.view(slot)
+            fields = {}
+            if 'battle_info' in names:
+                # Sprite do inimigo já consultado no processo principal (índice vivo e aprendendo lá)
+                fields['battle_info'] = detector.get_battle_info(frame, enemy=(enemy, None))
+            profile = [name for name in names if name in SNAPSHOT_FIELDS]
+            if profile:
+                snap = detector.perceive(frame, profile)
+                for name in profile:
+                    for field in SNAPSHOT_FIELDS[name]:
+                        fields[field] = getattr(snap, field)
+            # O slot foi reescrito durante a leitura: resultado não confiável
+            results.put((request_id, fields if bus.valid(seq, slot) else None))
+        except Exception as e:
+            logger.error(f"Erro no worker de percepção {detectors}: {e}")
+            results.put((request_id, None))
+
+    if bus is not None:
+        bus.close()
+
+
+class ProcessPerception:
+    """Fachada com a API de percepção do GameStateDetector, distribuída em processos."""
+
+    def __init__(self, config, detector):
+        proc_cfg = config.get('perception', {}).get('processes', {}) or {}
+        self.detector = detector  # local: fallback e chamadas baratas
+        self.timeout = float(proc_cfg.get('timeout', 0.5))
+        self.timeouts = {'battle_info': float(proc_cfg.get('battle_info_timeout', 5.0))}
+        self.slots = int(proc_cfg.get('bus_slots', 4))
+        self.groups = [list(group) for group in proc_cfg.get('groups', DEFAULT_GROUPS)]
+        self.bus = None
+        self.fallbacks = 0
+
+        ctx = multiprocessing.get_context('spawn')
+        self.results = ctx.Queue()
+        self.workers = []
+        for group in self.groups:
+            tasks = ctx.Queue()
+            process = ctx.Process(
+                target=_worker_main, args=(config, group, tasks, self.results),
+                name=f"perception-{'-'.join(group)}", daemon=True,
+            )
+            process.start()
+            self.workers.append((set(group), tasks, process))
+        logger.info(f"Percepção em {len(self.workers)} processos: {self.groups}")
+
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._waiting = {}  # request_id -> [evento, respostas]
+        self._last_publish = None  # (frame_id, seq, slot)
+        self._closed = False
+        self._collector = threading.Thread(target=self._collect, name="perception-results", daemon=True)
+        self._collector.start()
+
+    # --------- API do detector ---------
+    def perceive(self, image, profile, snapshot=None, frame_id=None):
+        if snapshot is None:
+            snapshot = PerceptionSnapshot(image, frame_id)
+        if 'scene' in profile and 'scene' not in snapshot.detectors:
+            # Microssegundos: roda aqui e pode dispensar os workers de template
+            self.detector.perceive(image, ('scene',), snapshot=snapshot)
+        names = [name for name in profile if name not in snapshot.detectors]
+        fields = self._request(image, names, snapshot.frame_id)
+        for name in names:
+            if name in SNAPSHOT_FIELDS and all(field in fields for field in SNAPSHOT_FIELDS[name]):
+                snapshot.detectors.add(name)
+                for field in SNAPSHOT_FIELDS[name]:
+                    setattr(snapshot, field, fields[field])
+        # O que nenhum worker respondeu roda aqui mesmo
+        missing = [name for name in names if name not in snapshot.detectors]
+        if missing:
+            self.fallbacks += 1
+            self.detector.perceive(image, missing, snapshot=snapshot)
+        return snapshot
+
+    def detect_state(self, image):
+        return self.perceive(image, ('shiny', 'battle')).state
+
+    def get_battle_info(self, image, frame_id=None):
+        # Índice de sprites só existe aqui: busca antes do worker (que pula o OCR do nome
+        # com match) e aprende com a leitura OCR que ele devolver
+        enemy_name, sprite_code = self.detector.identify_enemy(image)
+        fields = self._request(image, ['battle_info'], frame_id, enemy=enemy_name)
+        if 'battle_info' not in fields:
+            self.fallbacks += 1
+            return self.detector.get_battle_info(image, enemy=(enemy_name, sprite_code))
+        info = fields['battle_info']
+        if not enemy_name:
+            info['enemy_name'] = self.detector.learn_enemy(sprite_code, info['enemy_name'])
+        return info
+
+    def apply_layout(self, config, matcher):
+        self.detector.apply_layout(config, matcher)
+        scale = float(getattr(matcher.templates, 'scale', 1.0))
+        for _, tasks, _ in self.workers:
+            tasks.put(('layout', config, scale))
+
+    def __getattr__(self, name):
+        # battle_hint, hud_signature, _crop_roi... continuam no detector local
+        return getattr(self.detector, name)
+
+    # --------- Barramento / workers ---------
+    def _publish(self, image, frame_id):
+        with self._lock:
+            last = self._last_publish
+            if frame_id is not None and last is not None and last[0] == frame_id and self.bus.valid(last[1], last[2]):
+                return last[1], last[2]
+            if self.bus is None or self.bus.shape != image.shape:
+                # Geometria mudou (janela redimensionada): novo barramento
+                if self.bus is not None:
+                    self.bus.close()
+                self.bus = FrameBus(image.shape, self.slots)
+            seq, slot = self.bus.publish(image)
+            self._last_publish = (frame_id, seq, slot)
+            return seq, slot
+
+    def _request(self, image, names, frame_id, enemy=None):
+        targets = [(group & set(names), tasks) for group, tasks, _ in self.workers]
+        targets = [(sorted(jobs), tasks) for jobs, tasks in targets if jobs]
+        if not targets or self._closed:
+            return {}
+        seq, slot = self._publish(image, frame_id)
+        descriptor = self.bus.descriptor()
+
+        request_id = next(self._ids)
+        done = threading.Event()
+        entry = [done, [], len(targets)]
+        with self._lock:
+            self._waiting[request_id] = entry
+        for jobs, tasks in targets:
+            tasks.put(('perceive', request_id, descriptor, seq, slot, jobs, enemy))
+
+        timeout = max(self.timeouts.get(name, self.timeout) for name in names)
+        done.wait(timeout)
+        with self._lock:
+            self._waiting.pop(request_id, None)
+        merged = {}
+        for fields in entry[1]:
+            if fields:
+                merged.update(fields)
+        if not done.is_set():
+            logger.debug(f"Percepção em processos: resposta incompleta para {names} em {timeout}s")
+        return merged
+
+    def _collect(self):
+        while not self._closed:
+            try:
+                request_id, fields = self.results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                entry = self._waiting.get(request_id)
+                if entry is None:
+                    continue  # chegou depois do timeout
+                entry[1].append(fields)
+                if len(entry[1]) >= entry[2]:
+                    entry[0].set()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for _, tasks, _ in self.workers:
+            tasks.put(None)
+        deadline = time.monotonic() + 2.0
+        for _, _, process in self.workers:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        if self.bus is not None:
+            self.bus.close()
+        if self.fallbacks:
+            logger.info(f"Percepção em processos: {self.fallbacks} pedidos completados localmente")
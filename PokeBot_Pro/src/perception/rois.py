@@ -0,0 +1,225 @@
+"""ROIs de ``settings.yaml`` validados uma vez e guardados como objetos imutáveis.
+
+Formatos aceitos para um box:
+
+- ``[x1, y1, x2, y2]`` quando x2 > x1 e y2 > y1;
+- ``[x, y, w, h]`` quando w <= x e h <= y (tamanho menor que a origem,
+  o formato antigo de alguns ROIs);
+- dict explícito ``{x, y, w, h}`` ou ``{x1, y1, x2, y2}``.
+
+Um box que não se encaixa em nenhum (ex.: x2 > x1 mas y2 <= y1, tamanho
+zero, coordenada negativa) é ambíguo e é rejeitado ao carregar a config,
+com o nome da chave na mensagem, em vez de virar um recorte errado no
+meio da execução.
+
+``RoiSet.of(config)`` parseia ``rois`` e as áreas de ``detection`` uma
+vez por objeto de config; ``bind(shape)`` devolve os mesmos ROIs
+recortados à geometria do frame (cacheado por geometria). ``ROI.crop``
+é só uma view numpy com slices pré-calculados.
+"""
+import threading
+from collections import OrderedDict
+
+# Áreas de detection no mesmo formato dos ROIs
+DETECTION_AREAS = ('battle_area', 'talk_search_area')
+# Template de cada botão de batalha -> ROI do botão
+BUTTON_ROIS = {'fight': 'btn_fight', 'bag': 'btn_bag', 'pokemon': 'btn_pokemon', 'run': 'btn_run'}
+
+
+def parse_box(value, name='roi'):
+    """(x1, y1, x2, y2) inteiros a partir de qualquer formato aceito; ValueError se ambíguo."""
+    if isinstance(value, dict):
+        if {'x', 'y', 'w', 'h'} <= value.keys():
+            x, y, w, h = (int(value[k]) for k in ('x', 'y', 'w', 'h'))
+            box = (x, y, x + w, y + h)
+        elif {'x1', 'y1', 'x2', 'y2'} <= value.keys():
+            box = tuple(int(value[k]) for k in ('x1', 'y1', 'x2', 'y2'))
+        else:
+            raise ValueError(f"ROI '{name}': dict precisa de x,y,w,h ou x1,y1,x2,y2: {value}")
+    else:
+        if not isinstance(value, (list, tuple)) or len(value) != 4:
+            raise ValueError(f"ROI '{name}' deve ter 4 valores: {value}")
+        a, b, c, d = (int(v) for v in value)
+        if c > a and d > b:
+            box = (a, b, c, d)
+        elif 0 < c <= a and 0 < d <= b:
+            box = (a, b, a + c, b + d)
+        else:
+            raise ValueError(
+                f"ROI '{name}' ambíguo: {list(value)} não é [x1,y1,x2,y2] nem [x,y,w,h]; "
+                f"use um dict {{x, y, w, h}} ou {{x1, y1, x2, y2}}"
+            )
+    x1, y1, x2, y2 = box
+    if x1 < 0 or y1 < 0 or x2 <= x1 or y2 <= y1:
+        raise ValueError(f"ROI '{name}' vazio ou com coordenada negativa: {value}")
+    return box
+
+
+class ROI:
+    """Retângulo [x1, y1, x2, y2) imutável com slices prontos para recortar frames."""
+
+    __slots__ = ('name', 'x1', 'y1', 'x2', 'y2', 'rows', 'cols')
+
+    def __init__(self, x1, y1, x2, y2, name=None):
+        for attr, value in (('name', name), ('x1', int(x1)), ('y1', int(y1)), ('x2', int(x2)), ('y2', int(y2))):
+            object.__setattr__(self, attr, value)
+        object.__setattr__(self, 'rows', slice(self.y1, self.y2))
+        object.__setattr__(self, 'cols', slice(self.x1, self.x2))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ROI é imutável")
+
+    @classmethod
+    def parse(cls, value, name='roi'):
+        if isinstance(value, ROI):
+            return value
+        return cls(*parse_box(value, name), name=name)
+
+    @property
+    def corners(self):
+        return (self.x1, self.y1, self.x2, self.y2)
+
+    @property
+    def width(self):
+        return self.x2 - self.x1
+
+    @property
+    def height(self):
+        return self.y2 - self.y1
+
+    @property
+    def center(self):
+        return self.x1 + self.width // 2, self.y1 + self.height // 2
+
+    def crop(self, frame):
+        """View do frame (sem cópia)."""
+        return frame[self.rows, self.cols]
+
+    def clamp(self, shape):
+        """ROI recortado a um frame ``shape``; None se ficar vazio."""
+        h, w = shape[:2]
+        x1, y1 = min(self.x1, w - 1), min(self.y1, h - 1)
+        x2, y2 = min(self.x2, w), min(self.y2, h)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        if (x1, y1, x2, y2) == self.corners:
+            return self
+        return ROI(x1, y1, x2, y2, self.name)
+
+    def inner(self, margin):
+        """Área interna com ``margin`` (fração) de folga em cada lado; None se ficar vazia."""
+        mx, my = int(margin * self.width), int(margin * self.height)
+        if self.x2 - mx <= self.x1 + mx or self.y2 - my <= self.y1 + my:
+            return None
+        return ROI(self.x1 + mx, self.y1 + my, self.x2 - mx, self.y2 - my, self.name)
+
+    def expand(self, pad):
+        """ROI com ``pad`` px de folga em cada lado (sem passar da origem)."""
+        pad = int(pad)
+        return ROI(max(0, self.x1 - pad), max(0, self.y1 - pad), self.x2 + pad, self.y2 + pad, self.name)
+
+    @classmethod
+    def union(cls, rois, name=None):
+        rois = [roi for roi in rois if roi is not None]
+        if not rois:
+            return None
+        return cls(min(r.x1 for r in rois), min(r.y1 for r in rois),
+                   max(r.x2 for r in rois), max(r.y2 for r in rois), name)
+
+    def __eq__(self, other):
+        return isinstance(other, ROI) and self.corners == other.corners
+
+    def __hash__(self):
+        return hash(self.corners)
+
+    def __repr__(self):
+        return f"ROI({self.name}: {list(self.corners)})"
+
+
+class RoiSet:
+    """Todos os ROIs de uma config, por nome pontuado (ex.: 'moves.slot_1', 'detection.battle_area')."""
+
+    _cache = OrderedDict()
+    _cache_lock = threading.Lock()
+    CACHE_SIZE = 32  # configs vivas: base, uma por escala do Layout, recargas
+
+    def __init__(self, config=None, rois=None, scalars=None):
+        self.scalars = dict(scalars or {})
+        if rois is None:
+            rois = {}
+            self._walk((config or {}).get('rois', {}) or {}, '', rois)
+            detection = (config or {}).get('detection', {}) or {}
+            for key in DETECTION_AREAS:
+                if detection.get(key) is not None:
+                    rois[f'detection.{key}'] = ROI.parse(detection[key], f'detection.{key}')
+        self.rois = rois
+        self._bound = {}
+
+    @classmethod
+    def of(cls, config):
+        """RoiSet da config (parseado uma vez por objeto de config)."""
+        key = id(config)
+        with cls._cache_lock:
+            cached = cls._cache.get(key)
+            if cached is not None and cached[0] is config:
+                return cached[1]
+        roiset = cls(config)
+        with cls._cache_lock:
+            # Guarda a config junto: o id não é reaproveitado enquanto ela existir
+            cls._cache[key] = (config, roiset)
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return roiset
+
+    def _walk(self, node, prefix, out):
+        for key, value in node.items():
+            name = f"{prefix}{key}"
+            if isinstance(value, dict) and not ({'x', 'y', 'w', 'h'} <= value.keys() or
+                                                {'x1', 'y1', 'x2', 'y2'} <= value.keys()):
+                self._walk(value, f"{name}.", out)
+            elif isinstance(value, (int, float)):
+                self.scalars[name] = value
+            elif value is not None:
+                out[name] = ROI.parse(value, name)
+
+    def get(self, name):
+        return self.rois.get(name)
+
+    def __getitem__(self, name):
+        return self.rois[name]
+
+    def __contains__(self, name):
+        return name in self.rois
+
+    def scalar(self, name, default=None):
+        return self.scalars.get(name, default)
+
+    def button_area(self, template_key, pad=24):
+        """Onde procurar um botão de batalha: o ROI ``btn_*`` dele com ``pad`` px de folga.
+
+        Sem ROI do botão, usa ``detection.battle_area``; sem nenhum dos dois,
+        None (frame inteiro).
+        """
+        roi = self.rois.get(BUTTON_ROIS.get(template_key, ''))
+        if roi is not None:
+            return roi.expand(pad)
+        return self.rois.get('detection.battle_area')
+
+    def group(self, prefix):
+        """ROIs sob ``prefix`` em ordem de nome (ex.: group('moves') -> slot_1..slot_4)."""
+        start = f"{prefix}."
+        return [self.rois[name] for name in sorted(self.rois) if name.startswith(start)]
+
+    def bind(self, shape):
+        """Mesmos ROIs recortados à geometria ``shape`` do frame (cacheado por geometria)."""
+        key = tuple(shape[:2])
+        bound = self._bound.get(key)
+        if bound is None:
+            clamped = {}
+            for name, roi in self.rois.items():
+                roi = roi.clamp(key)
+                if roi is not None:
+                    clamped[name] = roi
+            bound = RoiSet(rois=clamped, scalars=self.scalars)
+            self._bound[key] = bound
+        return bound
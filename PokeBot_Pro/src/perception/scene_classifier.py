@@ -0,0 +1,128 @@
+"""Classificador de cena por miniatura: pré-filtro barato antes do template matching.
+
+O frame é reduzido a 64x36 (fatia + ``cv2.resize`` INTER_AREA) e vira um vetor de
+576 valores: cor média em blocos 4x4 (16x9x3) e intensidade de bordas
+(gradiente do cinza) nos mesmos blocos (16x9). O modelo é de centróide
+mais próximo no espaço padronizado (média/desvio do treino), treinado
+offline com ``tools/train_state_classifier.py`` a partir de frames
+rotulados (EXPLORING / IN_BATTLE / DIALOG / MENU).
+
+``classify`` só devolve um estado quando está seguro: distância ao
+centróide dentro do raio visto no treino para aquela classe
+(``radius_factor`` x percentil 95) e folga relativa de ``min_margin``
+sobre o segundo centróide. Incerto, devolve None e o GameStateDetector
+segue com os templates.
+"""
+from pathlib import Path
+import cv2
+import numpy as np
+from loguru import logger
+
+from .game_state_detector import GameState
+
+THUMB_SIZE = (64, 36)  # (largura, altura)
+POOL = 4
+
+
+def scene_features(image, size=THUMB_SIZE):
+    """Vetor float32 de cor + bordas da miniatura ``size`` do frame."""
+    # Amostragem por fatia até ~2x a miniatura antes do INTER_AREA (e da conversão de
+    # cor): redimensionar o frame inteiro custaria ~1 ms; assim fica em ~0.2 ms
+    step = max(1, min(image.shape[0] // (2 * size[1]), image.shape[1] // (2 * size[0])))
+    if step > 1:
+        image = np.ascontiguousarray(image[::step, ::step])
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    elif image.shape[2] == 4:
+        image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+    thumb = cv2.resize(image, size, interpolation=cv2.INTER_AREA).astype(np.float32) / 255.0
+    h, w = size[1] // POOL, size[0] // POOL
+    color = thumb[:h * POOL, :w * POOL].reshape(h, POOL, w, POOL, 3).mean(axis=(1, 3))
+    gray = thumb.mean(axis=2)
+    edges = np.zeros_like(gray)
+    edges[:, 1:] += np.abs(np.diff(gray, axis=1))
+    edges[1:, :] += np.abs(np.diff(gray, axis=0))
+    edges = edges[:h * POOL, :w * POOL].reshape(h, POOL, w, POOL).mean(axis=(1, 3))
+    return np.concatenate([color.ravel(), edges.ravel()])
+
+
+class SceneClassifier:
+    def __init__(self, labels, centroids, mean, std, radii, min_margin=0.1, size=THUMB_SIZE):
+        self.labels = [GameState(label) for label in labels]
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.asarray(std, dtype=np.float32)
+        self.radii = np.asarray(radii, dtype=np.float32)
+        self.min_margin = float(min_margin)
+        self.size = tuple(int(v) for v in size)
+        self.confident = 0
+        self.uncertain = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Modelo de ``scene_classifier.model_path``; None se desligado ou ainda não treinado."""
+        cfg = (config or {}).get('scene_classifier', {}) or {}
+        if not cfg.get('enabled', False):
+            return None
+        path = Path(cfg.get('model_path', 'data/state_classifier.npz'))
+        if not path.exists():
+            logger.info(f"Classificador de cena sem modelo em {path} (treine com tools/train_state_classifier.py)")
+            return None
+        try:
+            classifier = cls.load(path)
+        except Exception as e:
+            logger.error(f"Erro ao carregar classificador de cena {path}: {e}")
+            return None
+        if cfg.get('min_margin') is not None:
+            classifier.min_margin = float(cfg['min_margin'])
+        return classifier
+
+    # --------- Treino / persistência ---------
+    @classmethod
+    def train(cls, samples, radius_factor=1.5, min_margin=0.1, size=THUMB_SIZE):
+        """Treina a partir de ``[(frame, GameState)]``."""
+        features = np.stack([scene_features(image, size) for image, _ in samples])
+        names = [GameState(label).value for _, label in samples]
+        mean = features.mean(axis=0)
+        std = features.std(axis=0) + 1e-3
+        z = (features - mean) / std
+        labels = sorted(set(names))
+        centroids, radii = [], []
+        for label in labels:
+            rows = z[[name == label for name in names]]
+            centroid = rows.mean(axis=0)
+            dist = np.sqrt(((rows - centroid) ** 2).mean(axis=1))
+            centroids.append(centroid)
+            radii.append(max(float(np.percentile(dist, 95)), 0.05) * radius_factor)
+        return cls(labels, centroids, mean, std, radii, min_margin, size)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['labels'].astype(str), data['centroids'], data['mean'], data['std'],
+                       data['radii'], float(data['min_margin']), tuple(data['size']))
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, labels=np.array([label.value for label in self.labels]), centroids=self.centroids,
+                 mean=self.mean, std=self.std, radii=self.radii, min_margin=self.min_margin,
+                 size=np.array(self.size))
+
+    # --------- Classificação ---------
+    def scores(self, image):
+        """(índice do mais próximo, distâncias RMS a cada centróide)."""
+        z = (scene_features(image, self.size) - self.mean) / self.std
+        distances = np.sqrt(((self.centroids - z) ** 2).mean(axis=1))
+        return int(np.argmin(distances)), distances
+
+    def classify(self, image):
+        """GameState da cena se o modelo estiver seguro; senão None."""
+        best, distances = self.scores(image)
+        distance = float(distances[best])
+        second = float(np.partition(distances, 1)[1]) if len(distances) > 1 else np.inf
+        if distance > self.radii[best] or (second - distance) / max(second, 1e-6) < self.min_margin:
+            self.uncertain += 1
+            return None
+        self.confident += 1
+        return self.labels[best]
@@ -1,13 +1,162 @@
-import mss
+import time
 import numpy as np
 import cv2
+from pathlib import Path
+from loguru import logger
+
 
 class ScreenCapture:
-    def __init__(self, config=None):
-        self.sct = mss.mss()
-        self.monitor = self.sct.monitors[1] # Default to primary monitor
+    """Captura de tela via mss.
+
+    Alvo da captura, em ordem de prioridade:
+
+    - ``screen.window_title``: só a área cliente da janela do jogo, achada
+      pelo título via ``WindowLocator`` e relocalizada a cada
+      ``screen.window_refresh`` segundos (a janela pode ser movida); os
+      ROIs ficam relativos à janela;
+    - ``region`` = [x, y, w, h] em coordenadas da tela virtual (uma sessão
+      por cliente do jogo);
+    - o monitor principal inteiro.
+
+    Formato e tempo de vida dos frames (``screen.pixel_format``):
+
+    - ``bgr`` (padrão) / ``gray``: o buffer BGRA do mss é lido sem cópia
+      (``np.frombuffer``) e convertido direto num dos ``screen.frame_buffers``
+      buffers pré-alocados, reutilizados em rodízio. O frame (e qualquer
+      view/recorte dele) vale até ``frame_buffers`` capturas depois; quem
+      precisar dele por mais tempo (threads de OCR, gravações) usa
+      ``keep(frame)``.
+    - ``bgra``: sem conversão nenhuma; o frame é uma view do buffer do
+      próprio screenshot e vale enquanto houver referência a ele.
+    """
+
+    PIXEL_FORMATS = {'bgr': (cv2.COLOR_BGRA2BGR, 3), 'gray': (cv2.COLOR_BGRA2GRAY, None), 'bgra': (None, 4)}
+
+    def __init__(self, config=None, region=None, locator=None, window_title=None, sct=None):
+        if sct is None:
+            import mss  # só quando captura a tela de verdade (replay/testes não precisam)
+            sct = mss.mss()
+        self.sct = sct
+        screen_cfg = (config or {}).get('screen', {})
+        if region:
+            x, y, w, h = (int(v) for v in region)
+            self.monitor = {'left': x, 'top': y, 'width': w, 'height': h}
+        else:
+            self.monitor = self.sct.monitors[1] # Default to primary monitor
+        self.fallback_monitor = self.monitor
+
+        self.pixel_format = screen_cfg.get('pixel_format', 'bgr')
+        if self.pixel_format not in self.PIXEL_FORMATS:
+            logger.warning(f"screen.pixel_format desconhecido: {self.pixel_format}; usando bgr")
+            self.pixel_format = 'bgr'
+        self.frame_buffers = max(1, int(screen_cfg.get('frame_buffers', 2)))
+        self._buffers = []
+        self._next_buffer = 0
+
+        self.window_title = window_title or screen_cfg.get('window_title') or None
+        self.window_refresh = float(screen_cfg.get('window_refresh', 1.0))
+        self.window = None
+        self._last_locate = None
+        self._missing = False
+        self.locator = locator
+        if self.window_title:
+            if self.locator is None:
+                from .window_locator import default_locator
+                self.locator = default_locator()
+            self._locate()
+
+    @property
+    def origin(self):
+        """Canto superior esquerdo da área capturada, em coordenadas de tela."""
+        return (self.monitor['left'], self.monitor['top'])
+
+    def _locate(self):
+        """Atualiza ``monitor`` com o retângulo atual da janela do jogo."""
+        self._last_locate = time.monotonic()
+        rect = None
+        if self.locator is not None:
+            try:
+                rect = self.locator.find(self.window_title)
+            except Exception as e:
+                logger.error(f"Erro ao localizar a janela '{self.window_title}': {e}")
+        if rect is None or rect.width <= 0 or rect.height <= 0:
+            if not self._missing:
+                logger.warning(f"Janela '{self.window_title}' não encontrada; capturando a área padrão.")
+            self._missing = True
+            self.window = None
+            self.monitor = self.fallback_monitor
+            return
+        if rect != self.window:
+            logger.info(f"Janela '{self.window_title}' em {rect}")
+        self._missing = False
+        self.window = rect
+        self.monitor = rect.as_monitor()
 
     def capture(self):
+        if self.window_title and time.monotonic() - self._last_locate >= self.window_refresh:
+            self._locate()
         screenshot = self.sct.grab(self.monitor)
-        img = np.array(screenshot)
-        return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
\ No newline at end of file
+        raw = self._raw_view(screenshot)
+        code, channels = self.PIXEL_FORMATS[self.pixel_format]
+        if code is None:
+            return raw
+        dst = self._buffer(raw.shape[0], raw.shape[1], channels)
+        cv2.cvtColor(raw, code, dst=dst)
+        return dst
+
+    def keep(self, frame):
+        """Frame que continua válido depois das próximas capturas (cópia só se necessário)."""
+        if any(np.may_share_memory(frame, buf) for buf in self._buffers):
+            return frame.copy()
+        return frame
+
+    @staticmethod
+    def _raw_view(screenshot):
+        """BGRA do screenshot sem cópia (o array mantém o buffer do mss vivo)."""
+        raw = getattr(screenshot, 'raw', None)
+        if raw is None:
+            return np.asarray(screenshot)
+        return np.frombuffer(raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+
+    def _buffer(self, height, width, channels):
+        """Próximo buffer do rodízio; realoca todos se a geometria mudou."""
+        shape = (height, width) if channels is None else (height, width, channels)
+        if not self._buffers or self._buffers[0].shape != shape:
+            self._buffers = [np.empty(shape, np.uint8) for _ in range(self.frame_buffers)]
+            self._next_buffer = 0
+        buf = self._buffers[self._next_buffer]
+        self._next_buffer = (self._next_buffer + 1) % len(self._buffers)
+        return buf
+
+
+class ReplayCapture:
+    """Fonte de frames gravados (PNG de um diretório ou lista de arrays BGR).
+
+    Permite rodar sessões do bot sem jogo aberto (testes/depuração). Ao
+    chegar no fim, repete o último frame, ou recomeça se ``loop=True``.
+    """
+
+    def __init__(self, frames, loop=False):
+        if isinstance(frames, (str, Path)):
+            paths = sorted(Path(frames).glob("*.png"))
+            frames = [cv2.imread(str(p)) for p in paths]
+        self.frames = [f for f in frames if f is not None]
+        if not self.frames:
+            raise ValueError("ReplayCapture sem frames")
+        self.loop = loop
+        self.index = 0
+
+    @property
+    def origin(self):
+        return (0, 0)
+
+    def keep(self, frame):
+        # Frames gravados nunca são sobrescritos
+        return frame
+
+    def capture(self):
+        frame = self.frames[min(self.index, len(self.frames) - 1)]
+        self.index += 1
+        if self.loop and self.index >= len(self.frames):
+            self.index = 0
+        return frame
@@ -0,0 +1,59 @@
+"""Watchdog de shiny: detecção contínua, independente do loop principal.
+
+No loop principal o shiny só é checado no início de cada tick; durante
+as esperas de batalha (cooldowns, animação do menu) e a caminhada após
+Goto nenhum frame é olhado. O watchdog roda numa thread própria, com a
+sua própria captura, só o detector de shiny, a ``watchdog.fps`` quadros
+por segundo. Ao detectar, seta ``event`` (o sinal de cancelamento que o
+controller checa em toda espera) e guarda o frame em ``frame``.
+"""
+import threading
+import time
+from loguru import logger
+
+
+class ShinyWatchdog:
+    def __init__(self, detector, capture_factory, fps=10.0):
+        # ``capture_factory`` cria a captura dentro da thread do watchdog
+        # (mss guarda estado por thread e não pode ser dividido com o controller)
+        self.detector = detector
+        self.capture_factory = capture_factory
+        self.interval = 1.0 / max(float(fps), 0.1)
+        self.event = threading.Event()
+        self.frame = None
+        self.checks = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="shiny-watchdog", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        try:
+            cap = self.capture_factory()
+        except Exception as e:
+            logger.error(f"Watchdog de shiny sem captura: {e}")
+            return
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                frame = cap.capture()
+                self.checks += 1
+                if frame is not None and self.detector.perceive(frame, ('shiny',)).shiny:
+                    keep = getattr(cap, 'keep', None)
+                    self.frame = keep(frame) if keep is not None else frame
+                    logger.critical("Watchdog: SHINY na tela! Interrompendo o bot.")
+                    self.event.set()
+                    return
+            except Exception as e:
+                logger.error(f"Erro no watchdog de shiny: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from loguru import logger
+
+
+def region_signature(region, step=4):
+    """Assinatura barata de uma região: amostra 1/``step`` em cinza (cópia pequena)."""
+    if region is None or region.size == 0:
+        return None
+    sample = region[::step, ::step]
+    if sample.ndim == 3:
+        sample = sample.mean(axis=2)
+    return sample.astype(np.uint8)
+
+
+def signatures_match(a, b, tolerance=3.0):
+    """Compara assinaturas (ou tuplas de assinaturas) pela diferença média (0-255)."""
+    if isinstance(a, (tuple, list)) or isinstance(b, (tuple, list)):
+        if not isinstance(a, (tuple, list)) or not isinstance(b, (tuple, list)) or len(a) != len(b):
+            return False
+        return all(signatures_match(x, y, tolerance) for x, y in zip(a, b))
+    if a is None or b is None:
+        return a is b
+    if a.shape != b.shape:
+        return False
+    return float(np.abs(a.astype(np.int16) - b).mean()) <= tolerance
+
+
+class _Speculation:
+    def __init__(self, frame_id, signature, future):
+        self.frame_id = frame_id
+        self.signature = signature
+        self.future = future
+
+
+class SpeculativePerception:
+    """Leituras caras (OCR) disparadas antes de serem necessárias.
+
+    Enquanto o controller espera animações, ele entrega frames para cá e
+    dispara em background a percepção do próximo passo (nomes da HUD,
+    golpes do menu). Cada resultado guarda o ``frame_id`` (sequência de
+    captura) e a assinatura da região lida; no momento do uso, ``take``
+    só devolve o resultado se ele veio de um frame recente o bastante e a
+    região no frame atual ainda tem a mesma assinatura. Caso contrário é
+    um "miss" e o controller lê normalmente.
+    """
+
+    def __init__(self, workers=1, tolerance=3.0):
+        self.executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="speculative")
+        self.tolerance = float(tolerance)
+        self._specs = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def submit(self, key, frame_id, signature, fn, *args, **kwargs):
+        """Dispara ``fn`` para ``key``; substitui (e cancela, se possível) a anterior."""
+        future = self.executor.submit(fn, *args, **kwargs)
+        with self._lock:
+            old = self._specs.get(key)
+            self._specs[key] = _Speculation(frame_id, signature, future)
+        if old is not None:
+            old.future.cancel()
+        return future
+
+    def pending(self, key, signature):
+        """Já existe especulação para ``key`` com esta assinatura?"""
+        with self._lock:
+            spec = self._specs.get(key)
+        return spec is not None and signatures_match(spec.signature, signature, self.tolerance)
+
+    def take(self, key, signature, min_frame_id=0, timeout=None):
+        """Retorna (True, resultado) se a especulação ainda vale; senão (False, None).
+
+        ``min_frame_id``: frames anteriores a este (ex.: de antes da batalha
+        atual) não servem. Consome a especulação em qualquer caso.
+        """
+        with self._lock:
+            spec = self._specs.pop(key, None)
+        if spec is None:
+            self.misses += 1
+            return False, None
+        if spec.frame_id < min_frame_id or not signatures_match(spec.signature, signature, self.tolerance):
+            spec.future.cancel()
+            self.misses += 1
+            return False, None
+        try:
+            result = spec.future.result(timeout=timeout)
+        except Exception as e:
+            logger.debug(f"Leitura especulativa '{key}' descartada: {e!r}")
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, result
+
+    def invalidate(self, key=None):
+        with self._lock:
+            specs = list(self._specs.values()) if key is None else [self._specs.get(key)]
+            if key is None:
+                self._specs.clear()
+            else:
+                self._specs.pop(key, None)
+        for spec in specs:
+            if spec is not None:
+                spec.future.cancel()
+
+    def shutdown(self):
+        self.invalidate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,62 @@
+import threading
+import cv2
+from loguru import logger
+
+
+class TemplateRegistry:
+    """Cache único de templates (assets/templates) compartilhado entre componentes.
+
+    Cada template é lido do disco uma vez por caminho, em vez de um
+    ``cv2.imread`` por tick/clique. Seguro para várias sessões (threads).
+    """
+
+    # chave -> (campo em settings.yaml -> assets, arquivo padrão)
+    DEFAULTS = {
+        'shiny': ('shiny_image', 'shiny.png'),
+        'talk': ('talk_image', 'talk.png'),
+        'goto': ('goto_image', 'goto.png'),
+        'fight': ('fight_image', 'fight.png'),
+        'bag': ('bag_image', 'bag.png'),
+        'pokemon': ('pokemon_image', 'pokemon.png'),
+        'run': ('run_image', 'run.png'),
+    }
+
+    def __init__(self, config):
+        assets = (config or {}).get('assets', {})
+        self.templates_dir = assets.get('templates_dir', 'assets/templates/')
+        self.assets = assets
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def reconfigured(self, config):
+        """(novo registro para a seção ``assets`` de ``config``, chaves cujo caminho mudou).
+
+        Não altera este registro (que pode estar em uso por outras sessões):
+        o novo herda o cache dos templates cujo caminho continua o mesmo.
+        """
+        registry = TemplateRegistry(config)
+        with self._lock:
+            changed = [key for key in self.DEFAULTS if registry.path_for(key) != self.path_for(key)]
+            kept = {registry.path_for(key) for key in self.DEFAULTS if key not in changed}
+            registry._cache = {path: tpl for path, tpl in self._cache.items() if path in kept}
+        return registry, changed
+
+    def path_for(self, key):
+        field, default = self.DEFAULTS.get(key, (f"{key}_image", f"{key}.png"))
+        return self.templates_dir + self.assets.get(field, default)
+
+    def get(self, key):
+        """Template BGR para ``key`` ou None se o arquivo não existir."""
+        path = self.path_for(key)
+        with self._lock:
+            if path in self._cache:
+                return self._cache[path]
+        template = cv2.imread(path)
+        if template is None:
+            logger.warning(f"Template '{key}' não encontrado em {path}")
+        with self._lock:
+            self._cache[path] = template
+        return template
+
+    def as_dict(self, keys=None):
+        return {key: self.get(key) for key in (keys or self.DEFAULTS)}
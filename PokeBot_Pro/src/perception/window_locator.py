@@ -0,0 +1,205 @@
+"""Localização da janela do cliente do jogo pelo título.
+
+``WindowLocator.find(title)`` devolve o retângulo da área cliente da
+janela em coordenadas da tela virtual, ou None. Implementações:
+
+- ``Win32WindowLocator``: user32 via ctypes (Windows);
+- ``X11WindowLocator``: libX11 via ctypes (Linux/X11);
+- ``StaticWindowLocator``: retângulos fixos ou em sequência, usado em
+  replay/testes no lugar de uma janela real.
+
+``default_locator()`` escolhe pela plataforma.
+"""
+import ctypes
+import ctypes.util
+import sys
+from loguru import logger
+
+
+class WindowRect:
+    """Área cliente de uma janela: canto (left, top) e tamanho, em pixels de tela."""
+
+    def __init__(self, left, top, width, height):
+        self.left = int(left)
+        self.top = int(top)
+        self.width = int(width)
+        self.height = int(height)
+
+    def as_monitor(self):
+        """Formato aceito por ``mss.grab``."""
+        return {'left': self.left, 'top': self.top, 'width': self.width, 'height': self.height}
+
+    def __eq__(self, other):
+        return isinstance(other, WindowRect) and self.as_monitor() == other.as_monitor()
+
+    def __repr__(self):
+        return f"WindowRect({self.left}, {self.top}, {self.width}x{self.height})"
+
+
+class WindowLocator:
+    """Interface: encontra a janela cujo título contém ``title`` (sem diferenciar maiúsculas)."""
+
+    def find(self, title):
+        raise NotImplementedError
+
+
+class StaticWindowLocator(WindowLocator):
+    """Retângulos pré-definidos; com uma lista, avança um a cada ``find`` (janela "andando")."""
+
+    def __init__(self, rects):
+        if isinstance(rects, WindowRect) or rects is None:
+            rects = [rects]
+        self.rects = list(rects)
+        self.index = 0
+
+    def find(self, title):
+        rect = self.rects[min(self.index, len(self.rects) - 1)]
+        self.index += 1
+        return rect
+
+
+class Win32WindowLocator(WindowLocator):
+    """Janelas visíveis via EnumWindows; usa a área cliente (sem bordas/título)."""
+
+    def __init__(self):
+        from ctypes import wintypes
+        self._wintypes = wintypes
+        self.user32 = ctypes.windll.user32
+        # Coordenadas em pixels físicos, iguais às do mss, mesmo com escala de DPI
+        try:
+            ctypes.windll.shcore.SetProcessDpiAwareness(2)
+        except Exception:
+            pass
+
+    def find(self, title):
+        wintypes = self._wintypes
+        user32 = self.user32
+        needle = title.lower()
+        found = []
+
+        @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        def callback(hwnd, _):
+            if not user32.IsWindowVisible(hwnd) or user32.IsIconic(hwnd):
+                return True
+            length = user32.GetWindowTextLengthW(hwnd)
+            if length:
+                buf = ctypes.create_unicode_buffer(length + 1)
+                user32.GetWindowTextW(hwnd, buf, length + 1)
+                if needle in buf.value.lower():
+                    found.append(hwnd)
+                    return False
+            return True
+
+        user32.EnumWindows(callback, 0)
+        if not found:
+            return None
+
+        rect = wintypes.RECT()
+        user32.GetClientRect(found[0], ctypes.byref(rect))
+        corner = wintypes.POINT(0, 0)
+        user32.ClientToScreen(found[0], ctypes.byref(corner))
+        return WindowRect(corner.x, corner.y, rect.right - rect.left, rect.bottom - rect.top)
+
+
+class _XWindowAttributes(ctypes.Structure):
+    _fields_ = [
+        ('x', ctypes.c_int), ('y', ctypes.c_int),
+        ('width', ctypes.c_int), ('height', ctypes.c_int),
+        ('border_width', ctypes.c_int), ('depth', ctypes.c_int),
+        ('visual', ctypes.c_void_p), ('root', ctypes.c_ulong),
+        ('class', ctypes.c_int), ('bit_gravity', ctypes.c_int),
+        ('win_gravity', ctypes.c_int), ('backing_store', ctypes.c_int),
+        ('backing_planes', ctypes.c_ulong), ('backing_pixel', ctypes.c_ulong),
+        ('save_under', ctypes.c_int), ('colormap', ctypes.c_ulong),
+        ('map_installed', ctypes.c_int), ('map_state', ctypes.c_int),
+        ('all_event_masks', ctypes.c_long), ('your_event_mask', ctypes.c_long),
+        ('do_not_propagate_mask', ctypes.c_long), ('override_redirect', ctypes.c_int),
+        ('screen', ctypes.c_void_p),
+    ]
+
+
+class X11WindowLocator(WindowLocator):
+    """Percorre a árvore de janelas do X (XQueryTree) comparando XFetchName."""
+
+    IS_VIEWABLE = 2
+
+    def __init__(self, display=None):
+        path = ctypes.util.find_library('X11')
+        if path is None:
+            raise OSError("libX11 não encontrada")
+        x11 = ctypes.cdll.LoadLibrary(path)
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        x11.XQueryTree.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.POINTER(ctypes.c_ulong)), ctypes.POINTER(ctypes.c_uint),
+        ]
+        x11.XFetchName.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_char_p)]
+        x11.XGetWindowAttributes.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XWindowAttributes)]
+        x11.XTranslateCoordinates.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_int, ctypes.c_int,
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_ulong),
+        ]
+        x11.XFree.argtypes = [ctypes.c_void_p]
+        self.x11 = x11
+        self.display = x11.XOpenDisplay(display.encode() if display else None)
+        if not self.display:
+            raise OSError("Não foi possível abrir o display X11")
+        self.root = x11.XDefaultRootWindow(self.display)
+
+    def find(self, title):
+        window = self._search(self.root, title.lower())
+        if window is None:
+            return None
+        attrs = _XWindowAttributes()
+        self.x11.XGetWindowAttributes(self.display, window, ctypes.byref(attrs))
+        x, y, child = ctypes.c_int(), ctypes.c_int(), ctypes.c_ulong()
+        self.x11.XTranslateCoordinates(
+            self.display, window, self.root, 0, 0, ctypes.byref(x), ctypes.byref(y), ctypes.byref(child)
+        )
+        return WindowRect(x.value, y.value, attrs.width, attrs.height)
+
+    def _search(self, window, needle):
+        name = ctypes.c_char_p()
+        if self.x11.XFetchName(self.display, window, ctypes.byref(name)) and name.value:
+            matched = needle in name.value.decode('utf-8', 'replace').lower()
+            self.x11.XFree(name)
+            if matched and self._viewable(window):
+                return window
+
+        root, parent = ctypes.c_ulong(), ctypes.c_ulong()
+        children = ctypes.POINTER(ctypes.c_ulong)()
+        count = ctypes.c_uint()
+        if not self.x11.XQueryTree(self.display, window, ctypes.byref(root), ctypes.byref(parent),
+                                   ctypes.byref(children), ctypes.byref(count)):
+            return None
+        try:
+            for i in range(count.value):
+                found = self._search(children[i], needle)
+                if found is not None:
+                    return found
+        finally:
+            if children:
+                self.x11.XFree(children)
+        return None
+
+    def _viewable(self, window):
+        attrs = _XWindowAttributes()
+        self.x11.XGetWindowAttributes(self.display, window, ctypes.byref(attrs))
+        return attrs.map_state == self.IS_VIEWABLE
+
+
+def default_locator():
+    """Localizador da plataforma atual, ou None se não houver suporte."""
+    try:
+        if sys.platform.startswith('win'):
+            return Win32WindowLocator()
+        if sys.platform.startswith('linux'):
+            return X11WindowLocator()
+    except Exception as e:
+        logger.warning(f"Localizador de janelas indisponível: {e}")
+        return None
+    logger.warning(f"Sem localizador de janelas para a plataforma {sys.platform}")
+    return None
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+
+from src.action.recording_input import RecordingInput
+from src.core.async_controller import AsyncBotController
+from src.perception.game_state_detector import GameState, PerceptionSnapshot
+
+
+class DummyCapture:
+    def capture(self):
+        return np.zeros((48, 64, 3), np.uint8)
+
+
+class SlowDetector:
+    """Detector que sempre vê batalha; a leitura da HUD demora ``ocr_delay``."""
+
+    def __init__(self, ocr_delay):
+        self.ocr_delay = ocr_delay
+
+    def battle_hint(self, image):
+        return True
+
+    def hud_signature(self, image):
+        return ()
+
+    def perceive(self, image, profile, snapshot=None, frame_id=None):
+        snapshot = snapshot or PerceptionSnapshot(image, frame_id)
+        snapshot.detectors.update(profile)
+        snapshot.shiny = False
+        snapshot.in_battle = True
+        return snapshot
+
+    def get_battle_info(self, image):
+        time.sleep(self.ocr_delay)
+        return {"enemy_name": "Rattata", "player_name": "Pikachu", "enemy_level": 3}
+
+
+class DummyStrategy:
+    def should_flee(self, my, enemy):
+        return False
+
+    def choose_switch_target(self, enemy, my=None, level=None):
+        return None
+
+    def get_best_move(self, my, enemy, level=None):
+        return 2
+
+
+class DummyTeam:
+    def save_moves(self, name, moves):
+        self.saved = (name, moves)
+
+    def close(self):
+        pass
+
+
+class DummyOCR:
+    def preprocess_dynamic_background_text(self, img):
+        return img
+
+    def extract_text_optimized(self, img, **kwargs):
+        return "Tackle"
+
+    def clean_move_name(self, text):
+        return text
+
+
+def _controller(ocr_delay, fight_delay):
+    cfg = {
+        "battle": {"fight_to_moves_delay": fight_delay, "action_cooldown": 0},
+        "rois": {"moves": {f"slot_{i}": [0, 0, 10, 10] for i in range(1, 5)}},
+    }
+    components = {
+        "screen": DummyCapture(),
+        "detector": SlowDetector(ocr_delay),
+        "input": RecordingInput(cfg),
+        "strategy": DummyStrategy(),
+        "ocr": DummyOCR(),
+        "team_mgr": DummyTeam(),
+    }
+    return AsyncBotController(cfg, components)
+
+
+def test_hud_ocr_overlaps_fight_animation():
+    bot = _controller(ocr_delay=0.3, fight_delay=0.3)
+
+    started = time.monotonic()
+    state = asyncio.run(bot.tick_async())
+    elapsed = time.monotonic() - started
+
+    assert state == GameState.IN_BATTLE
+    # Sequencial levaria >= 0.6 s (OCR + animação)
+    assert elapsed < 0.5
+    names = [a[1] for a in bot.input.actions]
+    assert names == ["click_fight_button", "click_in_slot"]
+    assert bot.input.actions[-1][2] == (2,)
+    assert bot.team_mgr.saved == ("Pikachu", ["Tackle"] * 4)
+    assert bot.encounter["species"] == "rattata"
+    # Um frame do tick e outro com o menu de golpes
+    assert bot.frame_id == 2
+
+
+def test_sync_run_wrapper_stops_cleanly():
+    bot = _controller(ocr_delay=0, fight_delay=0)
+    original = bot.tick_async
+
+    async def once():
+        state = await original()
+        bot.stop()
+        return state
+
+    bot.tick_async = once
+    bot.run()
+
+    assert not bot.running
+    assert [a[1] for a in bot.input.actions] == ["click_fight_button", "click_in_slot"]
+
+
+class SwitchStrategy(DummyStrategy):
+    def choose_switch_target(self, enemy, my=None, level=None):
+        return 1
+
+
+class PartyOCR(DummyOCR):
+    def __init__(self):
+        self.threads = []
+
+    def ocr_party_list(self, img):
+        self.threads.append(threading.current_thread().name)
+        return ["Pikachu", "Geodude"]
+
+
+class PartyTeam(DummyTeam):
+    def update_team_from_hud(self, names):
+        self.team = names
+
+
+class ThreadInput(RecordingInput):
+    """Registra em que thread cada clique aconteceu."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.click_threads = []
+
+    def click(self, x, y):
+        self.click_threads.append(threading.current_thread().name)
+        super().click(x, y)
+
+
+def test_switch_reads_menu_in_perception_and_clicks_on_input_thread():
+    cfg = {
+        "battle": {"fight_to_moves_delay": 0, "action_cooldown": 0},
+        "rois": {"moves": {f"slot_{i}": [0, 0, 10, 10] for i in range(1, 5)},
+                 "switch_menu": {"container": [0, 0, 40, 40], "slot_height": 10}},
+    }
+    ocr = PartyOCR()
+    bot = AsyncBotController(cfg, {
+        "screen": DummyCapture(), "detector": SlowDetector(0), "input": ThreadInput(cfg),
+        "strategy": SwitchStrategy(), "ocr": ocr, "team_mgr": PartyTeam(),
+    })
+    asyncio.run(bot.tick_async())
+
+    assert bot.team_mgr.team == ["Pikachu", "Geodude"]
+    assert ocr.threads[0].startswith("perception")
+    assert len(bot.input.click_threads) == 1 and bot.input.click_threads[0].startswith("input")
+    assert bot.input.actions[-1][1:] == ("click", (20, 15))
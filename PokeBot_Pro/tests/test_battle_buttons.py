@@ -0,0 +1,80 @@
+import numpy as np
+
+from src.action.input_backends import RecordingBackend
+from src.action.input_simulator import InputSimulator
+from src.core.config_reload import load_config
+from src.perception.game_state_detector import GameStateDetector
+from src.perception.rois import ROI, RoiSet
+from src.perception.template_registry import TemplateRegistry
+
+# Canto superior esquerdo de cada botão na tela de batalha em 1920x1080
+BUTTONS = {"fight": (873, 920), "bag": (873, 987), "pokemon": (702, 988), "run": (1047, 989)}
+
+
+def _shipped_config():
+    cfg = load_config("PokeBot_Pro/config/settings.yaml")
+    cfg["assets"]["templates_dir"] = "PokeBot_Pro/assets/templates/"
+    return cfg
+
+
+def _battle_frame(templates):
+    frame = np.random.default_rng(3).integers(0, 60, (1080, 1920, 3), dtype=np.uint8)
+    for key, (x, y) in BUTTONS.items():
+        tpl = templates.get(key)
+        frame[y:y + tpl.shape[0], x:x + tpl.shape[1]] = tpl
+    return frame
+
+
+class StaticScreen:
+    origin = (0, 0)
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def capture(self):
+        return self.frame
+
+
+def test_shipped_rois_fit_every_battle_button():
+    cfg = _shipped_config()
+    rois = RoiSet.of(cfg)
+    templates = TemplateRegistry(cfg)
+    battle_area = rois.get("detection.battle_area")
+    for key in BUTTONS:
+        tpl = templates.get(key)
+        area = rois.button_area(key)
+        assert area.width >= tpl.shape[1] and area.height >= tpl.shape[0]
+        assert ROI.union([battle_area, area]) == battle_area
+
+
+def test_clicks_every_battle_button_with_shipped_config():
+    cfg = _shipped_config()
+    backend = RecordingBackend()
+    sim = InputSimulator(cfg, screen=StaticScreen(_battle_frame(TemplateRegistry(cfg))), backend=backend)
+
+    for click, key in ((sim.click_fight_button, "fight"), (sim.click_pokemon_button, "pokemon"),
+                       (sim.click_run_button, "run")):
+        before = len(backend.actions)
+        click()
+        clicks = [a for a in backend.actions[before:] if a[1] == "click"]
+        assert len(clicks) == 1, key
+        x, y = clicks[0][2]
+        tpl = sim.templates.get(key)
+        bx, by = BUTTONS[key]
+        assert bx <= x < bx + tpl.shape[1] and by <= y < by + tpl.shape[0]
+
+
+def test_battle_hint_sees_any_button_with_shipped_config():
+    cfg = _shipped_config()
+    templates = TemplateRegistry(cfg)
+    detector = GameStateDetector(None, None, cfg, templates=templates)
+    frame = _battle_frame(templates)
+    assert detector.battle_hint(frame)
+
+    # Só RUN visível (ex.: FIGHT ainda animando): a dica continua valendo
+    only_run = frame.copy()
+    for key in ("fight", "bag", "pokemon"):
+        roi = detector.rois.button_area(key)
+        only_run[roi.rows, roi.cols] = 0
+    assert detector.battle_hint(only_run)
+    assert not detector.battle_hint(np.zeros_like(frame))
@@ -0,0 +1,100 @@
+import time
+
+from src.action.recording_input import RecordingInput
+from src.core.bot_controller import BotController
+from src.decision.battle_search import BattleSearch
+from src.decision.battle_strategy import BattleStrategy
+from src.knowledge.pokemon_database import PokemonDatabase
+
+
+class DummyTeam:
+    def __init__(self, moves, team=None):
+        self.known_moves = moves
+        self.current_team = team or []
+
+    def get_moves(self, name):
+        return self.known_moves.get((name or "").lower(), [])
+
+
+class DummyDb:
+    POWERS = {"thunderbolt": 90, "tackle": 40, "growl": 0, "water gun": 40, "vine whip": 45}
+    TYPES = {"thunderbolt": 13, "tackle": 1, "growl": 1, "water gun": 11, "vine whip": 12}
+
+    def get_pokemon_types(self, name):
+        return {"gyarados": ["water", "flying"], "pikachu": ["electric"]}.get((name or "").lower(), ["normal"])
+
+    def get_move_data(self, move_name):
+        return {"type_id": self.TYPES.get(move_name.lower(), 1), "power": 0, "category_id": 2}
+
+    def get_move_power(self, move_name):
+        return self.POWERS.get(move_name.lower(), 0)
+
+    def get_type_multiplier(self, type_id, enemy_types):
+        if type_id == 13 and "water" in enemy_types:
+            return 2.0
+        return 1.0
+
+    def get_likely_moves(self, name, level=None, max_moves=4):
+        return ["Tackle", "Water Gun"]
+
+
+def test_search_prefers_super_effective_move():
+    team = DummyTeam({"pikachu": ["Growl", "Tackle", "Thunderbolt"]})
+    search = BattleSearch(DummyDb(), team, {"battle": {"search_time_budget_ms": 200}})
+
+    slot = search.choose_move("pikachu", "Gyarados", enemy_level=20)
+
+    assert slot == 2
+    assert search.last_depth >= 1
+
+
+def test_search_respects_time_budget_and_keeps_cache_between_turns():
+    team = DummyTeam({"pikachu": ["Tackle", "Thunderbolt"]})
+    search = BattleSearch(DummyDb(), team, {"battle": {"search_time_budget_ms": 5, "search_max_depth": 50}})
+
+    start = time.perf_counter()
+    search.choose_move("pikachu", "Gyarados")
+    assert time.perf_counter() - start < 0.5
+
+    cached = len(search._tt)
+    search.choose_move("pikachu", "Gyarados")
+    assert len(search._tt) >= cached
+
+    # Nova batalha descarta a tabela de transposição
+    search.choose_move("pikachu", "Rattata")
+    assert search._battle_key[1] == "rattata"
+
+
+def test_strategy_uses_search_for_switch():
+    team = DummyTeam(
+        {"rattata": ["Tackle"], "pikachu": ["Thunderbolt", "Tackle"]},
+        team=["rattata", "pikachu"],
+    )
+    db = DummyDb()
+    strat = BattleStrategy(db, team, search=BattleSearch(db, team, {"battle": {"search_time_budget_ms": 100}}))
+
+    assert strat.choose_switch_target("Gyarados", "rattata") == 1
+    assert strat.choose_switch_target("Gyarados", "pikachu") is None
+
+
+def test_likely_moves_follow_level_up_learnset():
+    db = PokemonDatabase("PokeBot_Pro/data")
+
+    assert db.get_likely_moves("pidgey", 10) == ["Tackle", "Sand Attack", "Gust"]
+    assert db.get_move_power("Gust") == 40
+
+
+def test_new_encounter_resets_search_belief():
+    team = DummyTeam({"pikachu": ["Tackle", "Thunderbolt"]})
+    search = BattleSearch(DummyDb(), team, {"battle": {"search_time_budget_ms": 20}})
+    strategy = BattleStrategy(DummyDb(), team, search=search)
+    bot = BotController({}, {"screen": None, "detector": None, "input": RecordingInput(), "strategy": strategy,
+                             "ocr": None, "team_mgr": team})
+
+    for _ in range(3):
+        search.choose_move("pikachu", "Gyarados", enemy_level=20)
+    assert search._belief[1] < search.hp_steps  # HP do inimigo estimado em queda
+
+    # Mesma espécie, nível e golpes no próximo encontro: começa do HP cheio
+    bot._begin_encounter()
+    assert search._belief is None and not search._tt
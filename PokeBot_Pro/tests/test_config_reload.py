@@ -0,0 +1,133 @@
+import copy
+import os
+
+import numpy as np
+import yaml
+
+from src.action.recording_input import RecordingInput
+from src.core.bot_controller import BotController
+from src.core.config_reload import ConfigWatcher, affected_parts, diff_config
+from src.perception.game_state_detector import GameState, PerceptionSnapshot
+from src.perception.layout import Layout, LayoutTransform
+from src.perception.matching import TemplateMatcher
+from src.perception.template_registry import TemplateRegistry
+
+
+class DummyCapture:
+    def capture(self):
+        return np.zeros((48, 64, 3), np.uint8)
+
+
+class LayoutDetector:
+    def __init__(self):
+        self.applied = []
+
+    def battle_hint(self, image):
+        return False
+
+    def perceive(self, image, profile, snapshot=None, frame_id=None):
+        snapshot = snapshot or PerceptionSnapshot(image, frame_id)
+        snapshot.detectors.update(profile)
+        snapshot.shiny = False
+        snapshot.in_battle = False
+        return snapshot
+
+    def apply_layout(self, config, matcher):
+        self.applied.append(config)
+
+
+class DummyTeam:
+    def close(self):
+        pass
+
+
+def _write(path, cfg):
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(cfg, f)
+
+
+def test_diff_maps_changes_to_pipeline_parts():
+    old = {"detection": {"shiny_threshold": 0.85}, "screen": {"fps": 10, "window_title": ""}, "bot": {"debug_mode": True}}
+    new = {"detection": {"shiny_threshold": 0.9}, "screen": {"fps": 20, "window_title": "PokeMMO"}, "bot": {"debug_mode": True}}
+
+    changed = diff_config(old, new)
+    assert changed == {"detection.shiny_threshold", "screen.fps", "screen.window_title"}
+    parts, restart = affected_parts(changed)
+    assert parts == {"rois", "scheduler"}
+    assert restart == ["screen.window_title"]
+
+    # Fila e armazenamento do DebugSink só mudam reiniciando; os limites recarregam
+    parts, restart = affected_parts({"debug.sink.dir", "debug.sink.queue_size", "debug.sink.max_mb"})
+    assert parts == {"controller"}
+    assert restart == ["debug.sink.dir", "debug.sink.queue_size"]
+
+
+def test_reload_swaps_config_between_ticks(tmp_path):
+    path = tmp_path / "settings.yaml"
+    cfg = {"detection": {"talk_threshold": 0.95}, "rois": {"moves": {"slot_1": [0, 0, 10, 10]}},
+           "perception": {"profiles": {"exploring": ["shiny", "battle", "talk", "goto"]}}}
+    _write(path, cfg)
+    watcher = ConfigWatcher(str(path), yaml.safe_load(path.read_text()))
+    detector = LayoutDetector()
+    bot = BotController(watcher.config, {
+        "screen": DummyCapture(), "detector": detector, "input": RecordingInput(watcher.config),
+        "strategy": None, "ocr": None, "team_mgr": DummyTeam(), "config_watcher": watcher,
+        "matcher": object(),
+    })
+
+    # ROI ambíguo: recusado, config atual continua
+    _write(path, {**cfg, "rois": {"moves": {"slot_1": [10, 50, 40, 20]}}})
+    os.utime(path, ns=(1, 1))
+    assert not watcher.check()
+
+    new = {**cfg, "detection": {"talk_threshold": 0.8},
+           "perception": {"profiles": {"exploring": ["battle", "goto"]}}}
+    _write(path, new)
+    os.utime(path, ns=(2, 2))
+    assert watcher.check()
+    assert bot.cfg["detection"]["talk_threshold"] == 0.95  # só troca no próximo tick
+
+    bot.tick()
+    assert bot.cfg["detection"]["talk_threshold"] == 0.8
+    assert detector.applied[-1] is bot.cfg
+    assert bot.input.cfg is bot.cfg
+    assert bot.machine.states[GameState.EXPLORING].profile == ("battle", "goto")
+    assert watcher.reloads == 1
+
+
+def test_reload_keeps_layout_and_shared_templates_unless_affected():
+    cfg = {"assets": {"templates_dir": "PokeBot_Pro/assets/templates/"},
+           "layout": {"enabled": True, "anchors": {"fight": [873, 920]}},
+           "rois": {"enemy_name": [20, 0, 60, 10]}, "battle": {"action_cooldown": 1.0}}
+    registry = TemplateRegistry(cfg)
+    detector = LayoutDetector()
+    bot = BotController(cfg, {
+        "screen": DummyCapture(), "detector": detector, "input": RecordingInput(cfg),
+        "strategy": None, "ocr": None, "team_mgr": DummyTeam(),
+        "templates": registry, "matcher": TemplateMatcher(registry, cfg),
+    })
+    layout = bot.layout = Layout(cfg, registry, bot.matcher)
+    layout.transform = LayoutTransform(0.5, (10, 0))
+
+    # Só um valor de batalha: mesmo Layout (escala e matchers em cache), config nova já transformada
+    new = copy.deepcopy(cfg)
+    new["battle"]["action_cooldown"] = 2.0
+    assert bot.reload_config(new, diff_config(cfg, new))
+    assert bot.layout is layout
+    assert bot.cfg["battle"]["action_cooldown"] == 2.0
+    assert bot.cfg["rois"]["enemy_name"] == [20, 0, 40, 5]
+    assert detector.applied[-1] is bot.cfg
+
+    # ROIs mudaram: Layout novo, redetectado no próximo tick
+    rois = copy.deepcopy(new)
+    rois["rois"]["enemy_name"] = [0, 0, 40, 10]
+    assert bot.reload_config(rois, diff_config(new, rois))
+    assert bot.layout is not layout
+
+    # Templates: registro novo só desta sessão; o compartilhado não muda
+    assets = copy.deepcopy(rois)
+    assets["assets"]["shiny_image"] = "fight.png"
+    assert bot.reload_config(assets, diff_config(rois, assets))
+    assert bot.templates is not registry
+    assert registry.path_for("shiny").endswith("shiny.png")
+    assert bot.templates.path_for("shiny").endswith("fight.png")
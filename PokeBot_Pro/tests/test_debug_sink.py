@@ -0,0 +1,70 @@
+import zipfile
+
+import numpy as np
+
+from src.core.debug_sink import DebugSink
+from src.perception.rois import ROI
+
+
+def _sink(tmp_path, **sink_cfg):
+    return DebugSink({"debug": {"sink": {"dir": str(tmp_path), **sink_cfg}}})
+
+
+def test_rate_limit_and_rotating_store(tmp_path):
+    sink = _sink(tmp_path, rates={"moves": 60.0, "states": 0.0}, max_mb=0.001)
+    noise = np.random.default_rng(0).integers(0, 255, (24, 24, 3), dtype=np.uint8)
+    frame = noise.copy()
+
+    assert sink.save_many("moves", [("pikachu_slot1", frame), ("pikachu_slot2", frame)])
+    assert not sink.save("moves", "pikachu_slot3", frame)  # mesmo turno: limitado
+    frame[:] = 0  # buffer reutilizado pela captura: o sink já tem sua cópia
+    for i in range(5):
+        sink.save("states", f"s{i}", noise, annotations=[ROI(2, 2, 10, 10, "moves.slot_1")])
+    sink.close()
+
+    assert sink.limited == 1
+    assert sink.written == 7
+    files = list(tmp_path.rglob("*.png"))
+    assert 0 < len(files) < 7  # ~1 KB de limite: os mais antigos foram apagados
+
+
+def test_rotation_only_touches_own_artifacts(tmp_path):
+    # Diretório compartilhado: recortes de calibração e dumps do gravador de voo não são do sink
+    calibration = tmp_path / "moves" / "charmeleon_slot1.png"
+    incident = tmp_path / "incidents" / "shiny" / "0000_f1.png"
+    for path in (calibration, incident):
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"x" * 4096)
+    sink = _sink(tmp_path, rates={"moves": 0.0}, max_mb=0.001)
+    assert sink._bytes == 0
+    noise = np.random.default_rng(1).integers(0, 255, (24, 24, 3), dtype=np.uint8)
+    for i in range(3):
+        sink.save("moves", f"pikachu_slot{i}", noise)
+    sink.close()
+
+    assert calibration.exists() and incident.exists()
+    assert len(list((tmp_path / "moves").glob("*_pikachu_slot*.png"))) < 3
+
+
+def test_compressed_batches_and_limited_log(tmp_path):
+    sink = _sink(tmp_path, compress=True, batch_size=3, rates={"states": 0.0}, log_interval=60.0)
+    for i in range(4):
+        sink.save("states", f"frame{i}", np.full((8, 8, 3), i, np.uint8))
+    calls = []
+    for _ in range(3):
+        sink.log("state", lambda: calls.append(1) or "estado")
+    sink.close()
+
+    batches = sorted((tmp_path / "batches").glob("*.zip"))
+    names = [n for b in batches for n in zipfile.ZipFile(b).namelist()]
+    assert len(batches) == 2 and len(names) == 4
+    assert all(n.startswith("states/") for n in names)
+    assert len(calls) == 1  # mensagem só formatada quando o log sai
+
+
+def test_reconfigure_keeps_queue_and_store(tmp_path):
+    sink = _sink(tmp_path, queue_size=4, max_mb=1)
+    sink.configure({"debug": {"sink": {"dir": str(tmp_path / "other"), "queue_size": 99, "max_mb": 2}}})
+    assert sink.root == tmp_path and sink.queue_size == sink._queue.maxsize == 4
+    assert sink.max_bytes == 2 * 1024 * 1024
+    sink.close()
@@ -0,0 +1,48 @@
+import json
+
+import numpy as np
+
+from src.action.recording_input import RecordingInput
+from src.core.flight_recorder import FlightRecorder
+from src.perception.game_state_detector import GameState, PerceptionSnapshot
+
+
+def _recorder(tmp_path, **cfg):
+    base = {"seconds": 1, "fps": 1000, "scale": 0.5, "hotkey": "", "dir": str(tmp_path), "min_dump_interval": 0}
+    return FlightRecorder({"flight_recorder": {**base, **cfg}})
+
+
+def test_ring_keeps_last_frames_in_place_and_dumps(tmp_path):
+    recorder = _recorder(tmp_path, max_mb=4 * 32 * 48 * 3 / (1024 * 1024))  # cabe 4 frames reduzidos
+    for i in range(6):
+        recorder._last_frame = 0.0  # ignora o limite de fps
+        recorder.record_frame(np.full((64, 96, 3), i * 10, np.uint8), frame_id=i)
+        if i == 0:
+            ring = recorder._frames
+    assert recorder._frames is ring and ring.shape == (4, 32, 48, 3)  # sem realocar
+
+    snapshot = PerceptionSnapshot(None, frame_id=5)
+    snapshot.in_battle = True
+    recorder.note_perception(snapshot)
+    inp = recorder.watch_input(RecordingInput({}))
+    inp.press("space")
+    recorder.dump("hotkey").join(5)
+
+    folder = next(tmp_path.iterdir())
+    assert folder.name.endswith("_hotkey")
+    assert sorted(p.name for p in folder.glob("*.png")) == ["0000_f2.png", "0001_f3.png", "0002_f4.png", "0003_f5.png"]
+    events = [json.loads(line) for line in (folder / "events.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert events[0]["state"] == "IN_BATTLE"
+    assert events[1] == {**events[1], "kind": "action", "action": "press", "args": ["space"]}
+    assert inp.actions[-1][1] == "press"
+
+
+def test_stuck_detector_fires_once_per_episode(tmp_path):
+    recorder = _recorder(tmp_path, stuck_seconds=0.0)
+    assert not recorder.observe(GameState.EXPLORING, 0.0)   # começa a contar
+    assert recorder.observe(GameState.EXPLORING, 0.1)
+    assert not recorder.observe(GameState.EXPLORING, 0.1)   # mesmo episódio
+    assert not recorder.observe(GameState.EXPLORING, 50.0)  # tela mudou: rearma
+    assert recorder.observe(GameState.EXPLORING, 0.0)
+    recorder.stop()
+    assert recorder.dumps == 2
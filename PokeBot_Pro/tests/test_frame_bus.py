@@ -0,0 +1,81 @@
+import threading
+
+import cv2
+import numpy as np
+
+from src.perception.frame_bus import FrameBus
+from src.perception.game_state_detector import GameStateDetector, GameState
+from src.perception.perception_workers import ProcessPerception
+
+CFG = {
+    "assets": {"templates_dir": "PokeBot_Pro/assets/templates/"},
+    "detection": {"shiny_threshold": 0.5},
+    "rois": {},
+    "ocr": {"tesseract_path": "tesseract"},
+    "perception": {"processes": {"groups": [["shiny"]], "timeout": 30.0}},
+}
+
+
+def test_frame_bus_shares_frames_and_detects_overwrites():
+    bus = FrameBus((4, 6, 3), slots=2)
+    reader = FrameBus.attach(bus.descriptor())
+    try:
+        frame = np.full((4, 6, 3), 7, dtype=np.uint8)
+        seq, slot = bus.publish(frame)
+        assert reader.valid(seq, slot)
+        assert (reader.view(slot) == 7).all()
+
+        # O anel dá a volta: o leitor percebe que o slot foi reescrito
+        bus.publish(frame)
+        bus.publish(np.zeros_like(frame))
+        assert not reader.valid(seq, slot)
+    finally:
+        reader.close()
+        bus.close()
+
+
+def test_process_perception_merges_worker_and_local_results():
+    shiny = cv2.imread(CFG["assets"]["templates_dir"] + "shiny.png")
+    frame = np.zeros((shiny.shape[0] + 40, shiny.shape[1] + 40, 3), dtype=np.uint8)
+    frame[20:20 + shiny.shape[0], 20:20 + shiny.shape[1]] = shiny
+
+    detector = GameStateDetector(None, None, CFG)
+    perceiver = ProcessPerception(CFG, detector)
+    try:
+        snapshot = perceiver.perceive(frame, ("shiny", "battle"), frame_id=1)
+    finally:
+        perceiver.close()
+
+    # 'shiny' veio do processo worker; 'battle' não tem worker e rodou localmente
+    assert snapshot.detectors == {"shiny", "battle"}
+    assert snapshot.shiny is True
+    assert snapshot.in_battle is False
+    assert snapshot.state == GameState.SHINY_FOUND
+    assert perceiver.fallbacks == 1
+
+
+class SlowOCRWorker:
+    """Fila de tarefas de um worker de battle_info cujo OCR leva ``delay`` s."""
+
+    def __init__(self, results, delay):
+        self.results = results
+        self.delay = delay
+
+    def put(self, task):
+        info = {"enemy_name": "Rattata", "player_name": "Pikachu", "enemy_level": 3}
+        threading.Timer(self.delay, self.results.put, args=((task[1], {"battle_info": info}),)).start()
+
+
+def test_battle_info_waits_its_own_timeout_instead_of_redoing_ocr():
+    cfg = {**CFG, "perception": {"processes": {"groups": [], "timeout": 0.1, "battle_info_timeout": 5.0}}}
+    perceiver = ProcessPerception(cfg, GameStateDetector(None, None, cfg))
+    perceiver.workers = [({"battle_info"}, SlowOCRWorker(perceiver.results, 0.5), None)]
+    try:
+        info = perceiver.get_battle_info(np.zeros((40, 60, 3), np.uint8), frame_id=1)
+    finally:
+        perceiver.workers = []
+        perceiver.close()
+
+    # Bem acima do prazo dos templates, mas o OCR do worker foi aproveitado
+    assert info["enemy_name"] == "Rattata"
+    assert perceiver.fallbacks == 0
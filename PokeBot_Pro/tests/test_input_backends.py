@@ -0,0 +1,61 @@
+import numpy as np
+
+from src.action.input_backends import RecordingBackend, build_backend
+from src.action.input_simulator import InputSimulator
+from src.action.recording_input import RecordingInput
+
+
+class WindowScreen:
+    origin = (100, 50)
+
+    def capture(self):
+        return np.zeros((20, 20, 3), np.uint8)
+
+
+def test_simulator_dispatches_through_backend_with_origin_and_latency():
+    cfg = {
+        "input": {"mouse_move_duration": 0.25},
+        "rois": {"moves": {"slot_1": [10, 10, 11, 11]}},
+    }
+    backend = RecordingBackend()
+    sim = InputSimulator(cfg, screen=WindowScreen(), templates={}, backend=backend)
+
+    sim.click_in_slot(0)
+    sim.press("space")
+    sim.press_keys(["up", "enter"])
+
+    kinds = [a[1] for a in backend.actions]
+    assert kinds == ["move", "click", "press", "press_keys"]
+    # Coordenadas do frame + canto da janela
+    x, y = backend.actions[1][2]
+    assert 110 <= x <= 111 and 60 <= y <= 61
+    report = backend.latency_report()
+    assert report["click"]["count"] == 1
+    assert report["press"]["mean_ms"] < 5.0
+
+
+def test_recording_input_and_config_choose_recording_backend():
+    recorder = RecordingInput()
+    recorder.click_fight_button()
+    assert isinstance(recorder.backend, RecordingBackend)
+    assert [a[1] for a in recorder.actions] == ["click_fight_button"]
+
+    assert isinstance(build_backend({"input": {"backend": "recording"}}), RecordingBackend)
+
+
+def test_template_clicks_use_own_capture_when_given():
+    class SharedScreen(WindowScreen):
+        def capture(self):
+            raise AssertionError("captura da sessão usada fora da thread do controller")
+
+    created = []
+
+    def factory():
+        created.append(WindowScreen())
+        return created[-1]
+
+    sim = InputSimulator({}, screen=SharedScreen(), templates={}, backend=RecordingBackend(), capture_factory=factory)
+    assert sim._grab_frame().shape == (20, 20, 3)
+    sim._grab_frame()
+    assert len(created) == 1  # criada uma vez, na thread que a usa
+    assert sim.origin == (100, 50)
@@ -0,0 +1,106 @@
+import time
+
+from src.action.input_queue import QueuedInput
+from src.action.recording_input import RecordingInput
+from src.core.bot_controller import BotController
+
+
+class SlowInput(RecordingInput):
+    """Clique leva ``delay`` s (animação do mouse)."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def click(self, x, y):
+        time.sleep(self.delay)
+        super().click(x, y)
+
+
+def test_enqueue_returns_immediately_and_preserves_order():
+    target = SlowInput(0.2)
+    queued = QueuedInput(target)
+
+    started = time.monotonic()
+    queued.click(10, 20)
+    queued.click_in_slot(2)
+    assert time.monotonic() - started < 0.05
+
+    assert queued.drain(timeout=2.0)
+    assert [a[1] for a in target.actions] == ["click", "click_in_slot"]
+    queued.close()
+
+
+def test_repeated_presses_are_coalesced():
+    cfg = {"input": {"queue": {"coalesce_window": 10.0}}}
+    target = RecordingInput()
+    queued = QueuedInput(target, cfg)
+
+    for _ in range(5):
+        queued.press("space")
+        queued.drain(timeout=1.0)
+    queued.press("enter")
+    queued.drain(timeout=1.0)
+
+    assert [a[2] for a in target.actions] == [("space",), ("enter",)]
+    assert queued.coalesced == 4
+    queued.close()
+
+
+def test_action_expires_when_state_changes():
+    target = SlowInput(0.2)
+    queued = QueuedInput(target)
+    state = {"current": "exploring"}
+    queued.bind_state(lambda: state["current"])
+
+    queued.click(1, 1)        # ocupa a thread de input
+    time.sleep(0.05)
+    queued.press("space")     # pedido na exploração...
+    state["current"] = "in_battle"  # ...mas a batalha começou antes de ele sair
+    queued.drain(timeout=2.0)
+
+    assert [a[1] for a in target.actions] == ["click"]
+    assert queued.expired == 1
+    queued.close()
+
+
+class MissingButtonInput(RecordingInput):
+    """RUN não encontrado na tela (template abaixo do threshold)."""
+
+    def click_run_button(self):
+        super().click_run_button()
+        return False
+
+
+def _battle_bot(input_sim):
+    bot = BotController({}, {"screen": None, "detector": None, "input": input_sim, "strategy": None,
+                             "ocr": None, "team_mgr": None})
+    bot._begin_encounter()
+    return bot
+
+
+def test_battle_outcomes_follow_executed_actions():
+    # Ação que expira na fila: nem fuga nem turno registrados
+    target = SlowInput(0.3)
+    queued = QueuedInput(target, {"input": {"queue": {"max_age": 0.1}}})
+    bot = _battle_bot(queued)
+    queued.click(1, 1)  # ocupa a thread de input além do max_age
+    bot._click_run()
+    bot._attack(0, "Rattata", [])
+    queued.drain(timeout=2.0)
+    assert bot.encounter["outcome"] is None and bot.encounter["turns"] == 0
+    queued.close()
+
+    # Executadas: registradas quando a thread de input termina
+    queued = QueuedInput(RecordingInput())
+    bot = _battle_bot(queued)
+    bot._attack(1, "Rattata", [])
+    bot._click_run()
+    queued.drain(timeout=2.0)
+    assert bot.encounter["outcome"] == "fled" and bot.encounter["turns"] == 1
+    queued.close()
+
+    # Simulador síncrono que não achou o botão
+    bot = _battle_bot(MissingButtonInput())
+    bot._click_run()
+    assert bot.encounter["outcome"] is None
@@ -0,0 +1,83 @@
+import time
+
+import cv2
+import numpy as np
+
+from src.perception.layout import Layout
+from src.perception.template_registry import TemplateRegistry
+
+CFG = {
+    "assets": {"templates_dir": "PokeBot_Pro/assets/templates/"},
+    "layout": {"base_resolution": [1920, 1080], "anchors": {"fight": [873, 920]}},
+    "rois": {"enemy_name": [27, 7, 95, 25], "moves": {"slot_1": [749, 869, 945, 889]},
+             "switch_menu": {"container": [1636, 1015, 1893, 1034], "slot_height": 30}},
+    "detection": {"battle_area": [685, 933, 1226, 1074]},
+}
+
+
+def _window(scale, offset, size):
+    """Frame ``size`` com o viewport do jogo (escala ``scale``) em ``offset``."""
+    registry = TemplateRegistry(CFG)
+    rng = np.random.default_rng(3)
+    frame = rng.integers(0, 60, (size[1], size[0], 3), dtype=np.uint8)
+    tpl = cv2.resize(registry.get("fight"), None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    x = int(round(873 * scale)) + offset[0]
+    y = int(round(920 * scale)) + offset[1]
+    frame[y:y + tpl.shape[0], x:x + tpl.shape[1]] = tpl
+    return registry, frame
+
+
+def test_base_resolution_is_identity_without_search():
+    registry = TemplateRegistry(CFG)
+    layout = Layout(CFG, registry)
+    transform = layout.update(np.zeros((1080, 1920, 3), np.uint8))
+
+    assert transform.identity
+    assert layout.config_for(transform)["rois"] == CFG["rois"]
+    assert layout.matcher_for(transform) is layout.base_matcher
+    # Mesma geometria: nada é redetectado
+    assert layout.update(np.zeros((1080, 1920, 3), np.uint8)) is None
+
+
+def test_detects_scale_and_viewport_of_smaller_window():
+    registry, frame = _window(2 / 3, (40, 30), (1360, 800))
+    layout = Layout(CFG, registry)
+    transform = layout.update(frame)
+
+    assert transform.confident
+    assert abs(transform.scale - 2 / 3) < 0.02
+    assert abs(transform.offset[0] - 40) <= 3 and abs(transform.offset[1] - 30) <= 3
+
+    cfg = layout.config_for(transform)
+    x1, y1, x2, y2 = cfg["detection"]["battle_area"]
+    assert abs(x1 - (685 * 2 / 3 + 40)) <= 4 and abs(y2 - (1074 * 2 / 3 + 30)) <= 4
+    assert cfg["rois"]["switch_menu"]["slot_height"] == 20
+    # Config e matcher ficam em cache para a escala
+    assert layout.config_for(transform) is cfg
+    matcher = layout.matcher_for(transform)
+    assert matcher is layout.matcher_for(transform)
+    score, loc, _ = matcher.match(frame, "fight")
+    assert score > 0.9
+    assert abs(loc[0] - (873 * 2 / 3 + 40)) <= 3
+
+
+def test_retries_without_anchor_run_off_the_tick():
+    registry, with_anchor = _window(2 / 3, (40, 30), (1360, 800))
+    cfg = dict(CFG, layout=dict(CFG["layout"], retry_interval=0.0))
+    layout = Layout(cfg, registry)
+    exploring = np.random.default_rng(4).integers(0, 60, with_anchor.shape, dtype=np.uint8)
+
+    assert not layout.update(exploring).confident  # sem âncora: viewport estimado
+    start = time.perf_counter()
+    for _ in range(5):
+        assert layout.update(exploring) is None
+    assert time.perf_counter() - start < 0.05  # novas buscas não bloqueiam o tick
+    layout._retry.join(5)
+
+    # FIGHT na tela (batalha): a busca em segundo plano acha a âncora e um tick seguinte a aplica
+    transform = None
+    deadline = time.monotonic() + 5
+    while transform is None and time.monotonic() < deadline:
+        transform = layout.update(with_anchor)
+        time.sleep(0.01)
+    assert transform.confident and abs(transform.scale - 2 / 3) < 0.02
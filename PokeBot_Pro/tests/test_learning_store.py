@@ -0,0 +1,42 @@
+import json
+
+from src.knowledge.learning_store import LearningStore
+from src.knowledge.team_manager import TeamManager
+
+
+def test_encounters_are_batched_and_queryable(tmp_path):
+    store = LearningStore(tmp_path / "pokebot.db", batch_size=3)
+    assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    store.log_encounter("Pidgey", level=4, outcome="ended", turns=3, ts=1.0)
+    store.log_encounter("Pidgey", level=6, outcome="fled", turns=1, ts=2.0)
+    count = store.conn.execute("SELECT COUNT(*) FROM encounters").fetchone()[0]
+    assert count == 0  # ainda no lote
+
+    store.log_encounter("Rattata", level=3, ts=3.0)
+    count = store.conn.execute("SELECT COUNT(*) FROM encounters").fetchone()[0]
+    assert count == 3
+
+    assert store.typical_level("pidgey") == 5
+    assert store.species_stats()[0][:2] == ("pidgey", 2)
+    store.close()
+
+
+def test_team_manager_sqlite_backend_migrates_json_and_keeps_team(tmp_path):
+    json_path = tmp_path / "known_moves.json"
+    json_path.write_text(json.dumps({"charmeleon": ["Ember", "Growl"]}), encoding="utf-8")
+    db_path = tmp_path / "pokebot.db"
+
+    store = LearningStore(db_path)
+    tm = TeamManager(json_path, learning_store=store)
+    tm.update_team_from_hud(["Charmeleon", "Pidgey"])
+    tm.save_moves("Pidgey", ["Tackle", "Gust"])
+    tm.close()
+    store.close()
+
+    store = LearningStore(db_path)
+    reloaded = TeamManager(tmp_path / "missing.json", learning_store=store)
+    assert reloaded.current_team == ["charmeleon", "pidgey"]
+    assert reloaded.get_moves("charmeleon") == ["Ember", "Growl"]
+    assert reloaded.get_moves("pidgey") == ["Tackle", "Gust"]
+    store.close()
@@ -0,0 +1,46 @@
+import numpy as np
+
+from src.perception.matching import TemplateMatcher
+from src.perception.template_registry import TemplateRegistry
+
+CFG = {"assets": {"templates_dir": "PokeBot_Pro/assets/templates/", "bag_image": "items.png"}}
+
+
+def _scene(templates, placements, shape=(540, 960, 3)):
+    rng = np.random.default_rng(7)
+    frame = rng.integers(0, 80, shape, dtype=np.uint8)
+    for key, (x, y) in placements.items():
+        tpl = templates.get(key)
+        frame[y:y + tpl.shape[0], x:x + tpl.shape[1]] = tpl
+    return frame
+
+
+def test_each_method_finds_templates_with_comparable_scores():
+    registry = TemplateRegistry(CFG)
+    matcher = TemplateMatcher(registry)
+    placements = {"fight": (300, 400), "shiny": (50, 60), "talk": (700, 100)}
+    frame = _scene(registry, placements)
+
+    assert matcher.method_for("fight") == "pyramid"
+    assert matcher.method_for("talk") == "gray"
+    for key, loc in placements.items():
+        score, found, size = matcher.match(frame, key)
+        assert found == loc
+        assert score > 0.95
+        assert size == registry.get(key).shape[1::-1]
+
+    # Template ausente da cena fica abaixo dos thresholds usuais
+    assert matcher.match(frame, "run")[0] < 0.6
+
+
+def test_roi_offsets_and_exact_method():
+    registry = TemplateRegistry(CFG)
+    matcher = TemplateMatcher(registry, {"matching": {"methods": {"talk": "exact"}}})
+    frame = _scene(registry, {"talk": (700, 100)})
+
+    score, loc, _ = matcher.match(frame, "talk", roi=[650, 80, 800, 200])
+    assert score == 1.0
+    assert loc == (700, 100)
+
+    # Área menor que o template: sem match, sem erro
+    assert matcher.match(frame, "fight", roi=[0, 0, 20, 20]) is None
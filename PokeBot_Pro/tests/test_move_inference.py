@@ -0,0 +1,112 @@
+import json
+
+import numpy as np
+
+from src.action.recording_input import RecordingInput
+from src.core.bot_controller import BotController
+from src.knowledge.move_inference import MoveInference
+from src.perception.speculative import region_signature
+
+LEARNSET = {
+    "chikorita": [(1, "Tackle", 40), (1, "Growl", 0), (6, "Razor Leaf", 55), (9, "Poison Powder", 0),
+                  (12, "Synthesis", 0), (17, "Reflect", 0)],
+    "rattata": [(1, "Tackle", 40), (1, "Tail Whip", 0), (4, "Quick Attack", 40), (7, "Focus Energy", 0),
+                (10, "Bite", 60)],
+}
+SLOT_MOVES = {40: "Tackle", 80: "Growl", 120: "Razor Leaf", 160: "Synthesis", 200: "Reflect"}
+
+
+class DummyDB:
+    def get_level_up_moves(self, name, level=None):
+        return [m for m in LEARNSET.get(name.lower(), []) if level is None or m[0] <= level]
+
+    def get_move_data(self, name):
+        return {"power": 40} if name in SLOT_MOVES.values() else {}
+
+
+class DummyTeam:
+    def __init__(self, known=None):
+        self.known = dict(known or {})
+
+    def get_moves(self, name):
+        return self.known.get(name, [])
+
+    def save_moves(self, name, moves):
+        self.known[name] = moves
+
+    def close(self):
+        pass
+
+
+class SlotOCR:
+    """Lê o nome do golpe pelo tom de cinza do botão."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def preprocess_dynamic_background_text(self, img):
+        return img
+
+    def extract_text_optimized(self, img, **kwargs):
+        self.calls += 1
+        return SLOT_MOVES.get(int(round(float(img.mean()))), "")
+
+    def clean_move_name(self, text):
+        return text
+
+
+def _inference(tmp_path, team=None, roster=None):
+    path = tmp_path / "personagens.json"
+    path.write_text(json.dumps(roster or {}), encoding="utf-8")
+    cfg = {"move_inference": {"personagens_path": str(path),
+                              "signatures_path": str(tmp_path / "move_signatures.json")}}
+    return MoveInference(DummyDB(), team or DummyTeam(), cfg)
+
+
+def _buttons(tones):
+    img = np.zeros((60, 60, 3), dtype=np.uint8)
+    for i, tone in enumerate(tones, start=1):
+        img[10 * i:10 * i + 8, 0:40] = tone
+    return img
+
+
+def test_prediction_prefers_history_then_roster_then_learnset(tmp_path):
+    roster = {"time_ativo": ["k_chikorita"],
+              "elenco": {"k_chikorita": {"nome_base": "Chikorita", "level": 14,
+                                         "movimentos_atuais": ["Tackle", "Growl", "Razor Leaf"]}}}
+    inference = _inference(tmp_path, roster=roster)
+    assert inference.predict("Chikorita") == ["Tackle", "Growl", "Razor Leaf", ""]
+    # Sem elenco: últimos 4 golpes do learnset até o nível
+    assert inference.predict("Rattata", level=8) == ["Tackle", "Tail Whip", "Quick Attack", "Focus Energy"]
+    inference.tm.save_moves("Chikorita", ["Tackle", "Growl", "Razor Leaf", "Synthesis"])
+    assert inference.predict("Chikorita")[3] == "Synthesis"
+    assert inference.likely_enemy_moves("Rattata", 10) == ["Tail Whip", "Quick Attack", "Focus Energy", "Bite"]
+    inference.close()
+
+
+def test_only_disagreeing_slots_go_to_ocr(tmp_path):
+    cfg = {"rois": {"moves": {f"slot_{i}": [0, 10 * i, 40, 10 * i + 8] for i in range(1, 5)}}}
+    ocr = SlotOCR()
+    team = DummyTeam()
+    inference = _inference(tmp_path, team=team)
+    bot = BotController(cfg, {"screen": None, "detector": None, "input": RecordingInput(cfg), "strategy": None,
+                              "ocr": ocr, "team_mgr": team, "move_inference": inference})
+
+    first = _buttons([40, 80, 120, 160])
+    assert bot._infer_moves(first, "Chikorita") == ["Tackle", "Growl", "Razor Leaf", "Synthesis"]
+    assert ocr.calls == 4  # sem assinaturas ainda: OCR ensina os 4 botões
+    team.save_moves("Chikorita", ["Tackle", "Growl", "Razor Leaf", "Synthesis"])
+
+    assert bot._infer_moves(first, "Chikorita") == ["Tackle", "Growl", "Razor Leaf", "Synthesis"]
+    assert ocr.calls == 4  # tudo conferido por pixels
+
+    # Golpe trocado no slot 4 (aprendeu Reflect): só ele vai para o OCR
+    assert bot._infer_moves(_buttons([40, 80, 120, 200]), "Chikorita")[3] == "Reflect"
+    assert ocr.calls == 5
+    inference.close()
+
+    # Assinaturas persistem entre sessões
+    reloaded = _inference(tmp_path, team=team)
+    moves, pending = reloaded.match_slots("Chikorita", [region_signature(bot._move_slots(first)[0].crop(first))])
+    assert moves == ["Tackle"] and pending == []
+    reloaded.close()
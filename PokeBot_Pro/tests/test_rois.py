@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from src.perception.rois import ROI, RoiSet, parse_box
+
+
+def test_parse_box_formats_and_rejects_ambiguous():
+    assert parse_box([27, 7, 95, 25]) == (27, 7, 95, 25)
+    assert parse_box([100, 50, 40, 20]) == (100, 50, 140, 70)
+    assert parse_box({"x": 5, "y": 6, "w": 10, "h": 4}) == (5, 6, 15, 10)
+
+    # x2 > x1 mas y2 <= y1: nem cantos nem [x,y,w,h]
+    with pytest.raises(ValueError, match="moves.slot_1"):
+        RoiSet({"rois": {"moves": {"slot_1": [10, 50, 40, 20]}}})
+    with pytest.raises(ValueError):
+        parse_box([10, 10, 10, 10, 1])
+
+
+def test_roiset_parses_once_and_binds_to_frame_geometry():
+    cfg = {
+        "rois": {"moves": {"slot_2": [30, 0, 60, 10], "slot_1": [0, 0, 20, 10]},
+                 "switch_menu": {"container": [50, 40, 200, 90], "slot_height": 30}},
+        "detection": {"battle_area": [0, 20, 64, 48]},
+    }
+    rois = RoiSet.of(cfg)
+    assert RoiSet.of(cfg) is rois
+    assert [r.name for r in rois.group("moves")] == ["moves.slot_1", "moves.slot_2"]
+    assert rois.scalar("switch_menu.slot_height") == 30
+
+    frame = np.zeros((48, 64, 3), np.uint8)
+    bound = rois.bind(frame.shape)
+    assert rois.bind(frame.shape) is bound
+    assert bound["switch_menu.container"].corners == (50, 40, 64, 48)
+
+    crop = bound["moves.slot_1"].crop(frame)
+    assert crop.shape == (10, 20, 3)
+    assert np.shares_memory(crop, frame)
+
+    roi = bound["moves.slot_1"]
+    with pytest.raises(AttributeError):
+        roi.x1 = 3
+    assert ROI.union(bound.group("moves")).corners == (0, 0, 60, 10)
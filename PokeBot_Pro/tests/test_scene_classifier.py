@@ -0,0 +1,68 @@
+import numpy as np
+
+from src.perception.game_state_detector import GameState, GameStateDetector
+from src.perception.scene_classifier import SceneClassifier
+
+
+def _scene(state, seed):
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 40, (180, 320, 3), dtype=np.uint8)
+    frame[:, :, 1] += 80  # grama
+    if state == GameState.IN_BATTLE:
+        frame[120:, 160:] = (200, 120, 40)
+    elif state == GameState.DIALOG:
+        frame[135:, 10:310] = 250
+        frame[150:152, 30:280:6] = 0  # "texto"
+    elif state == GameState.MENU:
+        frame[10:170, 230:315] = (60, 60, 60)
+    return frame
+
+
+class CountingMatcher:
+    def __init__(self):
+        self.calls = 0
+
+    def match(self, image, key, roi=None):
+        self.calls += 1
+        return None
+
+
+def _model():
+    states = (GameState.EXPLORING, GameState.IN_BATTLE, GameState.DIALOG, GameState.MENU)
+    return SceneClassifier.train([(_scene(state, seed), state) for state in states for seed in range(6)])
+
+
+def test_classifies_scenes_and_reports_uncertainty(tmp_path):
+    model = _model()
+    for state in (GameState.EXPLORING, GameState.IN_BATTLE, GameState.DIALOG, GameState.MENU):
+        assert model.classify(_scene(state, 100)) == state
+
+    path = tmp_path / "model.npz"
+    model.save(path)
+    loaded = SceneClassifier.load(path)
+    assert loaded.classify(_scene(GameState.DIALOG, 101)) == GameState.DIALOG
+    assert loaded.classify(np.full((180, 320, 3), 255, np.uint8)) is None  # nada parecido no treino
+
+
+def test_confident_scene_skips_template_matching():
+    detector = GameStateDetector(None, None, {}, classifier=_model())
+    detector.matcher = matcher = CountingMatcher()
+    profile = ("scene", "shiny", "battle", "talk", "goto")
+
+    snapshot = detector.perceive(_scene(GameState.DIALOG, 200), profile)
+    assert snapshot.state == GameState.DIALOG
+    assert snapshot.in_battle is False and snapshot.shiny is False
+    assert matcher.calls == 2  # shiny (nunca pulado por padrão) e goto (posição do clique)
+
+    # Pular o shiny fora de batalha é opcional e nunca vale para DIALOG (intro do encontro)
+    detector = GameStateDetector(None, None, {"scene_classifier": {"skip_shiny_outside_battle": True}},
+                                 classifier=_model())
+    detector.matcher = matcher = CountingMatcher()
+    detector.perceive(_scene(GameState.MENU, 200), profile)
+    assert matcher.calls == 1
+    detector.perceive(_scene(GameState.DIALOG, 200), profile)
+    assert matcher.calls == 3
+
+    battle = detector.perceive(_scene(GameState.IN_BATTLE, 200), profile)
+    assert battle.scene == GameState.IN_BATTLE
+    assert matcher.calls > 2  # em batalha os botões ainda são conferidos por template
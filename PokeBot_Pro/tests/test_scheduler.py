@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.core.scheduler import AdaptiveScheduler
+
+
+def _cfg():
+    return {"screen": {"fps": 10}, "scheduler": {"idle_interval": 1.0, "backoff": 2.0, "burst_window": 0}}
+
+
+def test_backs_off_when_screen_is_static_and_bursts_on_change():
+    sched = AdaptiveScheduler(_cfg())
+    frame = np.zeros((64, 64, 3), np.uint8)
+
+    sched.observe(frame)
+    sched.observe(frame)
+    assert sched.activity == 0.0
+    intervals = [sched.next_interval(urgent=False) for _ in range(5)]
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == 1.0
+
+    sched.observe(np.full((64, 64, 3), 200, np.uint8))
+    assert sched.next_interval(urgent=False) == sched.min_interval
+
+
+def test_battle_is_urgent_and_hold_skips_full_perception():
+    sched = AdaptiveScheduler(_cfg())
+    frame = np.zeros((64, 64, 3), np.uint8)
+    sched.observe(frame)
+    sched.observe(frame)
+
+    assert sched.next_interval(urgent=True) == 0.1
+    assert sched.needs_full_perception(stable_state=False)
+
+    sched.hold(5.0)
+    assert not sched.needs_full_perception(stable_state=True)
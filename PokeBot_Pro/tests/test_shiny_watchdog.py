@@ -0,0 +1,160 @@
+import threading
+import time
+
+import numpy as np
+
+from src.action.alerts import AlertDispatcher
+from src.action.recording_input import RecordingInput
+from src.core.bot_controller import BotController
+from src.perception.game_state_detector import GameState, PerceptionSnapshot
+from src.perception.shiny_watchdog import ShinyWatchdog
+
+
+class DummyCapture:
+    def capture(self):
+        return np.zeros((48, 64, 3), np.uint8)
+
+
+class BattleDetector:
+    """Sempre em batalha; o shiny aparece na tela quando ``shiny_visible`` é setado."""
+
+    def __init__(self):
+        self.shiny_visible = threading.Event()
+
+    def battle_hint(self, image):
+        return True
+
+    def hud_signature(self, image):
+        return ()
+
+    def perceive(self, image, profile, snapshot=None, frame_id=None):
+        snapshot = snapshot or PerceptionSnapshot(image, frame_id)
+        snapshot.detectors.update(profile)
+        snapshot.shiny = self.shiny_visible.is_set() if tuple(profile) == ('shiny',) else False
+        snapshot.in_battle = True
+        return snapshot
+
+    def get_battle_info(self, image):
+        return {"enemy_name": "Rattata", "player_name": "Pikachu", "enemy_level": 3}
+
+
+class DummyStrategy:
+    def should_flee(self, my, enemy):
+        return False
+
+    def choose_switch_target(self, enemy, my=None, level=None):
+        return None
+
+    def get_best_move(self, my, enemy, level=None):
+        return 1
+
+
+class DummyTeam:
+    def save_moves(self, name, moves):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordingAlerts:
+    def __init__(self):
+        self.events = []
+
+    def notify(self, event, message):
+        self.events.append(event)
+
+    def close(self, timeout=None):
+        pass
+
+
+class SlowChannel:
+    def __init__(self):
+        self.received = []
+
+    def send(self, event, message):
+        time.sleep(0.3)
+        self.received.append(event)
+
+
+class AckChannel:
+    """Canal tipo MessageBox: só termina quando o jogador confirma."""
+    needs_ack = True
+
+    def __init__(self):
+        self.acknowledged = threading.Event()
+        self.received = []
+
+    def send(self, event, message):
+        self.acknowledged.wait()
+        self.received.append(event)
+
+
+def test_watchdog_preempts_battle_wait_within_a_frame():
+    cfg = {"battle": {"fight_to_moves_delay": 5.0, "action_cooldown": 5.0}, "screen": {"fps": 50}}
+    detector = BattleDetector()
+    watchdog = ShinyWatchdog(detector, DummyCapture, fps=50)
+    alerts = RecordingAlerts()
+    bot = BotController(cfg, {
+        "screen": DummyCapture(),
+        "detector": detector,
+        "input": RecordingInput(cfg),
+        "strategy": DummyStrategy(),
+        "ocr": None,
+        "team_mgr": DummyTeam(),
+        "watchdog": watchdog,
+        "alerts": alerts,
+    })
+
+    # O shiny aparece enquanto o bot espera a animação do menu de golpes
+    threading.Timer(0.2, detector.shiny_visible.set).start()
+    started = time.monotonic()
+    bot.run()
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0
+    assert bot.machine.current == GameState.SHINY_FOUND
+    assert alerts.events == ["shiny"]
+    assert watchdog.frame is not None
+    # A espera foi abandonada antes de escolher/atacar
+    assert [a[1] for a in bot.input.actions] == ["click_fight_button"]
+
+
+def test_alert_dispatcher_does_not_block_caller():
+    channel = SlowChannel()
+    dispatcher = AlertDispatcher([channel])
+
+    started = time.monotonic()
+    dispatcher.notify("shiny", "teste")
+    assert time.monotonic() - started < 0.05
+
+    dispatcher.close(timeout=2.0)
+    assert channel.received == ["shiny"]
+
+
+def test_shutdown_after_shiny_waits_for_desktop_ack():
+    cfg = {"alerts": {"drain_timeout": 0.05}}
+    channel = AckChannel()
+    dispatcher = AlertDispatcher([channel])
+    bot = BotController(cfg, {
+        "screen": DummyCapture(),
+        "detector": BattleDetector(),
+        "input": RecordingInput(cfg),
+        "strategy": DummyStrategy(),
+        "ocr": None,
+        "team_mgr": DummyTeam(),
+        "alerts": dispatcher,
+    })
+    bot.handle_shiny()
+    closing = threading.Thread(target=bot.shutdown)
+    closing.start()
+
+    # Passou do drain_timeout e o aviso continua aberto esperando o jogador
+    closing.join(0.3)
+    assert closing.is_alive()
+    assert not any(t.daemon for t in dispatcher._threads)
+
+    channel.acknowledged.set()
+    closing.join(2.0)
+    assert not closing.is_alive()
+    assert channel.received == ["shiny"]
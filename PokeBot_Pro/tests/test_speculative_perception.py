@@ -0,0 +1,146 @@
+import threading
+
+import numpy as np
+
+from src.action.recording_input import RecordingInput
+from src.core.bot_controller import BotController
+from src.perception.game_state_detector import PerceptionSnapshot
+from src.perception.speculative import SpeculativePerception, region_signature
+
+
+class SequenceCapture:
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def capture(self):
+        return self.frames.pop(0) if len(self.frames) > 1 else self.frames[0]
+
+
+class CountingDetector:
+    def __init__(self):
+        self.hud_reads = 0
+
+    def hud_signature(self, image):
+        return (region_signature(image[0:10, 0:20]),)
+
+    def get_battle_info(self, image):
+        self.hud_reads += 1
+        return {"enemy_name": "Rattata", "player_name": "Pikachu", "enemy_level": 3}
+
+
+class CountingOCR:
+    def __init__(self):
+        self.calls = 0
+        self.threads = set()
+
+    def preprocess_dynamic_background_text(self, img):
+        return img
+
+    def extract_text_optimized(self, img, **kwargs):
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        return "Tackle"
+
+    def clean_move_name(self, text):
+        return text
+
+
+class DummyStrategy:
+    def should_flee(self, my, enemy):
+        return False
+
+    def choose_switch_target(self, enemy, my=None, level=None):
+        return None
+
+    def get_best_move(self, my, enemy, level=None):
+        return 0
+
+
+class DummyTeam:
+    def save_moves(self, name, moves):
+        self.saved = moves
+
+    def close(self):
+        pass
+
+
+def _bot(frames):
+    cfg = {
+        "screen": {"fps": 50},
+        "battle": {"fight_to_moves_delay": 0.2, "action_cooldown": 0.2, "speculative_perception": True},
+        "rois": {"moves": {f"slot_{i}": [20, 20 + 5 * i, 60, 24 + 5 * i] for i in range(1, 5)}},
+    }
+    components = {
+        "screen": SequenceCapture(frames),
+        "detector": CountingDetector(),
+        "input": RecordingInput(cfg),
+        "strategy": DummyStrategy(),
+        "ocr": CountingOCR(),
+        "team_mgr": DummyTeam(),
+    }
+    return BotController(cfg, components)
+
+
+def _battle_snapshot(image, frame_id=1):
+    snap = PerceptionSnapshot(image, frame_id)
+    snap.in_battle = True
+    snap.shiny = False
+    return snap
+
+
+def test_reads_are_prefetched_during_animations():
+    frame = np.full((60, 80, 3), 90, np.uint8)
+    bot = _bot([frame])
+    bot.handle_battle(_battle_snapshot(frame))
+
+    # HUD lida uma vez (em paralelo ao FIGHT) e golpes lidos durante a animação
+    assert bot.detector.hud_reads >= 1
+    assert bot.ocr.calls == 4
+    assert all(name.startswith("speculative") for name in bot.ocr.threads)
+    assert bot.speculative.hits == 2
+    assert bot.team_mgr.saved == ["Tackle"] * 4
+
+
+def test_stale_speculation_is_discarded_when_region_changes():
+    menu_closed = np.full((60, 80, 3), 90, np.uint8)
+    menu_open = menu_closed.copy()
+    menu_open[20:50, 20:60] = 250
+    # Durante a animação o menu ainda está fechado; o frame final mostra o menu
+    frames = [menu_closed] * 8 + [menu_open]
+    bot = _bot(frames)
+    bot.watch(0.1, bot._prefetcher("moves", bot._moves_signature, bot._read_moves))
+
+    assert bot._speculated("moves", bot._moves_signature(menu_open)) is None
+    assert bot.speculative.misses == 1
+
+
+def test_take_rejects_results_from_before_the_battle():
+    spec = SpeculativePerception()
+    sig = region_signature(np.zeros((8, 8, 3), np.uint8))
+    spec.submit("hud", 3, sig, lambda: "old")
+
+    assert spec.take("hud", sig, min_frame_id=5) == (False, None)
+    spec.submit("hud", 6, sig, lambda: "new")
+    assert spec.take("hud", sig, min_frame_id=5) == (True, "new")
+    spec.shutdown()
+
+
+def test_battle_memo_skips_ocr_until_hud_changes():
+    frame = np.full((60, 80, 3), 90, np.uint8)
+    bot = _bot([frame])
+    bot.speculative = None
+    bot._begin_encounter()
+
+    bot.handle_battle(_battle_snapshot(frame))
+    bot.handle_battle(_battle_snapshot(frame))
+    assert bot.detector.hud_reads == 1
+    assert bot.ocr.calls == 4
+    assert bot.battle_ctx.reads_saved >= 1
+
+    # Troca/novo inimigo: pixels da HUD mudam e a leitura é refeita
+    switched = frame.copy()
+    switched[0:10, 0:20] = 200
+    bot.cap.frames = [switched]
+    bot.handle_battle(_battle_snapshot(switched))
+    assert bot.detector.hud_reads == 2
+    assert bot.ocr.calls == 8
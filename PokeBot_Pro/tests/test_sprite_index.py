@@ -0,0 +1,76 @@
+import numpy as np
+
+from src.perception.game_state_detector import GameStateDetector
+from src.perception.perception_workers import ProcessPerception
+from src.perception.sprite_index import SpriteIndex
+
+DEX = {"pikachu": "Pikachu", "rattata": "Rattata", "pidgey": "Pidgey"}
+
+
+def _sprite(seed):
+    rng = np.random.default_rng(seed)
+    return np.kron(rng.integers(0, 255, (12, 12, 3), dtype=np.uint8), np.ones((5, 5, 1), np.uint8))
+
+
+class CountingOCR:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def extract_text_optimized(self, image, whitelist=None, invert_for_white_text=False):
+        self.calls += 1
+        return self.text
+
+
+def test_index_learns_confirmed_names_and_matches_noisy_sprites(tmp_path):
+    path = tmp_path / "sprites.npz"
+    index = SpriteIndex(path, confirm=lambda name: DEX.get(name.lower()), save_every=1)
+    for seed, name in enumerate(["pikachu", "RATTATA", "Pidgey"]):
+        assert index.learn(index.hash(_sprite(seed)), name) == DEX[name.lower()]
+    assert index.learn(index.hash(_sprite(9)), "Pikaxhu") is None  # OCR não confirmado
+    assert len(index) == 3
+
+    noisy = _sprite(1).astype(np.int16) + np.random.default_rng(5).integers(-12, 12, (60, 60, 3))
+    assert index.lookup(index.hash(np.clip(noisy, 0, 255).astype(np.uint8)))[0] == "Rattata"
+    assert index.lookup(index.hash(_sprite(42))) is None  # espécie desconhecida: volta ao OCR
+
+    reloaded = SpriteIndex(path)
+    assert len(reloaded) == 3 and reloaded.lookup(reloaded.hash(_sprite(0)))[0] == "Pikachu"
+
+
+def test_battle_info_skips_name_ocr_on_sprite_match(tmp_path):
+    cfg = {"rois": {"enemy_sprite": [0, 0, 60, 60], "enemy_name": [60, 0, 100, 10], "player_name": [60, 10, 100, 20]}}
+    index = SpriteIndex(None, confirm=lambda name: DEX.get(name.lower()))
+    frame = np.zeros((80, 120, 3), np.uint8)
+    frame[:60, :60] = _sprite(1)
+    ocr = CountingOCR("rattata")
+    detector = GameStateDetector(None, ocr, cfg, sprites=index)
+
+    first = detector.get_battle_info(frame)  # índice vazio: OCR e aprendizado
+    assert (first["enemy_name"], first["enemy_source"], ocr.calls) == ("Rattata", "ocr", 2)
+    second = detector.get_battle_info(frame)
+    assert (second["enemy_name"], second["enemy_source"], ocr.calls) == ("Rattata", "sprite", 3)
+
+
+def test_process_perception_uses_main_process_sprite_index():
+    cfg = {"rois": {"enemy_sprite": [0, 0, 60, 60], "enemy_name": [60, 0, 100, 10], "player_name": [60, 10, 100, 20]},
+           "perception": {"processes": {"groups": []}}}
+    index = SpriteIndex(None, confirm=lambda name: DEX.get(name.lower()))
+    frame = np.zeros((80, 120, 3), np.uint8)
+    frame[:60, :60] = _sprite(2)
+    perceiver = ProcessPerception(cfg, GameStateDetector(None, CountingOCR("x"), cfg, sprites=index))
+    requests = []
+
+    def worker(image, names, frame_id, enemy=None):
+        # Worker sem índice de sprites: só faz OCR do nome se o principal não identificou
+        requests.append(enemy)
+        return {"battle_info": {"enemy_name": enemy or "pidgey", "enemy_source": "sprite" if enemy else "ocr",
+                                "player_name": "Pikachu", "enemy_level": 3}}
+
+    perceiver._request = worker
+    try:
+        assert perceiver.get_battle_info(frame)["enemy_name"] == "Pidgey"  # OCR do worker ensina o índice local
+        assert perceiver.get_battle_info(frame)["enemy_source"] == "sprite"
+        assert requests == [None, "Pidgey"]
+    finally:
+        perceiver.close()
@@ -0,0 +1,28 @@
+import sys
+
+from src.core.startup import StartupProfile
+
+
+def test_profile_times_imports_and_writes_report(tmp_path, monkeypatch):
+    (tmp_path / "bench_leaf_mod.py").write_text("import time\ntime.sleep(0.02)\n")
+    (tmp_path / "bench_root_mod.py").write_text("import bench_leaf_mod\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    profile_path = tmp_path / "profile.txt"
+
+    startup = StartupProfile({"startup": {"profile_path": str(profile_path), "target_first_tick_ms": 60000}}).start()
+    try:
+        import bench_root_mod  # noqa: F401
+    finally:
+        startup.stop_imports()
+        sys.modules.pop("bench_root_mod", None)
+        sys.modules.pop("bench_leaf_mod", None)
+
+    own, total = startup.imports["bench_root_mod"]
+    assert total >= startup.imports["bench_leaf_mod"][1] >= 0.02
+    assert own < 0.02  # o tempo do filho não conta como próprio
+
+    startup.mark("components")
+    assert startup.first_tick() < startup.target_ms
+    report = profile_path.read_text(encoding="utf-8")
+    assert "first_tick" in report and "bench_leaf_mod" in report
+    assert startup._finder is None
@@ -0,0 +1,57 @@
+from src.core.state_machine import StateMachine, ANY
+
+
+class Snap:
+    def __init__(self, battle=None, shiny=False):
+        self.in_battle = battle
+        self.shiny = shiny
+        self.refined = []
+
+
+def _machine(log):
+    m = StateMachine("explore")
+    m.add_state("explore", on_tick=lambda s: log.append("tick:explore"), profile=("battle", "goto"))
+    m.add_state(
+        "battle",
+        on_enter=lambda s: log.append("enter:battle"),
+        on_exit=lambda s: log.append("exit:battle"),
+        on_tick=lambda s: log.append("tick:battle"),
+        profile=("battle",),
+    )
+    m.add_state("shiny", on_enter=lambda s: log.append("enter:shiny"), profile=("shiny",))
+    m.add_transition(ANY, "shiny", lambda s: s.shiny is True)
+    m.add_transition("explore", "battle", lambda s: s.in_battle is True)
+    m.add_transition("battle", "explore", lambda s: s.in_battle is False)
+    return m
+
+
+def test_transitions_run_entry_exit_and_tick_in_order():
+    log = []
+    m = _machine(log)
+
+    assert m.step(Snap(battle=False)) == "explore"
+    assert m.step(Snap(battle=True)) == "battle"
+    # Detector não avaliado (None) não dispara a guarda de saída
+    assert m.step(Snap(battle=None)) == "battle"
+    assert m.step(Snap(battle=False)) == "explore"
+
+    assert log == [
+        "tick:explore",
+        "enter:battle", "tick:battle",
+        "tick:battle",
+        "exit:battle", "tick:explore",
+    ]
+
+
+def test_wildcard_transition_and_profile_refinement():
+    log = []
+    m = _machine(log)
+    m.step(Snap(battle=True))
+    assert m.profile == ("battle",)
+
+    snap = Snap(battle=True, shiny=True)
+    m.step(snap, refine=lambda s, profile: s.refined.append(profile))
+
+    assert m.current == "shiny"
+    assert snap.refined == [("shiny",)]
+    assert log[-2:] == ["exit:battle", "enter:shiny"]
@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+
+from src.core.supervisor import Supervisor, offset_config
+
+
+def _config(tmp_path, sessions):
+    return {
+        "bot": {"debug_mode": False},
+        "screen": {"fps": 20},
+        "scheduler": {"report_every": 0},
+        "assets": {"templates_dir": "PokeBot_Pro/assets/templates/"},
+        "detection": {},
+        "ocr": {"tesseract_path": "tesseract"},
+        "rois": {},
+        "persistence": {"encounter_log": False},
+        "supervisor": {"ocr_workers": 1, "sessions": sessions},
+    }
+
+
+def test_offset_config_shifts_both_box_formats():
+    cfg = {"rois": {"enemy_name": [27, 7, 95, 25], "moves": {"slot_1": [100, 50, 40, 20]}},
+           "detection": {"battle_area": [685, 933, 1226, 1074]}}
+    shifted = offset_config(cfg, 10, 5)
+
+    assert shifted["rois"]["enemy_name"] == [37, 12, 105, 30]
+    assert shifted["rois"]["moves"]["slot_1"] == [110, 55, 40, 20]
+    assert shifted["detection"]["battle_area"] == [695, 938, 1236, 1079]
+    assert cfg["rois"]["enemy_name"] == [27, 7, 95, 25]
+
+
+def test_replay_sessions_run_headless_in_one_process(tmp_path):
+    sessions = []
+    for name in ("a", "b"):
+        replay_dir = tmp_path / name
+        replay_dir.mkdir()
+        cv2.imwrite(str(replay_dir / "0001.png"), np.zeros((120, 160, 3), np.uint8))
+        sessions.append({
+            "name": name,
+            "replay_dir": str(replay_dir),
+            "moves_db_path": str(tmp_path / f"moves_{name}.json"),
+        })
+
+    sup = Supervisor(_config(tmp_path, sessions))
+    # Templates carregados uma única vez para todas as sessões
+    assert sup.sessions[0].controller.detector.templates["fight"] is \
+        sup.sessions[1].controller.detector.templates["fight"]
+
+    sup.run(duration=0.5)
+
+    for session in sup.sessions:
+        assert session.error is None
+        assert not session.thread.is_alive()
+        # Tela vazia na exploração: fallback de espaço
+        assert ("press", ("space",)) in [(a[1], a[2]) for a in session.controller.input.actions]
@@ -0,0 +1,67 @@
+import json
+import time
+
+from src.knowledge import persistence
+from src.knowledge.team_manager import TeamManager
+
+
+def _wait_for(predicate, timeout=2.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_update_is_write_behind_and_flushed_on_close(tmp_path):
+    path = tmp_path / "known_moves.json"
+    tm = TeamManager(path, {"flush_debounce_s": 60})
+
+    tm.save_moves("Pidgey", ["Tackle", "Gust"])
+    # Debounce longo: nada foi escrito ainda na thread da batalha
+    assert not path.exists()
+
+    tm.close()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"pidgey": ["Tackle", "Gust"]}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_journal_is_replayed_after_crash(tmp_path):
+    path = tmp_path / "known_moves.json"
+    tm = TeamManager(path, {"flush_debounce_s": 0, "journal": True})
+
+    tm.save_moves("Pidgey", ["Tackle"])
+    tm.save_moves("Rattata", ["Tackle", "Tail Whip"])
+    journal = tmp_path / "known_moves.json.journal"
+    assert _wait_for(lambda: journal.exists() and len(journal.read_text().splitlines()) == 2)
+
+    # Simula crash: sem close(); um novo processo reconstrói a partir do journal
+    reloaded = TeamManager(path)
+    assert reloaded.get_moves("rattata") == ["Tackle", "Tail Whip"]
+    assert reloaded.get_moves("pidgey") == ["Tackle"]
+
+    tm.close()
+    assert not journal.exists()
+    assert json.loads(path.read_text(encoding="utf-8"))["rattata"] == ["Tackle", "Tail Whip"]
+
+
+def test_failed_background_write_is_retried_and_flushed_on_close(tmp_path, monkeypatch):
+    path = tmp_path / "known_moves.json"
+    real_write = persistence.atomic_write_json
+    failures = []
+
+    def locked_once(*args, **kwargs):
+        if not failures:
+            failures.append(1)
+            raise PermissionError("arquivo travado")
+        return real_write(*args, **kwargs)
+
+    monkeypatch.setattr(persistence, "atomic_write_json", locked_once)
+    tm = TeamManager(path, {"flush_debounce_s": 0})
+    tm.save_moves("Pidgey", ["Tackle", "Gust"])
+    assert _wait_for(lambda: failures)
+
+    # A mudança não se perdeu: o close (ou a nova tentativa) grava
+    tm.close()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"pidgey": ["Tackle", "Gust"]}
@@ -0,0 +1,86 @@
+import numpy as np
+
+from src.perception.screen_capture import ScreenCapture
+from src.perception.window_locator import StaticWindowLocator, WindowRect
+
+
+class FakeSct:
+    """mss fake: 'tela virtual' BGRA onde cada pixel guarda sua coordenada x."""
+
+    def __init__(self, width=800, height=600):
+        self.desktop = np.zeros((height, width, 4), np.uint8)
+        self.desktop[..., 0] = (np.arange(width) % 256)[None, :]
+        self.desktop[..., 1] = (np.arange(height) % 256)[:, None]
+        self.monitors = [None, {"left": 0, "top": 0, "width": width, "height": height}]
+        self.grabs = []
+
+    def grab(self, monitor):
+        self.grabs.append(dict(monitor))
+        x, y = monitor["left"], monitor["top"]
+        return self.desktop[y:y + monitor["height"], x:x + monitor["width"]]
+
+
+def test_captures_only_the_window_and_follows_it_when_moved():
+    sct = FakeSct()
+    window = WindowRect(100, 50, 320, 240)
+    locator = StaticWindowLocator([window, window, WindowRect(300, 200, 320, 240)])
+    cap = ScreenCapture(
+        {"screen": {"window_title": "PokeMMO", "window_refresh": 0}}, locator=locator, sct=sct
+    )
+
+    first = cap.capture()
+    assert first.shape == (240, 320, 3)
+    assert first[0, 0, 0] == 100 and first[0, 0, 1] == 50
+    assert cap.origin == (100, 50)
+    # A janela se moveu: a captura e a origem dos cliques acompanham
+    assert cap.capture()[0, 0, 0] == 300 % 256
+    assert cap.origin == (300, 200)
+
+
+def test_falls_back_to_default_area_when_window_is_missing():
+    sct = FakeSct()
+    cap = ScreenCapture(
+        {"screen": {"window_title": "Inexistente", "window_refresh": 0}},
+        locator=StaticWindowLocator(None), sct=sct,
+    )
+
+    assert cap.window is None
+    assert cap.capture().shape == (600, 800, 3)
+
+
+class RawShot:
+    """Screenshot no formato do mss: bytes BGRA em ``raw``."""
+
+    def __init__(self, array):
+        self.height, self.width = array.shape[:2]
+        self.raw = bytearray(array.tobytes())
+
+
+class RawSct(FakeSct):
+    def grab(self, monitor):
+        return RawShot(super().grab(monitor))
+
+
+def test_frames_reuse_buffers_and_keep_survives_next_captures():
+    sct = RawSct()
+    cap = ScreenCapture({"screen": {"frame_buffers": 2}}, sct=sct)
+
+    first = cap.capture()
+    kept = cap.keep(first)
+    second = cap.capture()
+    third = cap.capture()
+
+    assert first.shape == (600, 800, 3)
+    assert third is first  # rodízio de 2 buffers, sem alocação por tick
+    assert second is not first
+    assert kept is not first and np.array_equal(kept, sct.desktop[..., :3])
+
+
+def test_bgra_passthrough_and_gray_formats():
+    sct = RawSct()
+    bgra = ScreenCapture({"screen": {"pixel_format": "bgra"}}, sct=sct).capture()
+    assert bgra.shape == (600, 800, 4)
+    assert np.array_equal(bgra, sct.desktop)
+
+    gray = ScreenCapture({"screen": {"pixel_format": "gray"}}, sct=sct).capture()
+    assert gray.shape == (600, 800)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark do tempo até o primeiro tick.
+
+Usage:
+  - Run: `python tools/bench_startup.py [--runs 5] [--frame screenshot.png] [--target 1500]`
+  - Cada rodada é um processo Python novo (imports frios de verdade) que
+    monta o bot como o main.py, mas com captura de replay (um frame fixo;
+    tela preta se `--frame` não for dado) e input só gravado, e roda um tick.
+  - Imprime o tempo de cada rodada e a mediana; sai com código 1 se a
+    mediana passar de `startup.target_first_tick_ms` (ou `--target`).
+  - O perfil da última rodada (imports por módulo e fases) fica em
+    `debug/startup_bench.txt`.
+
+Não precisa do jogo aberto nem de display.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PROFILE_PATH = os.path.join('debug', 'startup_bench.txt')
+
+
+def child(frame_path):
+    """Uma inicialização medida; imprime o resultado em JSON na última linha."""
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from src.core.startup import StartupProfile
+    startup = StartupProfile().start()
+
+    from src.core.main import load_config
+    config = load_config()
+    config['startup'] = dict(config.get('startup') or {}, profile_path=PROFILE_PATH)
+    # Sem threads de fundo nem processos: só o caminho até o primeiro tick
+    config.setdefault('hot_reload', {})['enabled'] = False
+    config.setdefault('watchdog', {})['enabled'] = False
+    config.setdefault('perception', {}).setdefault('processes', {})['enabled'] = False
+    startup.configure(config)
+    startup.mark('config')
+
+    from src.core.components import build_shared, build_components
+    from src.core.bot_controller import BotController
+    from src.perception.screen_capture import ReplayCapture
+    from src.action.recording_input import RecordingInput
+    startup.mark('imports')
+
+    import numpy as np
+    if frame_path:
+        import cv2
+        frame = cv2.imread(frame_path)
+        if frame is None:
+            raise SystemExit(f"Não foi possível ler {frame_path}")
+    else:
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    shared = build_shared(config)
+    startup.mark('shared')
+    components = build_components(config, shared, screen=ReplayCapture([frame], loop=True),
+                                  input_sim=RecordingInput(config))
+    components['startup'] = startup
+    startup.mark('components')
+    bot = BotController(config, components)
+    startup.mark('controller')
+    try:
+        bot.tick()
+        bot._first_tick_done()
+    finally:
+        bot.shutdown()
+        if shared['learning_store'] is not None:
+            shared['learning_store'].close()
+    print(json.dumps({'first_tick_ms': startup.first_tick_ms, 'target_ms': startup.target_ms}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--frame', default=None, help='imagem usada como frame do replay')
+    parser.add_argument('--target', type=float, default=None, help='meta em ms (padrão: da config)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.frame)
+        return
+
+    times, target = [], args.target
+    for i in range(max(1, args.runs)):
+        cmd = [sys.executable, os.path.abspath(__file__), '--child']
+        if args.frame:
+            cmd += ['--frame', os.path.abspath(args.frame)]
+        out = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+        if out.returncode != 0:
+            print(out.stdout + out.stderr)
+            sys.exit(out.returncode)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        times.append(result['first_tick_ms'])
+        if target is None:
+            target = result['target_ms']
+        print(f"rodada {i + 1}: {result['first_tick_ms']:.0f} ms")
+
+    median = statistics.median(times)
+    ok = median <= target
+    print(f"mediana: {median:.0f} ms | meta: {target:.0f} ms | {'OK' if ok else 'ACIMA DA META'}")
+    print(f"perfil da última rodada: {os.path.join(ROOT, PROFILE_PATH)}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
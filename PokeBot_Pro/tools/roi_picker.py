@@ -8,6 +8,9 @@ Usage:
   - After releasing, press `n` to give a name to the ROI and store it.
   - Press `s` to save all collected ROIs to a JSON/YAML file (default: `rois_collected.json`).
   - Press `c` to clear last ROI, `C` to clear all, `q` or ESC to quit.
+  - `--window TITLE` captures only the game window (client area), so the
+    coordinates come out relative to the window, as the bot expects when
+    `screen.window_title` is set.
 
 The script will try to use `mss` for fast screenshots, falling back to `pyautogui`.
 It will print coordinates in both formats: [x,y,w,h] and [x1,y1,x2,y2].
@@ -17,10 +20,14 @@ This is a lightweight tool intended to help you pick areas to paste into `config
 
 import json
 import os
+import sys
 import argparse
 import cv2
 import numpy as np
 
+# Permite importar src.* (localizador de janelas do bot)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
 try:
     import mss
     _HAS_MSS = True
@@ -41,9 +48,10 @@ except Exception:
 
 
 class ROIPicker:
-    def __init__(self, output_path=None, window_name='ROI Picker'):
+    def __init__(self, output_path=None, window_name='ROI Picker', target_window=None):
         self.output_path = output_path or 'rois_collected.json'
         self.window_name = window_name
+        self.target_window = target_window
         self.rois = []  # list of dicts: {name, x,y,w,h, x1,y1,x2,y2}
         self.drawing = False
         self.start = (0, 0)
@@ -51,10 +59,22 @@ class ROIPicker:
         self.img = None
         self.display_img = None
 
+    def _target_monitor(self, sct):
+        """Área cliente da janela alvo (--window) ou o monitor principal."""
+        if self.target_window:
+            from src.perception.window_locator import default_locator
+            locator = default_locator()
+            rect = locator.find(self.target_window) if locator is not None else None
+            if rect is not None:
+                print(f'Janela encontrada: {rect}')
+                return rect.as_monitor()
+            print(f"Janela '{self.target_window}' não encontrada; usando o monitor principal.")
+        return sct.monitors[1]
+
     def grab_screen(self):
         if _HAS_MSS:
             with mss.mss() as sct:
-                monitor = sct.monitors[1]
+                monitor = self._target_monitor(sct)
                 sct_img = sct.grab(monitor)
                 img = np.array(sct_img)
                 # mss returns BGRA
@@ -186,9 +206,10 @@ class ROIPicker:
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--out', '-o', help='Output JSON file', default='rois_collected.json')
+    parser.add_argument('--window', '-w', help='Title (or part of it) of the game window to capture', default=None)
     args = parser.parse_args()
 
-    picker = ROIPicker(output_path=args.out)
+    picker = ROIPicker(output_path=args.out, target_window=args.window)
     try:
         picker.run()
     except Exception as e:
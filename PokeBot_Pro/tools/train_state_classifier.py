@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Treina o classificador de cena (pré-filtro de estado) a partir de frames rotulados.
+
+Usage:
+  - Organize screenshots do jogo em pastas com o nome do estado:
+      frames/exploring/*.png  frames/in_battle/*.png  frames/dialog/*.png  frames/menu/*.png
+    (frames do gravador de voo em `debug/incidents/` servem, mesmo reduzidos:
+    o classificador só olha uma miniatura 64x36).
+  - Run: `python tools/train_state_classifier.py frames [--out data/state_classifier.npz]`
+  - Um em cada `--holdout` frames fica fora do treino e é usado para medir
+    acerto e a fração de frames "incertos" (que caem nos templates).
+    O modelo final é treinado com todos os frames.
+
+Saída: o arquivo lido por `scene_classifier.model_path` em config/settings.yaml.
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+import cv2
+
+# Permite importar src.* (classificador do bot)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.perception.game_state_detector import GameState  # noqa: E402
+from src.perception.scene_classifier import SceneClassifier  # noqa: E402
+
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def load_samples(root):
+    samples = []
+    for state in GameState:
+        folder = os.path.join(root, state.value)
+        if not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith(IMAGE_EXTS):
+                image = cv2.imread(os.path.join(folder, name))
+                if image is not None:
+                    samples.append((image, state))
+    return samples
+
+
+def evaluate(model, samples):
+    correct = wrong = uncertain = 0
+    for image, label in samples:
+        predicted = model.classify(image)
+        if predicted is None:
+            uncertain += 1
+        elif predicted == label:
+            correct += 1
+        else:
+            wrong += 1
+    return correct, wrong, uncertain
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('frames', help='pasta com subpastas exploring/in_battle/dialog/menu')
+    parser.add_argument('--out', default='data/state_classifier.npz')
+    parser.add_argument('--holdout', type=int, default=5, help='1 em cada N frames fica para validação')
+    parser.add_argument('--radius-factor', type=float, default=1.5)
+    parser.add_argument('--min-margin', type=float, default=0.1)
+    args = parser.parse_args()
+
+    samples = load_samples(args.frames)
+    counts = Counter(label.value for _, label in samples)
+    if len(counts) < 2:
+        print(f"São necessários frames de pelo menos 2 estados; encontrados: {dict(counts)}")
+        sys.exit(1)
+    print("Frames por estado:", dict(counts))
+
+    if args.holdout > 1 and len(samples) >= 2 * args.holdout:
+        train = [s for i, s in enumerate(samples) if i % args.holdout]
+        test = [s for i, s in enumerate(samples) if not i % args.holdout]
+        model = SceneClassifier.train(train, args.radius_factor, args.min_margin)
+        correct, wrong, uncertain = evaluate(model, test)
+        total = len(test)
+        print(f"Validação ({total} frames): {correct / total:.1%} certos, {wrong / total:.1%} errados, "
+              f"{uncertain / total:.1%} incertos (vão para os templates)")
+
+    model = SceneClassifier.train(samples, args.radius_factor, args.min_margin)
+    model.save(args.out)
+    print(f"Modelo salvo em {args.out} ({len(model.labels)} estados)")
+
+
+if __name__ == '__main__':
+    main()